@@ -1,22 +1,48 @@
-from fastapi import APIRouter, Query, HTTPException
-from app.services.calendar import get_events_by_date, create_event, update_event, delete_event
-from typing import List
+from fastapi import APIRouter, Query, HTTPException, Body
+from app.core.config import settings
+from app.services.bulk import summarize
+from app.services.calendar import (
+    get_events_by_date, get_events_in_range, create_event, update_event, delete_event,
+    create_events_bulk, update_events_bulk, delete_events_bulk
+)
+from typing import List, Optional
 import traceback
 
 router = APIRouter()
 
 @router.get("/calendar", response_model=List[dict])
-def get_events(date: str = Query(...), user_id: str = Query(...)):
+async def get_events(date: str = Query(...), user_id: str = Query(...)):
     try:
-        return get_events_by_date(date, user_id)
+        return await get_events_by_date(date, user_id)
+    except Exception as e:
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=f"Error fetching events: {str(e)}")
+
+@router.get("/calendar/range", response_model=dict)
+async def get_events_range(
+    start: str = Query(..., description="First date, YYYY-MM-DD"),
+    end: str = Query(..., description="Last date (inclusive), YYYY-MM-DD"),
+    user_id: str = Query(...),
+    type: Optional[str] = Query(None, description="Only events of this type"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(500, ge=1, le=1000)
+):
+    """
+    Get a user's events for a whole date range (e.g. a month view) in one call.
+    Returns {"days": {date: [events]}, "count", "next_cursor"}.
+    """
+    try:
+        return await get_events_in_range(user_id, start, end, type, cursor, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=f"Error fetching events: {str(e)}")
 
 @router.post("/calendar", response_model=dict)
-def create_event_endpoint(event: dict):
+async def create_event_endpoint(event: dict):
     try:
-        result = create_event(event)
+        result = await create_event(event)
         if not result:
             raise HTTPException(status_code=500, detail="Failed to create event, no data returned")
         return result
@@ -30,10 +56,38 @@ def create_event_endpoint(event: dict):
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=f"Error creating event: {str(e)}")
 
+# Bulk routes are declared before /calendar/{event_id} so "bulk" isn't taken for an id
+@router.post("/calendar/bulk", response_model=dict)
+async def create_events_bulk_endpoint(events: List[dict] = Body(..., max_length=settings.BULK_MAX_ITEMS)):
+    """Create many events in one request; returns a result per event, in request order"""
+    try:
+        return summarize(await create_events_bulk(events))
+    except Exception as e:
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=f"Error creating events: {str(e)}")
+
+@router.put("/calendar/bulk", response_model=dict)
+async def update_events_bulk_endpoint(events: List[dict] = Body(..., max_length=settings.BULK_MAX_ITEMS)):
+    """Update many events in one request; each event needs its id"""
+    try:
+        return summarize(await update_events_bulk(events))
+    except Exception as e:
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=f"Error updating events: {str(e)}")
+
+@router.post("/calendar/bulk/delete", response_model=dict)
+async def delete_events_bulk_endpoint(event_ids: List[int] = Body(..., max_length=settings.BULK_MAX_ITEMS)):
+    """Delete many events by id in one request"""
+    try:
+        return summarize(await delete_events_bulk(event_ids))
+    except Exception as e:
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=f"Error deleting events: {str(e)}")
+
 @router.put("/calendar/{event_id}", response_model=dict)
-def update_event_endpoint(event_id: int, event: dict):
+async def update_event_endpoint(event_id: int, event: dict):
     try:
-        result = update_event(event_id, event)
+        result = await update_event(event_id, event)
         if not result:
             # Provide a fallback response
             return {"id": event_id, "message": "Update processed but no data returned"}
@@ -46,9 +100,9 @@ def update_event_endpoint(event_id: int, event: dict):
         )
 
 @router.delete("/calendar/{event_id}", response_model=dict)
-def delete_event_endpoint(event_id: int):
+async def delete_event_endpoint(event_id: int):
     try:
-        result = delete_event(event_id)
+        result = await delete_event(event_id)
         if not result:
             return {"id": event_id, "message": "Delete processed but no data returned"}
         return result
@@ -1,10 +1,15 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import Optional
-from datetime import datetime
+from typing import Optional, Dict, Any
+import asyncio
+import json
+import time
 
-from app.services.llm.context_builder import WingmanContextBuilder
-from app.services.llm.ollama_service import WingmanOllamaService
+from app.core.config import settings
+from app.services.llm.admission import AdmissionRejected
+from app.services.llm.response_cache import ResponseCache
+from app.services.llm.runtime import get_ollama_service, get_context_builder, get_response_cache, get_indexer
 
 router = APIRouter()
 
@@ -15,14 +20,21 @@ class ChatRequest(BaseModel):
     date: Optional[str] = None
     model: Optional[str] = None  # Add model selection
     session_id: Optional[int] = None  # ADD THIS
+    bypass_cache: bool = False  # Force a fresh generation even if a cached answer exists
 
 class ChatResponse(BaseModel):
     response: str
     success: bool
     model_used: Optional[str] = None
     processing_time: Optional[float] = None
+    time_to_first_token: Optional[float] = None
+    queue_wait: Optional[float] = None
     context_used: bool = False
+    context_timings: Optional[Dict[str, float]] = None
+    context_tokens: Optional[Dict[str, int]] = None
+    generation_stats: Optional[Dict[str, float]] = None  # Ollama token counts, durations and tok/s
     fallback_used: bool = False
+    cached: bool = False
     session_id: Optional[int] = None  # ADD THIS
 
 class OllamaStatusResponse(BaseModel):
@@ -33,43 +45,134 @@ class OllamaStatusResponse(BaseModel):
     system_info: dict = {}
     error: Optional[str] = None
 
-ollama_service = WingmanOllamaService()
+async def _prepare_chat(request: ChatRequest):
+    """Pick the model for a chat request and build a user context that fits its window"""
+    ollama_service = get_ollama_service()
+    context_builder = get_context_builder()
+    response_cache = get_response_cache()
+    # Use user's preferred model or fall back to recommended
+    preferred_model = request.model
+    if not preferred_model:
+        # Refresh the cached model list if needed, then pick for this message's size
+        await ollama_service.get_status()
+        preferred_model = ollama_service.select_model(request.message)
+    
+    # Build comprehensive context with chat history, off the event loop
+    built = await context_builder.build_context_async(
+        user_id=request.user_id,
+        message=request.message,
+        date=request.date,
+        token_budget=ollama_service.get_context_budget(preferred_model, request.message),
+        history_as_messages=settings.OLLAMA_CHAT_API
+    )
+    if not settings.OLLAMA_CHAT_API:
+        # History is already inlined in the context text
+        built["chat_history"] = None
+    timings = built["timings"]
+    print(
+        "Context built in "
+        + ", ".join(f"{name}={seconds * 1000:.1f}ms" for name, seconds in timings.items())
+        + f", {built['tokens']['total']} tokens"
+    )
+    
+    built["cache_key"] = None
+    if response_cache is not None and not request.bypass_cache:
+        built["cache_key"] = ResponseCache.make_key(
+            preferred_model,
+            request.message,
+            built["fingerprint"],
+            {"chat_api": settings.OLLAMA_CHAT_API, **ollama_service.generation_options(preferred_model)}
+        )
+    
+    return built, preferred_model
+
+async def _cached_response(request: ChatRequest, built: Dict[str, Any], model: str) -> Optional[ChatResponse]:
+    """Serve a previously generated answer for the same prompt and context, if there is one"""
+    response_cache = get_response_cache()
+    if not built["cache_key"]:
+        return None
+    
+    start_time = time.perf_counter()
+    hit = await asyncio.to_thread(response_cache.get, built["cache_key"])
+    if hit is None:
+        return None
+    
+    return ChatResponse(
+        response=hit["response"],
+        success=True,
+        model_used=hit.get("model_used", model),
+        processing_time=time.perf_counter() - start_time,
+        context_used=True,
+        context_timings=built["timings"],
+        context_tokens=built["tokens"],
+        cached=True,
+        session_id=request.session_id
+    )
+
+async def _store_response(built: Dict[str, Any], result: Dict[str, Any]):
+    """Remember a successful answer for identical follow-up requests"""
+    response_cache = get_response_cache()
+    if built["cache_key"]:
+        await asyncio.to_thread(
+            response_cache.put,
+            built["cache_key"],
+            {"response": result["response"], "model_used": result.get("model_used")}
+        )
+
+async def _ensure_model_loaded(model: str):
+    """Warm the model unless Ollama already holds it, shared with any concurrent requests"""
+    ollama_service = get_ollama_service()
+    if not await ollama_service.is_loaded(model):
+        await ollama_service.warm_up_model(model)
+
+def _overloaded(model: str, retry_after: float) -> HTTPException:
+    """503 telling the client to back off instead of waiting for the Ollama timeout"""
+    return HTTPException(
+        status_code=503,
+        detail=f"Wingman AI is busy with other requests for {model}, please retry shortly",
+        headers={"Retry-After": str(int(retry_after + 0.5))}
+    )
+
+def _sse_event(event: str, data: Dict[str, Any]) -> str:
+    """Format a single Server-Sent Events frame"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
 
 @router.post("/", response_model=ChatResponse)
 async def send_chat_message(request: ChatRequest):
     """
     Send a message to Wingman AI with FULL CHAT HISTORY CONTEXT
     """
+    ollama_service = get_ollama_service()
     try:
-        # Build comprehensive context with chat history
-        context_builder = WingmanContextBuilder()
-        context = context_builder.build_context(
-            user_id=request.user_id,
-            message=request.message,
-            date=request.date
-        )
+        built, preferred_model = await _prepare_chat(request)
+        
+        cached = await _cached_response(request, built, preferred_model)
+        if cached is not None:
+            return cached
         
-        # Use user's preferred model or fall back to recommended
-        preferred_model = request.model
-        if not preferred_model:
-            # Get system recommendation
-            status = await ollama_service.check_ollama_status()
-            preferred_model = status.get("recommended_model", "llama3.2:1b")
+        await _ensure_model_loaded(preferred_model)
         
         # Generate AI response with FULL CONTEXT
         result = await ollama_service.generate_response(
             prompt=request.message,
-            context=context,
-            model=preferred_model
+            context=built["context"],
+            model=preferred_model,
+            chat_history=built["chat_history"],
+            user_id=request.user_id
         )
         
         if result["success"]:
+            await _store_response(built, result)
             return ChatResponse(
                 response=result["response"],
                 success=True,
                 model_used=result.get("model_used", preferred_model),
                 processing_time=result.get("processing_time"),
+                queue_wait=result.get("queue_wait"),
+                generation_stats=result.get("stats"),
                 context_used=True,  # Always true now
+                context_timings=built["timings"],
+                context_tokens=built["tokens"],
                 fallback_used=False,
                 session_id=request.session_id
             )
@@ -81,9 +184,13 @@ async def send_chat_message(request: ChatRequest):
                 model_used=preferred_model,
                 fallback_used=True,
                 context_used=True,
+                context_timings=built["timings"],
+                context_tokens=built["tokens"],
                 session_id=request.session_id
             )
             
+    except AdmissionRejected as e:
+        raise _overloaded(e.model, e.retry_after)
     except Exception as e:
         # Emergency fallback
         fallback_msg = "I'm having trouble connecting to the AI service right now. Please try again in a moment!"
@@ -94,14 +201,135 @@ async def send_chat_message(request: ChatRequest):
             session_id=request.session_id
         )
 
+@router.post("/stream")
+async def stream_chat_message(request: ChatRequest):
+    """
+    Stream Wingman AI's reply as Server-Sent Events.
+
+    Emits one `token` event per chunk from Ollama and a final `done` event
+    whose data is the same ChatResponse returned by POST /. Answers 503
+    up front when the Ollama queue for the model is already full.
+    """
+    ollama_service = get_ollama_service()
+    try:
+        built, preferred_model = await _prepare_chat(request)
+    except Exception as e:
+        print(f"Error preparing chat stream: {e}")
+        built, preferred_model = None, None
+    
+    if built is not None and ollama_service.admission.is_saturated(preferred_model):
+        raise _overloaded(preferred_model, 1.0)
+    
+    async def event_stream():
+        try:
+            if built is None:
+                raise RuntimeError("Chat context could not be prepared")
+            
+            cached = await _cached_response(request, built, preferred_model)
+            if cached is not None:
+                yield _sse_event("token", {"content": cached.response})
+                yield _sse_event("done", cached.model_dump())
+                return
+            
+            await _ensure_model_loaded(preferred_model)
+            
+            async for event in ollama_service.stream_response(
+                prompt=request.message,
+                context=built["context"],
+                model=preferred_model,
+                chat_history=built["chat_history"],
+                user_id=request.user_id
+            ):
+                if event["type"] == "token":
+                    yield _sse_event("token", {"content": event["content"]})
+                    continue
+                
+                if event["success"]:
+                    await _store_response(built, event)
+                    final = ChatResponse(
+                        response=event["response"],
+                        success=True,
+                        model_used=event.get("model_used", preferred_model),
+                        processing_time=event.get("processing_time"),
+                        time_to_first_token=event.get("time_to_first_token"),
+                        queue_wait=event.get("queue_wait"),
+                        generation_stats=event.get("stats"),
+                        context_used=True,
+                        context_timings=built["timings"],
+                        context_tokens=built["tokens"],
+                        fallback_used=False,
+                        session_id=request.session_id
+                    )
+                else:
+                    # Keep any partial text so the client doesn't lose it
+                    final = ChatResponse(
+                        response=event.get("response") or event["fallback_response"],
+                        success=False,
+                        model_used=preferred_model,
+                        time_to_first_token=event.get("time_to_first_token"),
+                        fallback_used=not event.get("response"),
+                        context_used=True,
+                        context_timings=built["timings"],
+                        context_tokens=built["tokens"],
+                        session_id=request.session_id
+                    )
+                yield _sse_event("done", final.model_dump())
+                
+        except Exception as e:
+            # Emergency fallback
+            fallback = ChatResponse(
+                response="I'm having trouble connecting to the AI service right now. Please try again in a moment!",
+                success=False,
+                fallback_used=True,
+                session_id=request.session_id
+            )
+            yield _sse_event("done", fallback.model_dump())
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.get("/queue")
+async def get_queue_metrics():
+    """Queue depth, active generations and wait times per model"""
+    ollama_service = get_ollama_service()
+    return ollama_service.admission.get_metrics()
+
+@router.get("/cache")
+async def get_cache_stats():
+    """Response cache hit rate and size"""
+    response_cache = get_response_cache()
+    if response_cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **response_cache.stats()}
+
+@router.delete("/cache")
+async def clear_cache():
+    """Drop every cached response"""
+    response_cache = get_response_cache()
+    if response_cache is not None:
+        await asyncio.to_thread(response_cache.clear)
+    return {"success": True}
+
+@router.get("/index")
+async def get_index_metrics():
+    """Semantic indexer lag, throughput and store size"""
+    indexer = get_indexer()
+    if indexer is None:
+        return {"enabled": False}
+    return {"enabled": True, **indexer.get_metrics()}
+
 @router.get("/status", response_model=OllamaStatusResponse)
 async def get_chat_status():
     """
     Get Ollama service status and system information
     """
+    ollama_service = get_ollama_service()
     try:
-        # Check Ollama status
-        status = await ollama_service.check_ollama_status()
+        # Check Ollama status (served from cache while fresh)
+        status = await ollama_service.get_status()
         
         # Get system info
         system_info = ollama_service.get_system_info()
@@ -127,6 +355,7 @@ async def pull_model(request: dict):
     """
     Download/pull a specific Ollama model
     """
+    ollama_service = get_ollama_service()
     try:
         model_name = request.get("model_name")
         if not model_name:
@@ -137,24 +366,81 @@ async def pull_model(request: dict):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/warm-up")
+async def warm_up_model(request: dict):
+    """
+    Preload a model so the first message after a model change doesn't pay the load time
+    """
+    ollama_service = get_ollama_service()
+    try:
+        model_name = request.get("model_name")
+        if not model_name:
+            raise HTTPException(status_code=400, detail="model_name is required")
+            
+        return await ollama_service.warm_up_model(model_name)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/loaded-models")
+async def get_loaded_models():
+    """Get the models Ollama currently holds in memory"""
+    ollama_service = get_ollama_service()
+    try:
+        models = await ollama_service.get_loaded_models()
+        return {"models": models, "current_model": ollama_service.current_model}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.get("/models")
 async def get_available_models():
     """
     Get list of available models and system recommendations
     """
+    ollama_service = get_ollama_service()
     try:
         system_info = ollama_service.get_system_info()
+        # Observed throughput on this machine next to the static requirements
+        observed = ollama_service.performance.summaries()
         return {
-            "models": ollama_service.models,
+            "models": {
+                name: {**config, "observed": observed.get(name)}
+                for name, config in ollama_service.models.items()
+            },
+            "observed": observed,
             "system_info": system_info
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/models/selection")
+async def get_model_selection(message: str = ""):
+    """Predicted latency per downloaded model and the one that would be picked for `message`"""
+    ollama_service = get_ollama_service()
+    await ollama_service.get_status()
+    return {
+        "selected": ollama_service.select_model(message),
+        "mode": settings.MODEL_SELECTION,
+        "latency_slo": settings.MODEL_LATENCY_SLO,
+        "candidates": ollama_service.rank_models(message)
+    }
+
+@router.post("/models/benchmark")
+async def benchmark_models(request: dict = None):
+    """Run a short generation on each downloaded model that fits in memory (or the listed ones)"""
+    ollama_service = get_ollama_service()
+    models = (request or {}).get("models")
+    results = await ollama_service.benchmark_models(models)
+    # Leave the model we'd now pick loaded for the next chat
+    ollama_service.schedule_warm_up_selected()
+    return {"results": results, "selected": ollama_service.select_model()}
+
 # ✅ NEW: Missing endpoints that were causing 500 errors
 @router.delete("/delete-model/{model_name}")
 async def delete_model(model_name: str):
     """Delete a model from Ollama"""
+    ollama_service = get_ollama_service()
     try:
         result = await ollama_service.delete_model(model_name)
         return result
@@ -164,8 +450,9 @@ async def delete_model(model_name: str):
 @router.get("/downloaded-models")
 async def get_downloaded_models():
     """Get list of downloaded models from Ollama"""
+    ollama_service = get_ollama_service()
     try:
-        models = await ollama_service.get_downloaded_models()
+        models = await ollama_service.get_downloaded_models(use_cache=True)
         return {"models": models}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -173,6 +460,7 @@ async def get_downloaded_models():
 @router.get("/download-progress/{model_name}")
 async def get_download_progress(model_name: str):
     """Get download progress for a model"""
+    ollama_service = get_ollama_service()
     try:
         progress = await ollama_service.get_download_progress(model_name)
         return progress
@@ -1,20 +1,68 @@
-from fastapi import APIRouter, HTTPException, Query
-from app.services.diary import get_diary_entries, get_diary_entry, create_diary_entry, update_diary_entry, delete_diary_entry
+from fastapi import APIRouter, HTTPException, Query, Body, Response
+from app.core.config import settings
+from app.services.bulk import summarize
+from app.services.diary import (
+    get_diary_entries, get_diary_page, get_diary_entry, create_diary_entry, update_diary_entry, delete_diary_entry,
+    create_diary_entries, update_diary_entries, delete_diary_entries
+)
 from app.api.v1.schemas.diary import DiaryEntryCreate, DiaryEntryUpdate, DiaryEntryResponse
-from typing import List
+from typing import List, Optional
 
 router = APIRouter()
 
 @router.get("/diary", response_model=List[DiaryEntryResponse])
-async def read_diary_entries(user_id: str = Query(..., description="User ID")):
-    """Get all diary entries for a user"""
-    entries = get_diary_entries(user_id)
-    return entries
+async def read_diary_entries(
+    response: Response,
+    user_id: str = Query(..., description="User ID"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor header of the previous response"),
+    limit: Optional[int] = Query(None, ge=1, description="At most this many entries; all of them when omitted")
+):
+    """
+    Get a user's diary entries, newest first. When `limit` leaves entries
+    out, the X-Next-Cursor header holds the cursor for the rest.
+    """
+    try:
+        page = await get_diary_entries(user_id, cursor=cursor, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if page["next_cursor"]:
+        response.headers["X-Next-Cursor"] = page["next_cursor"]
+    return page["items"]
+
+@router.get("/diary/entries")
+async def list_diary_entries(
+    user_id: str = Query(..., description="User ID"),
+    fields: Optional[str] = Query(None, description="Comma-separated columns, e.g. id,title,entry_date,mood"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(50, ge=1, le=200)
+):
+    """Get diary entries a page at a time, newest first: {"items", "next_cursor"}"""
+    field_list = [field.strip() for field in fields.split(",") if field.strip()] if fields else None
+    try:
+        return await get_diary_page(user_id, fields=field_list, cursor=cursor, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+# Bulk routes are declared before /diary/entries/{entry_id} so "bulk" isn't taken for an id
+@router.post("/diary/entries/bulk")
+async def create_entries_bulk(entries: List[dict] = Body(..., max_length=settings.BULK_MAX_ITEMS)):
+    """Create many diary entries in one request; returns a result per entry, in request order"""
+    return summarize(await create_diary_entries(entries))
+
+@router.put("/diary/entries/bulk")
+async def update_entries_bulk(entries: List[dict] = Body(..., max_length=settings.BULK_MAX_ITEMS)):
+    """Update many diary entries in one request; each entry needs its id"""
+    return summarize(await update_diary_entries(entries))
+
+@router.post("/diary/entries/bulk/delete")
+async def delete_entries_bulk(entry_ids: List[int] = Body(..., max_length=settings.BULK_MAX_ITEMS)):
+    """Delete many diary entries by id in one request"""
+    return summarize(await delete_diary_entries(entry_ids))
 
 @router.get("/diary/entries/{entry_id}", response_model=DiaryEntryResponse)
 async def read_diary_entry(entry_id: int, user_id: str = Query(...)):
     """Get a specific diary entry"""
-    entry = get_diary_entry(entry_id, user_id)
+    entry = await get_diary_entry(entry_id, user_id)
     if not entry:
         raise HTTPException(status_code=404, detail="Diary entry not found")
     return entry
@@ -22,12 +70,12 @@ async def read_diary_entry(entry_id: int, user_id: str = Query(...)):
 @router.post("/diary/entries", response_model=DiaryEntryResponse)
 async def create_entry(entry: DiaryEntryCreate):
     """Create a new diary entry"""
-    return create_diary_entry(entry.dict())
+    return await create_diary_entry(entry.dict())
 
 @router.put("/diary/entries/{entry_id}", response_model=DiaryEntryResponse)
 async def update_entry(entry_id: int, entry: DiaryEntryUpdate):
     """Update a diary entry"""
-    updated_entry = update_diary_entry(entry_id, entry.dict())
+    updated_entry = await update_diary_entry(entry_id, entry.dict())
     if not updated_entry:
         raise HTTPException(status_code=404, detail="Diary entry not found")
     return updated_entry
@@ -35,7 +83,7 @@ async def update_entry(entry_id: int, entry: DiaryEntryUpdate):
 @router.delete("/diary/entries/{entry_id}")
 async def delete_entry(entry_id: int):
     """Delete a diary entry"""
-    success = delete_diary_entry(entry_id)
+    success = await delete_diary_entry(entry_id)
     if not success:
         raise HTTPException(status_code=404, detail="Diary entry not found")
     return {"detail": "Diary entry deleted"}
\ No newline at end of file
@@ -0,0 +1,28 @@
+import time
+from fastapi import APIRouter
+
+from app.core.config import settings
+from app.core.responses import CustomJSONResponse
+from app.services.health import health_monitor
+
+router = APIRouter(prefix="/health", tags=["health"])
+
+STARTED_AT = time.monotonic()
+
+def required_probes():
+    return [name.strip() for name in settings.HEALTH_REQUIRED_PROBES.split(",") if name.strip()]
+
+@router.get("/live")
+async def liveness():
+    """The process is up and serving requests; dependencies are not checked"""
+    return {"status": "alive", "uptime_seconds": round(time.monotonic() - STARTED_AT, 1)}
+
+@router.get("/ready")
+async def readiness():
+    """
+    Cached results of the background dependency probes. 503 while any
+    required probe (HEALTH_REQUIRED_PROBES) is failing, e.g. Ollama is down.
+    """
+    report = health_monitor.readiness(required_probes())
+    report["status"] = "ready" if report["ready"] else "not_ready"
+    return CustomJSONResponse(status_code=200 if report["ready"] else 503, content=report)
@@ -1,26 +1,52 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Body
 from app.api.v1.schemas.task import TaskCreate, TaskUpdate, TaskInDB
-from app.tasks.task import get_tasks_by_date, create_task, update_task, delete_task
-from typing import List
+from app.core.config import settings
+from app.services.bulk import summarize
+from app.tasks.task import (
+    get_tasks_by_date, get_tasks_in_range, create_task, update_task, delete_task,
+    create_tasks_bulk, update_tasks_bulk, delete_tasks_bulk
+)
+from typing import List, Optional
 import traceback
 
 router = APIRouter()
 
 @router.get("/tasks", response_model=List[dict])
-def get_tasks(date: str = Query(..., description="Date in format YYYY-MM-DD"), 
+async def get_tasks(date: str = Query(..., description="Date in format YYYY-MM-DD"), 
               user_id: str = Query(..., description="User ID")):
     """
     Get tasks for a specific date and user.
     Date should be in format YYYY-MM-DD (e.g. 2025-05-21)
     """
     try:
-        return get_tasks_by_date(date, user_id)
+        return await get_tasks_by_date(date, user_id)
+    except Exception as e:
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=f"Error fetching tasks: {str(e)}")
+
+@router.get("/tasks/range", response_model=dict)
+async def get_tasks_range(
+    start: str = Query(..., description="First date, YYYY-MM-DD"),
+    end: str = Query(..., description="Last date (inclusive), YYYY-MM-DD"),
+    user_id: str = Query(..., description="User ID"),
+    status: Optional[str] = Query(None, description="pending, completed or failed"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(500, ge=1, le=1000)
+):
+    """
+    Get a user's tasks for a whole date range in one call, grouped by date.
+    Returns {"days": {date: [tasks]}, "count", "next_cursor"}.
+    """
+    try:
+        return await get_tasks_in_range(user_id, start, end, status, cursor, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=f"Error fetching tasks: {str(e)}")
 
 @router.post("/tasks", response_model=dict)
-def create_task_endpoint(task: dict):
+async def create_task_endpoint(task: dict):
     try:
         print(f"Backend API: Received create request: {task}")
         
@@ -39,7 +65,7 @@ def create_task_endpoint(task: dict):
             'user_id': task['user_id']
         }
         
-        result = create_task(task_data)
+        result = await create_task(task_data)
         
         if not result:
             raise HTTPException(status_code=500, detail="Failed to create task")
@@ -50,8 +76,36 @@ def create_task_endpoint(task: dict):
         print(f"Backend API: Error creating task: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error creating task: {str(e)}")
 
+# Bulk routes are declared before /tasks/{task_id} so "bulk" isn't taken for an id
+@router.post("/tasks/bulk", response_model=dict)
+async def create_tasks_bulk_endpoint(tasks: List[dict] = Body(..., max_length=settings.BULK_MAX_ITEMS)):
+    """Create many tasks in one request; returns a result per task, in request order"""
+    try:
+        return summarize(await create_tasks_bulk(tasks))
+    except Exception as e:
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=f"Error creating tasks: {str(e)}")
+
+@router.put("/tasks/bulk", response_model=dict)
+async def update_tasks_bulk_endpoint(tasks: List[dict] = Body(..., max_length=settings.BULK_MAX_ITEMS)):
+    """Update many tasks in one request; each task needs its id"""
+    try:
+        return summarize(await update_tasks_bulk(tasks))
+    except Exception as e:
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=f"Error updating tasks: {str(e)}")
+
+@router.post("/tasks/bulk/delete", response_model=dict)
+async def delete_tasks_bulk_endpoint(task_ids: List[int] = Body(..., max_length=settings.BULK_MAX_ITEMS)):
+    """Delete many tasks by id in one request"""
+    try:
+        return summarize(await delete_tasks_bulk(task_ids))
+    except Exception as e:
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=f"Error deleting tasks: {str(e)}")
+
 @router.put("/tasks/{task_id}", response_model=dict)
-def update_task_endpoint(task_id: int, task: dict):
+async def update_task_endpoint(task_id: int, task: dict):
     try:
         print(f"Backend API: Received update request for task {task_id}")
         print(f"Backend API: Task data: {task}")
@@ -61,7 +115,7 @@ def update_task_endpoint(task_id: int, task: dict):
             # Handle legacy requests that might still send 'text'
             task['title'] = task.pop('text')
         
-        result = update_task(task_id, task)
+        result = await update_task(task_id, task)
         
         if not result:
             print(f"Backend API: No result returned from update_task")
@@ -78,9 +132,9 @@ def update_task_endpoint(task_id: int, task: dict):
         )
 
 @router.delete("/tasks/{task_id}", response_model=dict)
-def delete_task_endpoint(task_id: int):
+async def delete_task_endpoint(task_id: int):
     try:
-        return delete_task(task_id)
+        return await delete_task(task_id)
     except Exception as e:
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=f"Error deleting task: {str(e)}")
\ No newline at end of file
@@ -6,14 +6,14 @@ import uuid
 router = APIRouter(prefix="/user", tags=["user"])
 
 @router.post("/register", response_model=UserResponse)
-def register_user(user_data: UserCreate):
+async def register_user(user_data: UserCreate):
     try:
         # Generate UUID for new user
         user_data_dict = user_data.dict()
         user_data_dict["id"] = str(uuid.uuid4())
         
         # Create user in database
-        created_user = create_user(user_data_dict)
+        created_user = await create_user(user_data_dict)
         
         if not created_user:
             raise HTTPException(
@@ -27,8 +27,8 @@ def register_user(user_data: UserCreate):
             detail=f"Error creating user: {str(e)}")
 
 @router.post("/login", response_model=UserResponse)
-def login_user(login_data: UserLogin):
-    user = get_user_by_username_and_password(login_data.username, login_data.password)
+async def login_user(login_data: UserLogin):
+    user = await get_user_by_username_and_password(login_data.username, login_data.password)
     
     if not user:
         raise HTTPException(
@@ -12,6 +12,73 @@ class Settings(BaseSettings):
     # Supabase settings
     SUPABASE_URL: str = os.getenv("SUPABASE_URL", "")
     SUPABASE_KEY: str = os.getenv("SUPABASE_KEY", "")
+    # Connection pool and deadlines for the async PostgREST client
+    SUPABASE_HTTP2: bool = os.getenv("SUPABASE_HTTP2", "True").lower() == "true"
+    SUPABASE_MAX_CONNECTIONS: int = int(os.getenv("SUPABASE_MAX_CONNECTIONS", "20"))
+    SUPABASE_MAX_KEEPALIVE: int = int(os.getenv("SUPABASE_MAX_KEEPALIVE", "10"))
+    SUPABASE_KEEPALIVE_EXPIRY: float = float(os.getenv("SUPABASE_KEEPALIVE_EXPIRY", "30"))
+    SUPABASE_TIMEOUT: float = float(os.getenv("SUPABASE_TIMEOUT", "10"))
+    SUPABASE_CONNECT_TIMEOUT: float = float(os.getenv("SUPABASE_CONNECT_TIMEOUT", "5"))
+    # Response encoder: auto (orjson, then msgspec, then stdlib), orjson, msgspec or json
+    JSON_SERIALIZER: str = os.getenv("JSON_SERIALIZER", "auto")
+    # Largest array accepted by the bulk task/event/diary endpoints
+    BULK_MAX_ITEMS: int = int(os.getenv("BULK_MAX_ITEMS", "500"))
+    # In-process user existence/profile cache
+    USER_CACHE_TTL: float = float(os.getenv("USER_CACHE_TTL", "300"))
+    USER_CACHE_NEGATIVE_TTL: float = float(os.getenv("USER_CACHE_NEGATIVE_TTL", "10"))
+    USER_CACHE_MAX_ENTRIES: int = int(os.getenv("USER_CACHE_MAX_ENTRIES", "1024"))
+    
+    # Ollama settings
+    OLLAMA_URL: str = os.getenv("OLLAMA_URL", "http://localhost:11434")
+    # Ollama speaks HTTP/1.1 without pipelining: every in-flight request holds
+    # its own connection, so size the generation pool for concurrent generations
+    OLLAMA_MAX_CONNECTIONS: int = int(os.getenv("OLLAMA_MAX_CONNECTIONS", "8"))
+    OLLAMA_KEEPALIVE_EXPIRY: float = float(os.getenv("OLLAMA_KEEPALIVE_EXPIRY", "60"))
+    # Generation timeouts (seconds): connecting, waiting for the first token
+    # (model load + prompt eval, then the gap allowed between tokens) and the whole reply
+    OLLAMA_CONNECT_TIMEOUT: float = float(os.getenv("OLLAMA_CONNECT_TIMEOUT", "5"))
+    OLLAMA_FIRST_BYTE_TIMEOUT: float = float(os.getenv("OLLAMA_FIRST_BYTE_TIMEOUT", "120"))
+    OLLAMA_TOTAL_TIMEOUT: float = float(os.getenv("OLLAMA_TOTAL_TIMEOUT", "300"))
+    # Status, model list and unload calls use their own small pool and timeout
+    OLLAMA_CONTROL_TIMEOUT: float = float(os.getenv("OLLAMA_CONTROL_TIMEOUT", "10"))
+    # Send chat history as /api/chat messages so Ollama can reuse the cached prompt prefix
+    OLLAMA_CHAT_API: bool = os.getenv("OLLAMA_CHAT_API", "True").lower() == "true"
+    # How long Ollama keeps a model resident after its last request
+    OLLAMA_KEEP_ALIVE: str = os.getenv("OLLAMA_KEEP_ALIVE", "30m")
+    # Admission control in front of Ollama
+    OLLAMA_MAX_CONCURRENT_PER_MODEL: int = int(os.getenv("OLLAMA_MAX_CONCURRENT_PER_MODEL", "1"))
+    OLLAMA_MAX_QUEUE_DEPTH: int = int(os.getenv("OLLAMA_MAX_QUEUE_DEPTH", "8"))
+    OLLAMA_MAX_QUEUE_WAIT: float = float(os.getenv("OLLAMA_MAX_QUEUE_WAIT", "30"))
+    
+    # Model choice when a chat request doesn't name one: "adaptive" picks the
+    # largest downloaded model predicted to reply within MODEL_LATENCY_SLO seconds
+    # (for a reply of MODEL_EXPECTED_OUTPUT_TOKENS), "static" goes by installed RAM.
+    # A loaded model is kept unless another is MODEL_SWITCH_MARGIN larger (0.5 = 50%)
+    MODEL_SELECTION: str = os.getenv("MODEL_SELECTION", "adaptive")
+    MODEL_LATENCY_SLO: float = float(os.getenv("MODEL_LATENCY_SLO", "30"))
+    MODEL_EXPECTED_OUTPUT_TOKENS: int = int(os.getenv("MODEL_EXPECTED_OUTPUT_TOKENS", "256"))
+    MODEL_MEMORY_HEADROOM_GB: float = float(os.getenv("MODEL_MEMORY_HEADROOM_GB", "1.0"))
+    MODEL_SWITCH_MARGIN: float = float(os.getenv("MODEL_SWITCH_MARGIN", "0.5"))
+    
+    # Background dependency probes behind /health/ready
+    HEALTH_CHECK_INTERVAL: float = float(os.getenv("HEALTH_CHECK_INTERVAL", "10"))
+    HEALTH_PROBE_TIMEOUT: float = float(os.getenv("HEALTH_PROBE_TIMEOUT", "3"))
+    # Probes that must pass for the backend to report ready (supabase, sqlite, ollama)
+    HEALTH_REQUIRED_PROBES: str = os.getenv("HEALTH_REQUIRED_PROBES", "supabase,sqlite,ollama")
+    
+    # Response cache for repeated chat prompts
+    RESPONSE_CACHE_ENABLED: bool = os.getenv("RESPONSE_CACHE_ENABLED", "True").lower() == "true"
+    RESPONSE_CACHE_TTL: float = float(os.getenv("RESPONSE_CACHE_TTL", "3600"))
+    RESPONSE_CACHE_MAX_ENTRIES: int = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "256"))
+    RESPONSE_CACHE_MAX_MB: int = int(os.getenv("RESPONSE_CACHE_MAX_MB", "16"))
+    
+    # Semantic retrieval over chat history and diary (needs sentence-transformers)
+    SEMANTIC_SEARCH_ENABLED: bool = os.getenv("SEMANTIC_SEARCH_ENABLED", "True").lower() == "true"
+    EMBEDDING_MODEL: str = os.getenv("EMBEDDING_MODEL", "all-MiniLM-L6-v2")
+    EMBEDDING_DTYPE: str = os.getenv("EMBEDDING_DTYPE", "int8")  # int8 or float16
+    INDEXER_BATCH_SIZE: int = int(os.getenv("INDEXER_BATCH_SIZE", "64"))
+    INDEXER_INTERVAL: float = float(os.getenv("INDEXER_INTERVAL", "30"))
+    INDEXER_WORKERS: int = int(os.getenv("INDEXER_WORKERS", "1"))
     
     # Debug settings
     DEBUG: bool = os.getenv("DEBUG", "False").lower() == "true"
@@ -0,0 +1,125 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Seconds, from a fast SQLite read up to a slow generation
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+# Tokens per second, from a large model on CPU to prompt eval on a GPU
+RATE_BUCKETS = (1, 2, 5, 10, 20, 30, 50, 75, 100, 150, 250, 500, 1000, 2500, 5000)
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra is not None:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+class Histogram:
+    """
+    Cumulative-bucket histogram in the Prometheus exposition format,
+    one series per combination of label values.
+    """
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Tuple[str, ...], List[float]] = {}  # labels -> bucket counts + [sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str):
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+            series[index] += 1  # the last bucket slot is +Inf
+            series[-2] += value
+            series[-1] += 1
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """Observe the wall-clock duration of the with block"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = sorted((key, list(counts)) for key, counts in self._series.items())
+        for key, counts in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                labels = _format_labels(self.labelnames, key, ("le", _format_value(bound)))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(counts[-2])}")
+            lines.append(f"{self.name}_count{labels} {counts[-1]}")
+        return lines
+
+class MetricsRegistry:
+    """The process's metrics, rendered together for /metrics"""
+
+    def __init__(self):
+        self._metrics: Dict[str, Histogram] = {}
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        if name not in self._metrics:
+            self._metrics[name] = Histogram(name, documentation, labelnames, buckets)
+        return self._metrics[name]
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+registry = MetricsRegistry()
+
+CONTEXT_SECTION_SECONDS = registry.histogram(
+    "wingman_context_section_seconds",
+    "Time to fetch one section of the chat context from wingman.db",
+    ["section"]
+)
+OLLAMA_TTFT_SECONDS = registry.histogram(
+    "wingman_ollama_time_to_first_token_seconds",
+    "Time from sending a generation to its first token (Ollama load + prompt eval when not streaming)",
+    ["model", "mode"]
+)
+OLLAMA_PROMPT_EVAL_RATE = registry.histogram(
+    "wingman_ollama_prompt_eval_tokens_per_second",
+    "Prompt evaluation rate reported by Ollama (prompt_eval_count / prompt_eval_duration)",
+    ["model"],
+    RATE_BUCKETS
+)
+OLLAMA_EVAL_RATE = registry.histogram(
+    "wingman_ollama_eval_tokens_per_second",
+    "Generation rate reported by Ollama (eval_count / eval_duration)",
+    ["model"],
+    RATE_BUCKETS
+)
+SUPABASE_REQUEST_SECONDS = registry.histogram(
+    "wingman_supabase_request_seconds",
+    "Latency of PostgREST calls by table, method and outcome",
+    ["table", "method", "outcome"]
+)
+SERIALIZATION_SECONDS = registry.histogram(
+    "wingman_response_serialization_seconds",
+    "Time to encode a JSON response body",
+    ["serializer"]
+)
@@ -1,19 +1,83 @@
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
 from typing import Any
+from uuid import UUID
 from fastapi.responses import JSONResponse
+from app.core.config import settings
+from app.core.metrics import SERIALIZATION_SECONDS
+
+# Optional fast encoders; the stdlib is always there as a fallback
+try:
+    import orjson
+    # patch-orjson.py installs a stdlib shim under this name, which is no faster
+    if getattr(orjson, "__file__", None) is None:
+        orjson = None
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+def _default(obj: Any) -> Any:
+    """Types the encoders don't all handle natively"""
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    if isinstance(obj, UUID):
+        return str(obj)
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def _orjson_dumps(content: Any) -> bytes:
+    return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+def _stdlib_dumps(content: Any) -> bytes:
+    return json.dumps(
+        content,
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+        default=_default,
+    ).encode("utf-8")
+
+def _select_serializer(preference: str):
+    """Pick the encoder named in JSON_SERIALIZER, or the fastest installed one for 'auto'"""
+    available = {"json": _stdlib_dumps}
+    if msgspec is not None:
+        # msgspec writes Decimal natively as a string; match the float the others emit
+        available["msgspec"] = msgspec.json.Encoder(enc_hook=_default, decimal_format="number").encode
+    if orjson is not None:
+        available["orjson"] = _orjson_dumps
+
+    if preference != "auto":
+        if preference in available:
+            return preference, available[preference]
+        print(f"JSON serializer '{preference}' is not installed, choosing automatically")
+
+    for name in ("orjson", "msgspec", "json"):
+        if name in available:
+            return name, available[name]
+
+SERIALIZER_NAME, _dumps = _select_serializer(settings.JSON_SERIALIZER)
+
+def dumps(content: Any) -> bytes:
+    """Serialize a response body with the selected encoder"""
+    return _dumps(content)
 
 class CustomJSONResponse(JSONResponse):
     """
-    Custom JSON response that doesn't rely on orjson or ujson.
-    Uses the standard library json instead.
+    JSON response rendered with orjson or msgspec when installed, and the
+    standard library json otherwise. date/datetime/UUID values are encoded
+    as ISO strings by every backend, so services can return them as-is.
     """
     media_type = "application/json"
 
     def render(self, content: Any) -> bytes:
-        import json
-        return json.dumps(
-            content,
-            ensure_ascii=False,
-            allow_nan=False,
-            indent=None,
-            separators=(",", ":"),
-        ).encode("utf-8")
\ No newline at end of file
+        with SERIALIZATION_SECONDS.time(serializer=SERIALIZER_NAME):
+            return dumps(content)
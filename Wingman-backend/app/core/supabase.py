@@ -1,6 +1,10 @@
-import os
-from supabase import create_client, Client
+import asyncio
+import time
+import httpx
+from typing import Optional
+from postgrest import AsyncPostgrestClient
 from app.core.config import settings
+from app.core.metrics import SUPABASE_REQUEST_SECONDS
 import logging
 import traceback
 
@@ -8,36 +12,12 @@ import traceback
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Initialize supabase connection
-try:
-    logger.info(f"Initializing Supabase client with URL: {settings.SUPABASE_URL[:20]}...")
-    
-    # Check if credentials are available
-    if not settings.SUPABASE_URL or not settings.SUPABASE_KEY:
-        raise ValueError("Supabase URL or key missing in environment variables")
-    
-    # Basic version with minimal parameters
-    supabase = create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
-    
-    # Test connection with a simple query
-    try:
-        test = supabase.from_('users').select('id').limit(1).execute()
-        logger.info(f"Supabase connection test successful")
-    except Exception as test_error:
-        logger.warning(f"Supabase connection test query failed: {str(test_error)}")
-        raise ValueError(f"Could not connect to Supabase: {str(test_error)}")
-    
-    logger.info("Supabase client initialized successfully")
-except Exception as e:
-    logger.error(f"Failed to initialize Supabase client: {str(e)}")
-    logger.error(f"Traceback: {traceback.format_exc()}")
-    
-    # Provide a fake client for development/testing
+_supabase = None
+
+def _create_mock_client():
+    """Stand-in for the sync client when it can't be created (development/testing)"""
     from unittest.mock import MagicMock
     
-    # Create a mock that behaves like the supabase client
-    mock_data = []
-    
     class MockExecute:
         def __init__(self):
             self.data = []
@@ -59,12 +39,97 @@ except Exception as e:
             result = MockExecute()
             return result
     
-    supabase = MagicMock()
-    supabase.table.return_value = MockTable()
-    supabase.from_.return_value = MockTable()
-    
-    logger.warning("Using mock Supabase client due to initialization error")
+    mock = MagicMock()
+    mock.table.return_value = MockTable()
+    mock.from_.return_value = MockTable()
+    return mock
 
 def get_supabase_client():
-    """Return the Supabase client instance."""
-    return supabase
\ No newline at end of file
+    """
+    Return the sync Supabase client, creating it on first use.
+    
+    The supabase package (auth, storage, realtime) is slow to import and the
+    request path only needs PostgREST, so neither happens at import time.
+    Connectivity is checked in the background by app.services.health.
+    """
+    global _supabase
+    if _supabase is None:
+        try:
+            if not settings.SUPABASE_URL or not settings.SUPABASE_KEY:
+                raise ValueError("Supabase URL or key missing in environment variables")
+            from supabase import create_client
+            _supabase = create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
+            logger.info("Supabase client initialized successfully")
+        except Exception as e:
+            logger.error(f"Failed to initialize Supabase client: {str(e)}")
+            logger.error(f"Traceback: {traceback.format_exc()}")
+            _supabase = _create_mock_client()
+            logger.warning("Using mock Supabase client due to initialization error")
+    return _supabase
+
+# Async data access: one pooled HTTP/2 connection to PostgREST shared by every request
+class PooledPostgrestClient(AsyncPostgrestClient):
+    """AsyncPostgrestClient whose HTTP session uses our pool limits"""
+
+    def create_session(self, base_url, headers, timeout, verify=True, proxy=None):
+        return httpx.AsyncClient(
+            base_url=base_url,
+            headers=headers,
+            timeout=timeout,
+            verify=verify,
+            proxy=proxy,
+            follow_redirects=True,
+            http2=settings.SUPABASE_HTTP2,
+            limits=httpx.Limits(
+                max_connections=settings.SUPABASE_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.SUPABASE_MAX_KEEPALIVE,
+                keepalive_expiry=settings.SUPABASE_KEEPALIVE_EXPIRY
+            )
+        )
+
+_async_client: Optional[PooledPostgrestClient] = None
+
+def get_async_supabase_client() -> PooledPostgrestClient:
+    """Return the shared async PostgREST client, creating it on first use."""
+    global _async_client
+    if _async_client is None:
+        if not settings.SUPABASE_URL or not settings.SUPABASE_KEY:
+            logger.warning("Supabase URL or key missing, async Supabase calls will fail")
+        _async_client = PooledPostgrestClient(
+            f"{settings.SUPABASE_URL.rstrip('/')}/rest/v1",
+            headers={
+                "apiKey": settings.SUPABASE_KEY,
+                "Authorization": f"Bearer {settings.SUPABASE_KEY}"
+            },
+            timeout=httpx.Timeout(settings.SUPABASE_TIMEOUT, connect=settings.SUPABASE_CONNECT_TIMEOUT)
+        )
+    return _async_client
+
+async def close_async_supabase_client():
+    """Close the pooled connections (called on app shutdown)."""
+    global _async_client
+    if _async_client is not None:
+        await _async_client.aclose()
+        _async_client = None
+
+async def execute(query, timeout: Optional[float] = None):
+    """
+    Await a PostgREST query with a per-call deadline (SUPABASE_TIMEOUT by default),
+    recording its latency per table in wingman_supabase_request_seconds.
+    """
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        response = await asyncio.wait_for(query.execute(), timeout or settings.SUPABASE_TIMEOUT)
+        outcome = "ok"
+        return response
+    except asyncio.TimeoutError:
+        outcome = "timeout"
+        raise
+    finally:
+        SUPABASE_REQUEST_SECONDS.observe(
+            time.perf_counter() - start,
+            table=getattr(query, "path", "").strip("/") or "unknown",
+            method=getattr(query, "http_method", ""),
+            outcome=outcome
+        )
@@ -0,0 +1,166 @@
+import asyncio
+from typing import Dict, List, Any, Callable, Iterable, Optional
+
+from app.core.config import settings
+from app.core.supabase import get_async_supabase_client, execute
+from app.services.user import verify_user_exists
+
+def item_result(index: int, data: Optional[Dict[str, Any]] = None, error: Optional[str] = None) -> Dict[str, Any]:
+    """One entry of a bulk response, pointing back at the request array by index"""
+    if error is not None:
+        return {"index": index, "success": False, "error": error}
+    return {"index": index, "success": True, "data": data}
+
+def summarize(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Bulk endpoint response body"""
+    succeeded = sum(1 for result in results if result["success"])
+    return {
+        "results": sorted(results, key=lambda result: result["index"]),
+        "succeeded": succeeded,
+        "failed": len(results) - succeeded
+    }
+
+async def verify_users(user_ids: Iterable[Optional[str]]) -> Dict[str, bool]:
+    """Check each distinct user id once for the whole batch"""
+    distinct = sorted({user_id for user_id in user_ids if user_id})
+    exists = await asyncio.gather(*(verify_user_exists(user_id) for user_id in distinct))
+    return dict(zip(distinct, exists))
+
+async def bulk_write(
+    table: str,
+    rows: Dict[int, Dict[str, Any]],
+    to_frontend: Callable[[Dict[str, Any]], Dict[str, Any]] = lambda row: row
+) -> List[Dict[str, Any]]:
+    """
+    Insert rows keyed by request index with one PostgREST call.
+
+    PostgREST needs every object in a bulk body to have the same keys, so
+    rows are grouped by key set; in practice a batch is one group. A group
+    that fails as a whole (a single bad row aborts its transaction) is
+    retried row by row so the others still go through and the caller gets
+    an error only for the rows that caused it.
+    """
+    groups: Dict[tuple, List[int]] = {}
+    for index, row in rows.items():
+        groups.setdefault(tuple(sorted(row)), []).append(index)
+
+    slots = _request_slots()
+    results = []
+    for indexes in groups.values():
+        results.extend(await _write_group(table, indexes, [rows[index] for index in indexes], to_frontend, slots))
+    return results
+
+def _request_slots() -> asyncio.Semaphore:
+    """Caps one bulk call's concurrent PostgREST requests at the connection pool size"""
+    return asyncio.Semaphore(max(1, settings.SUPABASE_MAX_CONNECTIONS))
+
+async def _write_group(table, indexes, rows, to_frontend, slots, on_conflict=None) -> List[Dict[str, Any]]:
+    """Insert (or with on_conflict, upsert) rows in one call, falling back to one call per row"""
+    supabase = get_async_supabase_client()
+    try:
+        if on_conflict is None:
+            query = supabase.table(table).insert(rows)
+        else:
+            query = supabase.table(table).upsert(rows, on_conflict=on_conflict)
+        async with slots:
+            response = await execute(query)
+        if response.data and len(response.data) == len(rows):
+            return [item_result(index, to_frontend(row)) for index, row in zip(indexes, response.data)]
+        error = f"write returned {len(response.data or [])} of {len(rows)} rows"
+    except Exception as e:
+        error = str(e)
+
+    if len(rows) == 1:
+        return [item_result(indexes[0], error=error)]
+    print(f"Bulk write to {table} failed ({error}), retrying rows one by one")
+    retried = await asyncio.gather(*(
+        _write_group(table, [index], [row], to_frontend, slots, on_conflict)
+        for index, row in zip(indexes, rows)
+    ))
+    return [result for results in retried for result in results]
+
+async def bulk_update(
+    table: str,
+    rows: Dict[int, Dict[str, Any]],
+    to_frontend: Callable[[Dict[str, Any]], Dict[str, Any]] = lambda row: row
+) -> List[Dict[str, Any]]:
+    """
+    Update existing rows by id, keyed by request index.
+
+    One select fetches every row the batch names; ids it doesn't return are
+    reported as not found rather than inserted. The changes are merged into
+    the fetched rows, so every object has the full column set PostgREST
+    wants for a bulk body, and written back with a single upsert on id.
+    Several updates to the same id are applied in request order and all
+    report the final row.
+    """
+    if not rows:
+        return []
+
+    supabase = get_async_supabase_client()
+    ids = sorted({row["id"] for row in rows.values()}, key=str)
+    try:
+        response = await execute(supabase.table(table).select("*").in_("id", ids))
+    except Exception as e:
+        return [item_result(index, error=str(e)) for index in rows]
+
+    # Compared as strings so an id type mismatch can't read as an existing row
+    existing = {str(row["id"]): row for row in response.data or [] if "id" in row}
+    results = []
+    merged: Dict[str, Dict[str, Any]] = {}
+    requested_by: Dict[str, List[int]] = {}
+    for index, row in rows.items():
+        key = str(row["id"])
+        if key not in existing:
+            results.append(item_result(index, error=f"{row['id']} not found"))
+            continue
+        changes = {column: value for column, value in row.items() if column != "id"}
+        merged[key] = {**merged.get(key, existing[key]), **changes}
+        requested_by.setdefault(key, []).append(index)
+
+    if merged:
+        keys = list(merged)
+        written = await _write_group(
+            table,
+            [requested_by[key][0] for key in keys],
+            [merged[key] for key in keys],
+            to_frontend,
+            _request_slots(),
+            on_conflict="id"
+        )
+        for key, result in zip(keys, written):
+            for index in requested_by[key]:
+                results.append({**result, "index": index})
+    return results
+
+async def bulk_delete(
+    table: str,
+    ids: List[int],
+    to_frontend: Callable[[Dict[str, Any]], Dict[str, Any]] = lambda row: row
+) -> List[Dict[str, Any]]:
+    """
+    Delete rows by id in one call. Only ids that come back in the deleted
+    rows succeed; the rest, and repeats of an id, are reported as failed.
+    """
+    if not ids:
+        return []
+
+    supabase = get_async_supabase_client()
+    try:
+        response = await execute(supabase.table(table).delete().in_("id", sorted(set(ids))))
+    except Exception as e:
+        return [item_result(index, error=str(e)) for index in range(len(ids))]
+
+    # Compared as strings so an id type mismatch can't read as a successful delete
+    deleted = {str(row["id"]): row for row in response.data or [] if "id" in row}
+    results, seen = [], set()
+    for index, row_id in enumerate(ids):
+        key = str(row_id)
+        if key in seen:
+            results.append(item_result(index, error=f"{row_id} appears more than once"))
+        elif key in deleted:
+            results.append(item_result(index, to_frontend(deleted[key])))
+        else:
+            results.append(item_result(index, error=f"{row_id} not found"))
+        seen.add(key)
+    return results
@@ -1,52 +1,94 @@
 from datetime import date
-from app.core.supabase import supabase
+from app.core.supabase import get_async_supabase_client, execute
 from app.services.user import verify_user_exists
+from app.services.bulk import item_result, verify_users, bulk_write, bulk_update, bulk_delete
+from app.services.pagination import decode_cursor, after_filter, paginate, group_by_date
+from typing import List, Optional
 import traceback
 
-# Add proper date formatting
-
-def safe_format_date(date_value):
-    """Safely format date values for frontend"""
-    if date_value is None:
-        return None
-        
-    # If it's already a string, return it
-    if isinstance(date_value, str):
-        return date_value
-        
-    # If it's a date object, convert to ISO format
-    if isinstance(date_value, date):
-        return date_value.isoformat()
+def _event_row(event: dict) -> dict:
+    """Map frontend event fields to calendar_events columns"""
+    data = dict(event)
+    
+    # Frontend sends 'date' but DB needs 'event_date'
+    if "date" in data:
+        data["event_date"] = data["date"]
+        del data["date"]
+    
+    # Frontend sends 'time' but DB needs 'event_time'
+    if "time" in data:
+        data["event_time"] = data["time"]
+        del data["time"]
         
-    # Otherwise, convert to string
-    return str(date_value)
+    if isinstance(data.get("event_date"), date):
+        data["event_date"] = data["event_date"].isoformat()
+    
+    return data
 
-def get_events_by_date(date_value, user_id):
+def _event_for_frontend(event: dict) -> dict:
+    # Add date and time for frontend consistency
+    event["date"] = event.get("event_date")
+    event["time"] = event.get("event_time", "")
+    return event
+
+async def get_events_by_date(date_value, user_id):
     try:
+        supabase = get_async_supabase_client()
         # Accepts string or date
         if isinstance(date_value, date):
             date_value = date_value.isoformat()
             
         # Filter by both date and user_id
-        response = supabase.table("calendar_events").select("*").eq("event_date", date_value).eq("user_id", user_id).execute()
-        
-        # Transform response to add 'date' field for frontend
-        result = []
-        for event in response.data:
-            event_copy = dict(event)
-            # Add date and time fields for frontend
-            event_copy["date"] = safe_format_date(event_copy["event_date"])
-            event_copy["time"] = event_copy.get("event_time", "")
-            result.append(event_copy)
+        response = await execute(
+            supabase.table("calendar_events").select("*").eq("event_date", date_value).eq("user_id", user_id)
+        )
         
-        return result
+        # Add date and time fields for frontend
+        return [_event_for_frontend(event) for event in response.data]
     except Exception as e:
         traceback.print_exc()
         print(f"Error in get_events_by_date: {e}")
         return []
 
-def create_event(event):
+async def get_events_in_range(
+    user_id: str,
+    start: str,
+    end: str,
+    event_type: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = 500
+):
+    """
+    Events between two dates (inclusive) in one query, grouped by date.
+    Optionally only one event type; pages are keyed on (event_date, id).
+    """
+    supabase = get_async_supabase_client()
+    query = (
+        supabase.table("calendar_events").select("*")
+        .eq("user_id", user_id)
+        .gte("event_date", start)
+        .lte("event_date", end)
+    )
+    
+    if event_type:
+        query = query.eq("type", event_type)
+    
+    if cursor:
+        last_date, last_id = decode_cursor(cursor)
+        query = query.or_(after_filter("event_date", last_date, last_id))
+    
+    response = await execute(query.order("event_date").order("id").limit(limit + 1))
+    events, next_cursor = paginate(response.data, limit, lambda event: (event["event_date"], event["id"]))
+    
+    return {
+        "days": group_by_date([_event_for_frontend(event) for event in events], "date"),
+        "count": len(events),
+        "next_cursor": next_cursor
+    }
+
+async def create_event(event):
     try:
+        supabase = get_async_supabase_client()
         data = dict(event)
         
         # Make sure user_id is provided
@@ -54,29 +96,18 @@ def create_event(event):
             raise ValueError("user_id is required")
             
         # Verify user exists - CRITICAL STEP
-        if not verify_user_exists(data["user_id"]):
+        if not await verify_user_exists(data["user_id"]):
             raise ValueError(f"User with ID {data['user_id']} does not exist in the users table")
         
-        # Frontend sends 'date' but DB needs 'event_date'
-        if "date" in data:
-            data["event_date"] = data["date"]
-            del data["date"]
-        
-        # Frontend sends 'time' but DB needs 'event_time'
-        if "time" in data:
-            data["event_time"] = data["time"]
-            del data["time"]
-            
-        if isinstance(data.get("event_date"), date):
-            data["event_date"] = data["event_date"].isoformat()
+        data = _event_row(data)
             
         print(f"Creating event with data: {data}")
-        response = supabase.table("calendar_events").insert(data).execute()
+        response = await execute(supabase.table("calendar_events").insert(data))
         
         if response.data and len(response.data) > 0:
             event_data = response.data[0]
             # Add date and time for frontend consistency
-            event_data["date"] = safe_format_date(event_data["event_date"])
+            event_data["date"] = event_data["event_date"]
             event_data["time"] = event_data.get("event_time", "")
             return event_data
             
@@ -95,8 +126,9 @@ def create_event(event):
         print(f"Error in create_event: {e}")
         raise
 
-def update_event(event_id: int, event):
+async def update_event(event_id: int, event):
     try:
+        supabase = get_async_supabase_client()
         data = dict(event)
         
         # Remove the id field as it's an identity column and can't be updated
@@ -117,15 +149,15 @@ def update_event(event_id: int, event):
         
         print(f"Updating event {event_id} with data: {data}")
         # Execute the update query
-        response = supabase.table("calendar_events").update(data).eq("id", event_id).execute()
+        response = await execute(supabase.table("calendar_events").update(data).eq("id", event_id))
         
         # If no data returned, fetch the updated event
         if not response.data or len(response.data) == 0:
-            get_response = supabase.table("calendar_events").select("*").eq("id", event_id).execute()
+            get_response = await execute(supabase.table("calendar_events").select("*").eq("id", event_id))
             if get_response.data and len(get_response.data) > 0:
                 event_data = get_response.data[0]
                 # Add date and time for frontend consistency
-                event_data["date"] = safe_format_date(event_data["event_date"])
+                event_data["date"] = event_data["event_date"]
                 event_data["time"] = event_data.get("event_time", "")
                 return event_data
             
@@ -140,7 +172,7 @@ def update_event(event_id: int, event):
         # Process normal response
         event_data = response.data[0]
         # Add date and time for frontend consistency
-        event_data["date"] = safe_format_date(event_data["event_date"])
+        event_data["date"] = event_data["event_date"]
         event_data["time"] = event_data.get("event_time", "")
         return event_data
     except Exception as e:
@@ -152,12 +184,57 @@ def update_event(event_id: int, event):
             "message": "Failed to update event"
         }
 
-def delete_event(event_id: int):
-    response = supabase.table("calendar_events").delete().eq("id", event_id).execute()
+async def delete_event(event_id: int):
+    supabase = get_async_supabase_client()
+    response = await execute(supabase.table("calendar_events").delete().eq("id", event_id))
     if response.data and len(response.data) > 0:
         event_data = response.data[0]
         # Add date and time for frontend consistency
         event_data["date"] = event_data["event_date"]
         event_data["time"] = event_data.get("event_time", "")
         return event_data
-    return None
\ No newline at end of file
+    return None
+
+async def create_events_bulk(events: List[dict]) -> List[dict]:
+    """Create many events with a single insert; returns one result per input event"""
+    known_users = await verify_users(event.get("user_id") for event in events)
+    
+    results = []
+    rows = {}
+    for index, event in enumerate(events):
+        if not event.get("user_id"):
+            results.append(item_result(index, error="user_id is required"))
+        elif not known_users.get(event["user_id"]):
+            results.append(item_result(index, error=f"User with ID {event['user_id']} does not exist in the users table"))
+        else:
+            data = _event_row(event)
+            data.pop("id", None)
+            rows[index] = data
+    
+    results.extend(await bulk_write("calendar_events", rows, to_frontend=_event_for_frontend))
+    return results
+
+async def update_events_bulk(events: List[dict]) -> List[dict]:
+    """
+    Update many existing events by id; returns one result per input event.
+    Ids that don't exist and unknown user_ids are reported per event.
+    """
+    known_users = await verify_users(event.get("user_id") for event in events)
+    
+    results = []
+    rows = {}
+    for index, event in enumerate(events):
+        data = _event_row(event)
+        if not data.get("id"):
+            results.append(item_result(index, error="Missing required fields: id"))
+        elif "user_id" in data and not known_users.get(data["user_id"]):
+            results.append(item_result(index, error=f"User with ID {data['user_id']} does not exist in the users table"))
+        else:
+            rows[index] = data
+    
+    results.extend(await bulk_update("calendar_events", rows, to_frontend=_event_for_frontend))
+    return results
+
+async def delete_events_bulk(event_ids: List[int]) -> List[dict]:
+    """Delete many events with a single request; returns one result per id"""
+    return await bulk_delete("calendar_events", event_ids, to_frontend=_event_for_frontend)
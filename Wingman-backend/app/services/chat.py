@@ -1,14 +1,34 @@
-from app.core.supabase import supabase
+from app.core.supabase import get_async_supabase_client, execute
 from app.services.llm import get_llm_response
+from app.services.pagination import decode_cursor, after_filter, paginate, select_columns
 
-def save_message(user_id, message, timestamp):
-    response = supabase.table("chat_history").insert({
+CHAT_HISTORY_COLUMNS = ["id", "user_id", "message", "timestamp", "is_ai"]
+
+async def save_message(user_id, message, timestamp):
+    supabase = get_async_supabase_client()
+    response = await execute(supabase.table("chat_history").insert({
         "user_id": user_id,
         "message": message,
         "timestamp": timestamp
-    }).execute()
+    }))
     return response.data[0] if response.data else None
 
-def get_messages(user_id):
-    response = supabase.table("chat_history").select("*").eq("user_id", user_id).order("timestamp").execute()
-    return response.data
\ No newline at end of file
+async def get_messages(user_id, before=None, limit=50, fields=None):
+    """
+    One page of chat history, walking back from the newest message.
+
+    `before` is the next_cursor of the previous page, keyed on (timestamp, id);
+    the items come back in chronological order so they can be prepended as-is.
+    """
+    supabase = get_async_supabase_client()
+    columns = select_columns(fields, CHAT_HISTORY_COLUMNS, required=["id", "timestamp"])
+    query = supabase.table("chat_history").select(columns).eq("user_id", user_id)
+
+    if before:
+        last_timestamp, last_id = decode_cursor(before)
+        query = query.or_(after_filter("timestamp", last_timestamp, last_id, descending=True))
+
+    response = await execute(query.order("timestamp", desc=True).order("id", desc=True).limit(limit + 1))
+    messages, next_cursor = paginate(response.data, limit, lambda message: (message["timestamp"], message["id"]))
+    messages.reverse()
+    return {"items": messages, "next_cursor": next_cursor}
@@ -1,24 +1,44 @@
-from app.services.diary_crud import get_entries_by_date, create_entry, update_entry, delete_entry
+from app.services.diary_crud import (
+    get_entries_by_date, list_entries, list_all_entries, create_entry, update_entry, delete_entry,
+    create_entries_bulk, update_entries_bulk, delete_entries_bulk
+)
+from typing import List, Optional
 
-def get_diary_entries(user_id: str):
-    """Get all diary entries for a user"""
+async def get_diary_entries(user_id: str, cursor: Optional[str] = None, limit: Optional[int] = None):
+    """Get a user's diary entries newest first, all of them unless limited"""
     # This function bridges the endpoint call to the actual implementation
-    return get_entries_by_date(user_id)
+    return await list_all_entries(user_id, cursor=cursor, limit=limit)
 
-def get_diary_entry(entry_id: int, user_id: str):
+async def get_diary_page(user_id: str, fields: Optional[List[str]] = None, cursor: Optional[str] = None, limit: int = 50):
+    """Get one page of diary entries, optionally only some fields"""
+    return await list_entries(user_id, fields=fields, cursor=cursor, limit=limit)
+
+async def get_diary_entry(entry_id: int, user_id: str):
     """Get a specific diary entry"""
     # Call get_entries_by_date with an entry_id filter
-    entries = get_entries_by_date(user_id, entry_id=entry_id)
+    entries = await get_entries_by_date(user_id, entry_id=entry_id)
     return entries[0] if entries else None
 
-def create_diary_entry(entry_data: dict):
+async def create_diary_entry(entry_data: dict):
     """Create a new diary entry"""
-    return create_entry(entry_data)
+    return await create_entry(entry_data)
 
-def update_diary_entry(entry_id: int, entry_data: dict):
+async def update_diary_entry(entry_id: int, entry_data: dict):
     """Update a diary entry"""
-    return update_entry(entry_id, entry_data)
+    return await update_entry(entry_id, entry_data)
 
-def delete_diary_entry(entry_id: int):
+async def delete_diary_entry(entry_id: int):
     """Delete a diary entry"""
-    return delete_entry(entry_id)
\ No newline at end of file
+    return await delete_entry(entry_id)
+
+async def create_diary_entries(entries: List[dict]):
+    """Create many diary entries in one write"""
+    return await create_entries_bulk(entries)
+
+async def update_diary_entries(entries: List[dict]):
+    """Update many diary entries in one write"""
+    return await update_entries_bulk(entries)
+
+async def delete_diary_entries(entry_ids: List[int]):
+    """Delete many diary entries in one write"""
+    return await delete_entries_bulk(entry_ids)
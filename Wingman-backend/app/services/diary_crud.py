@@ -1,13 +1,17 @@
 from datetime import date, datetime
-from app.core.supabase import supabase
+from app.core.supabase import get_async_supabase_client, execute
+from app.services.bulk import item_result, verify_users, bulk_write, bulk_update, bulk_delete
+from app.services.pagination import decode_cursor, after_filter, paginate, select_columns
+from typing import List, Optional
 import traceback
 
-def get_entries_by_date(user_id, entry_id=None, date_value=None):
+async def get_entries_by_date(user_id, entry_id=None, date_value=None):
     """
     Get diary entries for a user, optionally filtered by date or entry ID
     """
     try:
         # Start with a base query for the user
+        supabase = get_async_supabase_client()
         query = supabase.table("diary_entries").select("*").eq("user_id", user_id)
         
         # Add date filter if provided
@@ -21,47 +25,96 @@ def get_entries_by_date(user_id, entry_id=None, date_value=None):
             query = query.eq("id", entry_id)
         
         # Execute the query
-        response = query.execute()
+        response = await execute(query)
         
-        # Transform response to add 'date' field for frontend
-        result = []
+        # Add 'date' field for frontend; the rows are ours, no need to copy them
         for entry in response.data:
-            entry_copy = dict(entry)
-            # Add date field for frontend
-            entry_copy["date"] = entry_copy["entry_date"]
-            result.append(entry_copy)
+            entry["date"] = entry["entry_date"]
         
-        return result
+        return response.data
     except Exception as e:
         traceback.print_exc()
         print(f"Error in get_entries_by_date: {e}")
         raise
 
+DIARY_COLUMNS = ["id", "user_id", "entry_date", "title", "content", "mood", "created_at", "updated_at"]
+
+async def list_entries(user_id: str, fields: Optional[List[str]] = None, cursor: Optional[str] = None, limit: int = 50):
+    """
+    One page of a user's diary, newest first, keyed on (entry_date, id).
+    `fields` limits the columns returned, e.g. a list view without content.
+    """
+    supabase = get_async_supabase_client()
+    columns = select_columns(fields, DIARY_COLUMNS, required=["id", "entry_date"])
+    query = supabase.table("diary_entries").select(columns).eq("user_id", user_id)
+    
+    if cursor:
+        last_date, last_id = decode_cursor(cursor)
+        query = query.or_(after_filter("entry_date", last_date, last_id, descending=True))
+    
+    response = await execute(query.order("entry_date", desc=True).order("id", desc=True).limit(limit + 1))
+    entries, next_cursor = paginate(response.data, limit, lambda entry: (entry["entry_date"], entry["id"]))
+    
+    for entry in entries:
+        entry["date"] = entry["entry_date"]
+    
+    return {"items": entries, "next_cursor": next_cursor}
+
+DIARY_PAGE_SIZE = 200
+
+async def list_all_entries(user_id: str, cursor: Optional[str] = None, limit: Optional[int] = None):
+    """
+    A user's diary newest first, read through list_entries a page at a time
+    so no single query is unbounded. With `limit`, stops after that many
+    entries and returns the cursor for the rest.
+    """
+    entries = []
+    while True:
+        size = DIARY_PAGE_SIZE if limit is None else min(DIARY_PAGE_SIZE, limit - len(entries))
+        page = await list_entries(user_id, cursor=cursor, limit=size)
+        entries.extend(page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None or (limit is not None and len(entries) >= limit):
+            return {"items": entries, "next_cursor": cursor}
+
+# Update the valid_moods list to match the actual database enum
+VALID_MOODS = ["happy", "sad", "neutral", "excited", "anxious"]  # Remove "relaxed"
+
+def _entry_row(entry_data: dict) -> dict:
+    """Map a frontend diary entry to the columns of a new diary_entries row"""
+    # Clone the data to avoid modifying the original
+    data = dict(entry_data)
+    
+    if "mood" in data and data["mood"] not in VALID_MOODS:
+        # Set to default if invalid
+        print(f"Warning: Invalid mood value '{data['mood']}', using default 'neutral'")
+        data["mood"] = "neutral"
+    
+    # Set timestamps
+    now = datetime.now().isoformat()
+    data["created_at"] = now
+    data["updated_at"] = now
+    
+    # Map field names if needed
+    if "date" in data and "entry_date" not in data:
+        data["entry_date"] = data.pop("date")
+    
+    return data
+
+def _entry_for_frontend(entry: dict) -> dict:
+    # Add date field for frontend consistency
+    entry["date"] = entry.get("entry_date")
+    return entry
+
 # Add mood validation before inserting to database
-def create_entry(entry_data: dict):
+async def create_entry(entry_data: dict):
     """Create a new diary entry"""
     try:
-        # Clone the data to avoid modifying the original
-        data = dict(entry_data)
-        
-        # Update the valid_moods list to match the actual database enum
-        valid_moods = ["happy", "sad", "neutral", "excited", "anxious"]  # Remove "relaxed"
-        if "mood" in data and data["mood"] not in valid_moods:
-            # Set to default if invalid
-            print(f"Warning: Invalid mood value '{data['mood']}', using default 'neutral'")
-            data["mood"] = "neutral"
-        
-        # Set timestamps
-        now = datetime.now().isoformat()
-        data["created_at"] = now
-        data["updated_at"] = now
-        
-        # Map field names if needed
-        if "date" in data and "entry_date" not in data:
-            data["entry_date"] = data.pop("date")
+        data = _entry_row(entry_data)
             
         print(f"Creating diary entry with data: {data}")
-        response = supabase.table("diary_entries").insert(data).execute()
+        supabase = get_async_supabase_client()
+        response = await execute(supabase.table("diary_entries").insert(data))
         
         if response.data and len(response.data) > 0:
             entry_data = response.data[0]
@@ -76,7 +129,7 @@ def create_entry(entry_data: dict):
         print(f"Error creating diary entry: {e}")
         raise
 
-def update_entry(entry_id, entry):
+async def update_entry(entry_id, entry):
     try:
         data = dict(entry)
         
@@ -88,7 +141,8 @@ def update_entry(entry_id, entry):
         if isinstance(data.get("entry_date"), date):
             data["entry_date"] = data["entry_date"].isoformat()
             
-        response = supabase.table("diary_entries").update(data).eq("id", entry_id).execute()
+        supabase = get_async_supabase_client()
+        response = await execute(supabase.table("diary_entries").update(data).eq("id", entry_id))
         
         if response.data and len(response.data) > 0:
             entry_data = response.data[0]
@@ -101,9 +155,10 @@ def update_entry(entry_id, entry):
         print(f"Error updating diary entry: {e}")
         raise
 
-def delete_entry(entry_id):
+async def delete_entry(entry_id):
     try:
-        response = supabase.table("diary_entries").delete().eq("id", entry_id).execute()
+        supabase = get_async_supabase_client()
+        response = await execute(supabase.table("diary_entries").delete().eq("id", entry_id))
         if response.data and len(response.data) > 0:
             entry_data = response.data[0]
             # Add date field for frontend consistency
@@ -113,4 +168,53 @@ def delete_entry(entry_id):
     except Exception as e:
         traceback.print_exc()
         print(f"Error deleting diary entry: {e}")
-        raise
\ No newline at end of file
+        raise
+
+async def create_entries_bulk(entries: List[dict]) -> List[dict]:
+    """Create many diary entries with a single insert; returns one result per input entry"""
+    results = []
+    rows = {}
+    for index, entry in enumerate(entries):
+        if not entry.get("user_id"):
+            results.append(item_result(index, error="user_id is required"))
+            continue
+        data = _entry_row(entry)
+        data.pop("id", None)
+        data.pop("date", None)
+        rows[index] = data
+    
+    results.extend(await bulk_write("diary_entries", rows, to_frontend=_entry_for_frontend))
+    return results
+
+async def update_entries_bulk(entries: List[dict]) -> List[dict]:
+    """
+    Update many existing diary entries by id; returns one result per input entry.
+    Ids that don't exist and unknown user_ids are reported per entry.
+    """
+    known_users = await verify_users(entry.get("user_id") for entry in entries)
+    
+    results = []
+    rows = {}
+    for index, entry in enumerate(entries):
+        data = dict(entry)
+        if "date" in data:
+            data["entry_date"] = data.pop("date")
+        if isinstance(data.get("entry_date"), date):
+            data["entry_date"] = data["entry_date"].isoformat()
+        if "mood" in data and data["mood"] not in VALID_MOODS:
+            data["mood"] = "neutral"
+        data["updated_at"] = datetime.now().isoformat()
+        
+        if not data.get("id"):
+            results.append(item_result(index, error="Missing required fields: id"))
+        elif "user_id" in data and not known_users.get(data["user_id"]):
+            results.append(item_result(index, error=f"User with ID {data['user_id']} does not exist"))
+        else:
+            rows[index] = data
+    
+    results.extend(await bulk_update("diary_entries", rows, to_frontend=_entry_for_frontend))
+    return results
+
+async def delete_entries_bulk(entry_ids: List[int]) -> List[dict]:
+    """Delete many diary entries with a single request; returns one result per id"""
+    return await bulk_delete("diary_entries", entry_ids, to_frontend=_entry_for_frontend)
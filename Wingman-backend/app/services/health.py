@@ -0,0 +1,132 @@
+import asyncio
+import os
+import time
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from app.core.config import settings
+from app.core.supabase import get_async_supabase_client, execute
+from app.services.llm import runtime
+
+Probe = Callable[[], Awaitable[Optional[str]]]
+
+class HealthMonitor:
+    """
+    Runs dependency probes in the background every `interval` seconds and
+    keeps the latest result of each, so health endpoints only read memory.
+
+    A probe is an async callable that raises when its dependency is unusable
+    and may return a short detail string. Results older than three intervals
+    count as failed, so a stuck refresher can't report stale good news.
+    """
+
+    def __init__(self, probes: Dict[str, Probe], interval: float = 10.0, timeout: float = 3.0):
+        self.probes = probes
+        self.interval = interval
+        self.timeout = timeout
+        self._results: Dict[str, Dict[str, Any]] = {
+            name: {"healthy": False, "checked_at": None, "last_success": None, "latency_ms": None, "error": "not checked yet"}
+            for name in probes
+        }
+        self._checked_at: Dict[str, float] = {}  # monotonic time of each probe's last run
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run_probe(self, name: str, probe: Probe):
+        start = time.perf_counter()
+        try:
+            detail = await asyncio.wait_for(probe(), self.timeout)
+            error = None
+        except asyncio.TimeoutError:
+            detail, error = None, f"timed out after {self.timeout:.0f}s"
+        except Exception as e:
+            detail, error = None, str(e) or type(e).__name__
+        latency_ms = (time.perf_counter() - start) * 1000
+
+        now = datetime.now(timezone.utc).isoformat()
+        previous = self._results[name]
+        self._results[name] = {
+            "healthy": error is None,
+            "checked_at": now,
+            "last_success": now if error is None else previous["last_success"],
+            "latency_ms": round(latency_ms, 1),
+            "error": error,
+            **({"detail": detail} if detail else {})
+        }
+        self._checked_at[name] = time.monotonic()
+        if error is not None and (previous["healthy"] or previous["checked_at"] is None):
+            print(f"Health probe '{name}' failing: {error}")
+
+    async def check_all(self):
+        """Run every probe once, concurrently"""
+        await asyncio.gather(*(self._run_probe(name, probe) for name, probe in self.probes.items()))
+
+    async def _loop(self):
+        while True:
+            try:
+                await self.check_all()
+            except Exception as e:
+                print(f"Error running health probes: {e}")
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def results(self) -> Dict[str, Dict[str, Any]]:
+        """Latest probe results, with results that stopped refreshing marked unhealthy"""
+        stale_after = self.interval * 3
+        results = {}
+        for name, result in self._results.items():
+            result = dict(result)
+            checked = self._checked_at.get(name)
+            if checked is not None and time.monotonic() - checked > stale_after:
+                result["healthy"] = False
+                result["error"] = f"no probe result for {stale_after:.0f}s"
+            results[name] = result
+        return results
+
+    def readiness(self, required: List[str]) -> Dict[str, Any]:
+        results = self.results()
+        failing = [name for name in required if not results.get(name, {}).get("healthy")]
+        return {"ready": not failing, "failing": failing, "checks": results}
+
+async def probe_supabase() -> Optional[str]:
+    if not settings.SUPABASE_URL or not settings.SUPABASE_KEY:
+        raise RuntimeError("Supabase URL or key missing")
+    client = get_async_supabase_client()
+    await execute(client.table("users").select("id").limit(1))
+    return None
+
+async def probe_sqlite() -> Optional[str]:
+    pool = runtime.get_context_builder().pool
+    if not os.path.exists(pool.db_path):
+        raise RuntimeError(f"{pool.db_path} not found")
+
+    def query():
+        with pool.connection() as conn:
+            conn.execute("SELECT count(*) FROM sqlite_master").fetchone()
+
+    await asyncio.to_thread(query)
+    return pool.db_path
+
+async def probe_ollama() -> Optional[str]:
+    # Shares the chat path's status cache, so probing adds no /api/tags traffic
+    status = await runtime.get_ollama_service().get_status()
+    if not status.get("available"):
+        raise RuntimeError(status.get("error") or status.get("status", "unavailable"))
+    return f"{len(status.get('models', []))} models"
+
+health_monitor = HealthMonitor(
+    {"supabase": probe_supabase, "sqlite": probe_sqlite, "ollama": probe_ollama},
+    interval=settings.HEALTH_CHECK_INTERVAL,
+    timeout=settings.HEALTH_PROBE_TIMEOUT
+)
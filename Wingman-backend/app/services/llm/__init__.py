@@ -1,7 +1,19 @@
-from .context_builder import WingmanContextBuilder
-from .ollama_service import WingmanOllamaService
+import importlib
 
-# Create singleton instance
-ollama_service = WingmanOllamaService()
+from .admission import OllamaAdmissionController, AdmissionRejected
 
-from .core import get_llm_response
\ No newline at end of file
+from .core import get_llm_response
+
+# The context builder and Ollama service pull in numpy and the semantic
+# index, so they're only imported when first asked for
+_LAZY = {
+    "WingmanContextBuilder": ".context_builder",
+    "WingmanOllamaService": ".ollama_service",
+}
+
+def __getattr__(name):
+    if name in _LAZY:
+        value = getattr(importlib.import_module(_LAZY[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,170 @@
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Dict, Any, AsyncIterator, Deque
+
+class AdmissionRejected(Exception):
+    """Raised when a generation can't be admitted, so callers can fail fast"""
+
+    def __init__(self, reason: str, model: str, retry_after: float):
+        self.reason = reason
+        self.model = model
+        self.retry_after = retry_after
+        super().__init__(f"Ollama is busy with {model} ({reason}), retry in {retry_after:.0f}s")
+
+class _ModelQueue:
+    """Admission state for one model"""
+
+    def __init__(self):
+        self.active = 0
+        self.queued = 0
+        self.waiters: Dict[str, Deque[asyncio.Future]] = {}
+        self.turns: Deque[str] = deque()  # Users with waiters, in round-robin order
+
+        self.admitted = 0
+        self.rejected = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+class OllamaAdmissionController:
+    """
+    Bounded queue in front of the local Ollama instance.
+
+    Each model gets a fixed number of concurrent generations. Requests beyond
+    that wait in a per-user queue served round-robin, so one user's burst
+    can't starve everyone else. A request is rejected immediately when the
+    queue is full, or after max_wait_seconds in it.
+    """
+
+    def __init__(self, max_concurrent_per_model: int = 1, max_queue_depth: int = 8, max_wait_seconds: float = 30.0):
+        self.max_concurrent_per_model = max_concurrent_per_model
+        self.max_queue_depth = max_queue_depth
+        self.max_wait_seconds = max_wait_seconds
+        self._queues: Dict[str, _ModelQueue] = {}
+
+    def _queue(self, model: str) -> _ModelQueue:
+        queue = self._queues.get(model)
+        if queue is None:
+            queue = self._queues[model] = _ModelQueue()
+        return queue
+
+    def is_saturated(self, model: str) -> bool:
+        """Whether a new request for this model would be rejected right now"""
+        queue = self._queue(model)
+        return queue.active >= self.max_concurrent_per_model and queue.queued >= self.max_queue_depth
+
+    def is_busy(self, model: str) -> bool:
+        """Whether any request holds or is waiting for a slot for this model"""
+        queue = self._queues.get(model)
+        return queue is not None and (queue.active > 0 or queue.queued > 0)
+
+    @asynccontextmanager
+    async def slot(self, model: str, user_id: str) -> AsyncIterator[float]:
+        """Hold one generation slot for `model`; yields how long we waited for it"""
+        waited = await self._acquire(model, user_id)
+        try:
+            yield waited
+        finally:
+            self._release(model)
+
+    async def _acquire(self, model: str, user_id: str) -> float:
+        queue = self._queue(model)
+
+        if queue.active < self.max_concurrent_per_model and queue.queued == 0:
+            queue.active += 1
+            self._record_admission(queue, 0.0)
+            return 0.0
+
+        if queue.queued >= self.max_queue_depth:
+            queue.rejected += 1
+            raise AdmissionRejected("queue_full", model, self._retry_after(queue))
+
+        future = asyncio.get_running_loop().create_future()
+        if user_id not in queue.waiters:
+            queue.waiters[user_id] = deque()
+            queue.turns.append(user_id)
+        queue.waiters[user_id].append(future)
+        queue.queued += 1
+
+        start_time = time.monotonic()
+        try:
+            await asyncio.wait_for(future, self.max_wait_seconds)
+        except asyncio.TimeoutError:
+            self._remove_waiter(queue, user_id, future)
+            queue.rejected += 1
+            raise AdmissionRejected("queue_timeout", model, self._retry_after(queue))
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The slot was handed to us just as we were cancelled; pass it on
+                self._release(model)
+            else:
+                self._remove_waiter(queue, user_id, future)
+            raise
+
+        waited = time.monotonic() - start_time
+        self._record_admission(queue, waited)
+        return waited
+
+    def _release(self, model: str):
+        queue = self._queue(model)
+        queue.active -= 1
+
+        while queue.active < self.max_concurrent_per_model and queue.turns:
+            user_id = queue.turns.popleft()
+            waiters = queue.waiters[user_id]
+            future = waiters.popleft()
+            queue.queued -= 1
+
+            # Back of the line for this user's next request
+            if waiters:
+                queue.turns.append(user_id)
+            else:
+                del queue.waiters[user_id]
+
+            if future.done():
+                continue
+            queue.active += 1
+            future.set_result(None)
+
+    def _remove_waiter(self, queue: _ModelQueue, user_id: str, future: asyncio.Future):
+        waiters = queue.waiters.get(user_id)
+        if not waiters or future not in waiters:
+            return
+
+        waiters.remove(future)
+        queue.queued -= 1
+        if not waiters:
+            del queue.waiters[user_id]
+            queue.turns.remove(user_id)
+
+    def _record_admission(self, queue: _ModelQueue, waited: float):
+        queue.admitted += 1
+        queue.total_wait += waited
+        queue.max_wait = max(queue.max_wait, waited)
+
+    def _retry_after(self, queue: _ModelQueue) -> float:
+        """Rough hint for clients: the average wait so far, at least a second"""
+        average = queue.total_wait / queue.admitted if queue.admitted else 0.0
+        return max(1.0, average)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Queue depth, load and wait-time statistics per model"""
+        models = {}
+        for model, queue in self._queues.items():
+            models[model] = {
+                "active": queue.active,
+                "queued": queue.queued,
+                "waiting_users": len(queue.waiters),
+                "admitted": queue.admitted,
+                "rejected": queue.rejected,
+                "avg_wait_seconds": queue.total_wait / queue.admitted if queue.admitted else 0.0,
+                "max_wait_seconds": queue.max_wait
+            }
+
+        return {
+            "max_concurrent_per_model": self.max_concurrent_per_model,
+            "max_queue_depth": self.max_queue_depth,
+            "max_wait_seconds": self.max_wait_seconds,
+            "models": models
+        }
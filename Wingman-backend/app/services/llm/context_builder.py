@@ -1,9 +1,84 @@
+import asyncio
+import hashlib
 import os
 import sqlite3
+import time
+from contextlib import contextmanager
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Iterator
 import json
 
+from app.core.config import settings
+from app.core.metrics import CONTEXT_SECTION_SECONDS
+from .semantic_index import SemanticIndex
+from .sqlite_pool import get_connection_pool
+from .token_budget import STABLE_PREFIX_PRIORITIES, estimate_tokens, fit_sections
+
+# Keep the SQL text constant so sqlite3's per-connection statement cache can reuse it
+CHAT_HISTORY_SQL = """
+    SELECT message, is_ai, timestamp 
+    FROM chat_history 
+    WHERE user_id = ? 
+    ORDER BY timestamp DESC 
+    LIMIT ?
+"""
+
+CHAT_HISTORY_COUNT_SQL = """
+    SELECT COUNT(*) FROM chat_history WHERE user_id = ?
+"""
+
+CHAT_HISTORY_WINDOW_SQL = """
+    SELECT message, is_ai, timestamp 
+    FROM chat_history 
+    WHERE user_id = ? 
+    ORDER BY timestamp ASC, id ASC 
+    LIMIT -1 OFFSET ?
+"""
+
+TASKS_FOR_DATE_SQL = """
+    SELECT title, task_time, completed, failed, task_type, urgency_level
+    FROM tasks 
+    WHERE user_id = ? AND task_date = ?
+    ORDER BY task_time ASC
+"""
+
+EVENTS_FOR_DATE_SQL = """
+    SELECT title, event_time, type, description
+    FROM calendar_events 
+    WHERE user_id = ? AND event_date = ?
+    ORDER BY event_time ASC
+"""
+
+RECENT_DIARY_SQL = """
+    SELECT entry_date, title, content, mood
+    FROM diary_entries 
+    WHERE user_id = ? AND entry_date >= ?
+    ORDER BY entry_date DESC
+"""
+
+# Messages per step of the /api/chat history window, see _get_chat_history_window
+CHAT_HISTORY_WINDOW = 10
+
+@lru_cache(maxsize=1)
+def _resolve_user_db_path() -> str:
+    """Probe the common Wingman database locations once per process"""
+    # Try multiple common locations for Wingman database
+    possible_paths = [
+        os.path.expanduser("~/AppData/Roaming/wingman/wingman-data/wingman.db"),
+        os.path.expanduser("~/wingman-data/wingman.db"),
+        "./wingman.db"
+    ]
+    
+    for path in possible_paths:
+        if os.path.exists(path):
+            return path
+    
+    # Default to first path for creation
+    db_path = possible_paths[0]
+    os.makedirs(os.path.dirname(db_path), exist_ok=True)
+    return db_path
+
 class WingmanContextBuilder:
     """
     INTELLIGENT context builder that gives Wingman AI FULL access to user data
@@ -11,19 +86,186 @@ class WingmanContextBuilder:
     
     def __init__(self):
         self.db_path = self._get_user_db_path()
+        self.pool = get_connection_pool(self.db_path)
+        self.semantic_index = None
+        if settings.SEMANTIC_SEARCH_ENABLED:
+            self.semantic_index = SemanticIndex(
+                self.db_path,
+                model_name=settings.EMBEDDING_MODEL,
+                dtype=settings.EMBEDDING_DTYPE
+            )
         
-    def build_context(self, user_id: str, message: str, date: str = None) -> str:
+    def build_context(self, user_id: str, message: str, date: str = None, token_budget: Optional[int] = None) -> str:
         """Build comprehensive context with CHAT HISTORY + DATABASE ACCESS"""
         
         current_date = date or datetime.now().strftime('%Y-%m-%d')
         
         # Get actual user data from database
-        chat_history = self._get_recent_chat_history(user_id, limit=10)
-        today_tasks = self._get_tasks_for_date(user_id, current_date)
-        today_events = self._get_events_for_date(user_id, current_date)
-        recent_diary = self._get_recent_diary_entries(user_id, days=3)
+        sections = self._fetch_sections(user_id, current_date, message)
+        return self._render_context(user_id, message, current_date, sections, token_budget)["context"]
+
+    async def build_context_async(
+        self,
+        user_id: str,
+        message: str,
+        date: str = None,
+        token_budget: Optional[int] = None,
+        history_as_messages: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Build the same context as build_context without blocking the event loop.
+
+        The four sections are fetched concurrently on worker threads, each with
+        its own pooled connection, so unlike build_context they do not share a
+        single read snapshot. Returns the context text, per-section timings in
+        seconds and the estimated tokens each section used.
+
+        With history_as_messages the chat history is left out of the text and
+        returned as "chat_history" rows for Ollama's /api/chat, using a window
+        that only ever grows at the end (see _get_chat_history_window).
+        """
+        current_date = date or datetime.now().strftime('%Y-%m-%d')
+        start_time = time.perf_counter()
+        
+        if history_as_messages:
+            history_fetch = (self._get_chat_history_window, (user_id, CHAT_HISTORY_WINDOW))
+        else:
+            history_fetch = (self._get_recent_chat_history, (user_id, 10))
+        
+        fetchers = {
+            "chat_history": history_fetch,
+            "tasks": (self._get_tasks_for_date, (user_id, current_date)),
+            "events": (self._get_events_for_date, (user_id, current_date)),
+            "diary": (self._get_recent_diary_entries, (user_id, 3)),
+            "relevant": (self._get_relevant_snippets, (user_id, message))
+        }
+        results = await asyncio.gather(*(
+            asyncio.to_thread(self._timed_fetch, fetch, *args)
+            for fetch, args in fetchers.values()
+        ))
+        
+        sections = {}
+        timings = {}
+        for name, (rows, elapsed) in zip(fetchers, results):
+            sections[name] = rows
+            timings[name] = elapsed
+        
+        rendered = self._render_context(user_id, message, current_date, sections, token_budget, history_as_messages)
+        timings["total"] = time.perf_counter() - start_time
+        for name, elapsed in timings.items():
+            CONTEXT_SECTION_SECONDS.observe(elapsed, section=name)
+        
+        return {
+            "context": rendered["context"],
+            "chat_history": rendered["chat_history"],
+            "timings": timings,
+            "tokens": rendered["tokens"],
+            "fingerprint": rendered["fingerprint"]
+        }
+
+    @staticmethod
+    def _timed_fetch(fetch, *args):
+        """Run one section query and measure how long it took"""
+        start_time = time.perf_counter()
+        rows = fetch(*args)
+        return rows, time.perf_counter() - start_time
+
+    def _render_context(
+        self,
+        user_id: str,
+        message: str,
+        current_date: str,
+        sections: Dict[str, List[Dict]],
+        token_budget: Optional[int] = None,
+        history_as_messages: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Format fetched sections into the prompt context.
+
+        With a token budget, the lowest-priority sections are trimmed until the
+        whole context fits it. Returns the text, the chat history rows that
+        survived trimming and estimated tokens per section.
+        """
+        chat_history = sections["chat_history"]
+        if history_as_messages:
+            # Sent as separate messages, but it still has to fit the window
+            history_lines = [msg["message"] for msg in chat_history]
+        else:
+            history_lines = self._format_chat_history(chat_history)
+        
+        lines = {
+            "chat_history": history_lines,
+            "tasks": self._format_tasks(sections["tasks"]),
+            "events": self._format_events(sections["events"]),
+            "diary": self._format_diary_entries(sections["diary"]),
+            "relevant": self._format_relevant_snippets(sections.get("relevant", []), chat_history)
+        }
+        
+        if token_budget is not None:
+            # Everything that isn't section data counts against the budget first
+            empty = {name: [] for name in lines}
+            overhead = estimate_tokens(
+                self._fill_template(user_id, message, current_date, empty, not history_as_messages)
+            )
+            if history_as_messages:
+                # The history messages are the prefix Ollama caches: trim the per-turn
+                # sections first and cut history only a whole window at a time, so
+                # the first message kept is the same one on the next turn
+                fitted = fit_sections(
+                    lines,
+                    token_budget - overhead,
+                    oldest_first=["chat_history"],
+                    priorities=STABLE_PREFIX_PRIORITIES,
+                    steps={"chat_history": CHAT_HISTORY_WINDOW}
+                )
+            else:
+                fitted = fit_sections(lines, token_budget - overhead, oldest_first=["chat_history"])
+            lines = fitted["lines"]
+            tokens = fitted["tokens"]
+            if fitted["omitted"]["chat_history"]:
+                chat_history = chat_history[fitted["omitted"]["chat_history"]:]
+            if any(fitted["omitted"].values()):
+                print(f"Context trimmed to fit {token_budget} tokens: {fitted['omitted']}")
+        else:
+            tokens = {name: sum(estimate_tokens(line) for line in section) for name, section in lines.items()}
+        
+        context = self._fill_template(user_id, message, current_date, lines, not history_as_messages)
+        tokens["total"] = estimate_tokens(context)
+        if history_as_messages:
+            tokens["total"] += tokens["chat_history"]
+        
+        # Identifies the user data behind this context, independent of the query text
+        fingerprint = hashlib.sha256(
+            json.dumps([user_id, current_date, lines, history_as_messages], ensure_ascii=False).encode("utf-8")
+        ).hexdigest()
+        
+        return {"context": context, "chat_history": chat_history, "tokens": tokens, "fingerprint": fingerprint}
+
+    def _fill_template(
+        self,
+        user_id: str,
+        message: str,
+        current_date: str,
+        lines: Dict[str, List[str]],
+        include_history: bool = True
+    ) -> str:
+        """Lay the formatted sections out in the context template"""
+        history_block = ""
+        if include_history:
+            history_block = (
+                "CHAT HISTORY (Last 10 messages):\n"
+                f"{self._join_section(lines['chat_history'], 'No previous chat history.')}\n\n"
+            )
+        
+        relevant_block = ""
+        if lines.get("relevant"):
+            relevant_block = (
+                "\nRELATED PAST CONVERSATIONS AND DIARY ENTRIES (retrieved for this query):\n"
+                + "\n".join(lines["relevant"])
+                + "\n"
+            )
         
-        context = f"""
+        return f"""
 WINGMAN AI CONTEXT - FULL USER DATA ACCESS
 ==========================================
 
@@ -31,18 +273,15 @@ USER ID: {user_id}
 CURRENT DATE: {current_date}
 CURRENT QUERY: "{message}"
 
-CHAT HISTORY (Last 10 messages):
-{self._format_chat_history(chat_history)}
-
-TODAY'S TASKS ({current_date}):
-{self._format_tasks(today_tasks)}
+{history_block}TODAY'S TASKS ({current_date}):
+{self._join_section(lines["tasks"], "No tasks for today.")}
 
 TODAY'S EVENTS ({current_date}):
-{self._format_events(today_events)}
+{self._join_section(lines["events"], "No events for today.")}
 
 RECENT DIARY ENTRIES (Last 3 days):
-{self._format_diary_entries(recent_diary)}
-
+{self._join_section(lines["diary"], "No recent diary entries.")}
+{relevant_block}
 DATABASE ACCESS FUNCTIONS AVAILABLE:
 - get_tasks(date) → Returns tasks for specific date
 - get_tasks_range(start_date, end_date) → Returns tasks in range
@@ -67,45 +306,59 @@ RESPONSE GUIDELINES:
 - Show actual data in tables or organized lists when helpful
 """
         
-        return context
+
+    @staticmethod
+    def _join_section(lines: List[str], empty_message: str) -> str:
+        """Join a section's lines, or explain that it is empty"""
+        return "\n".join(lines) if lines else empty_message
+
+    def _fetch_sections(self, user_id: str, current_date: str, message: str = "") -> Dict[str, List[Dict]]:
+        """Run all four context queries against a single read snapshot"""
+        try:
+            with self.pool.read_transaction() as conn:
+                sections = {
+                    "chat_history": self._get_recent_chat_history(user_id, limit=10, conn=conn),
+                    "tasks": self._get_tasks_for_date(user_id, current_date, conn=conn),
+                    "events": self._get_events_for_date(user_id, current_date, conn=conn),
+                    "diary": self._get_recent_diary_entries(user_id, days=3, conn=conn)
+                }
+        except Exception as e:
+            print(f"Error opening context snapshot: {e}")
+            sections = {"chat_history": [], "tasks": [], "events": [], "diary": []}
+        
+        sections["relevant"] = self._get_relevant_snippets(user_id, message)
+        return sections
+
+    def _get_relevant_snippets(self, user_id: str, message: str, k: int = 5) -> List[Dict]:
+        """Past chat and diary snippets most similar to the current message"""
+        if self.semantic_index is None or not self.semantic_index.available:
+            return []
+        
+        try:
+            # BackgroundIndexer keeps the index fresh; nothing is embedded here but the query
+            return self.semantic_index.search(user_id, message, k=k)
+        except Exception as e:
+            print(f"Error searching semantic index: {e}")
+            return []
 
     def _get_user_db_path(self):
         """Get the user database path"""
-        import os
-        from pathlib import Path
-        
-        # Try multiple common locations for Wingman database
-        possible_paths = [
-            os.path.expanduser("~/AppData/Roaming/wingman/wingman-data/wingman.db"),
-            os.path.expanduser("~/wingman-data/wingman.db"),
-            "./wingman.db"
-        ]
-        
-        for path in possible_paths:
-            if os.path.exists(path):
-                return path
-        
-        # Default to first path for creation
-        db_path = possible_paths[0]
-        os.makedirs(os.path.dirname(db_path), exist_ok=True)
-        return db_path
-
-    def _get_recent_chat_history(self, user_id: str, limit: int = 10) -> List[Dict]:
+        return _resolve_user_db_path()
+
+    @contextmanager
+    def _reader(self, conn: Optional[sqlite3.Connection] = None) -> Iterator[sqlite3.Connection]:
+        """Use the caller's connection, or borrow one from the pool"""
+        if conn is not None:
+            yield conn
+        else:
+            with self.pool.connection() as pooled:
+                yield pooled
+
+    def _get_recent_chat_history(self, user_id: str, limit: int = 10, conn: Optional[sqlite3.Connection] = None) -> List[Dict]:
         """Get recent chat history from database"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.cursor()
-                
-                cursor.execute("""
-                    SELECT message, is_ai, timestamp 
-                    FROM chat_history 
-                    WHERE user_id = ? 
-                    ORDER BY timestamp DESC 
-                    LIMIT ?
-                """, (user_id, limit))
-                
-                messages = cursor.fetchall()
+            with self._reader(conn) as conn:
+                messages = conn.execute(CHAT_HISTORY_SQL, (user_id, limit)).fetchall()
                 # Reverse to get chronological order
                 return [dict(msg) for msg in reversed(messages)]
                 
@@ -113,73 +366,65 @@ RESPONSE GUIDELINES:
             print(f"Error getting chat history: {e}")
             return []
 
-    def _get_tasks_for_date(self, user_id: str, date: str) -> List[Dict]:
-        """Get tasks for specific date"""
+    def _get_chat_history_window(self, user_id: str, window: int = 10, conn: Optional[sqlite3.Connection] = None) -> List[Dict]:
+        """
+        Get chat history from an anchor that only moves forward in steps of `window`.
+
+        A plain "last N messages" window drops one message off the front every
+        turn, which changes the prompt prefix and defeats Ollama's prompt cache.
+        Here the start stays put and new messages are appended until there are
+        2 * window of them, then it jumps ahead by `window` at once.
+        """
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.cursor()
-                
-                cursor.execute("""
-                    SELECT title, task_time, completed, failed, task_type, urgency_level
-                    FROM tasks 
-                    WHERE user_id = ? AND task_date = ?
-                    ORDER BY task_time ASC
-                """, (user_id, date))
+            if conn is None:
+                with self.pool.read_transaction() as snapshot:
+                    return self._get_chat_history_window(user_id, window, snapshot)
+            
+            total = conn.execute(CHAT_HISTORY_COUNT_SQL, (user_id,)).fetchone()[0]
+            offset = max(0, ((total - window) // window) * window)
+            rows = conn.execute(CHAT_HISTORY_WINDOW_SQL, (user_id, offset)).fetchall()
+            return [dict(msg) for msg in rows]
                 
-                return [dict(task) for task in cursor.fetchall()]
+        except Exception as e:
+            print(f"Error getting chat history window: {e}")
+            return []
+
+    def _get_tasks_for_date(self, user_id: str, date: str, conn: Optional[sqlite3.Connection] = None) -> List[Dict]:
+        """Get tasks for specific date"""
+        try:
+            with self._reader(conn) as conn:
+                rows = conn.execute(TASKS_FOR_DATE_SQL, (user_id, date)).fetchall()
+                return [dict(task) for task in rows]
                 
         except Exception as e:
             print(f"Error getting tasks: {e}")
             return []
 
-    def _get_events_for_date(self, user_id: str, date: str) -> List[Dict]:
+    def _get_events_for_date(self, user_id: str, date: str, conn: Optional[sqlite3.Connection] = None) -> List[Dict]:
         """Get events for specific date"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.cursor()
-                
-                cursor.execute("""
-                    SELECT title, event_time, type, description
-                    FROM calendar_events 
-                    WHERE user_id = ? AND event_date = ?
-                    ORDER BY event_time ASC
-                """, (user_id, date))
-                
-                return [dict(event) for event in cursor.fetchall()]
+            with self._reader(conn) as conn:
+                rows = conn.execute(EVENTS_FOR_DATE_SQL, (user_id, date)).fetchall()
+                return [dict(event) for event in rows]
                 
         except Exception as e:
             print(f"Error getting events: {e}")
             return []
 
-    def _get_recent_diary_entries(self, user_id: str, days: int = 3) -> List[Dict]:
+    def _get_recent_diary_entries(self, user_id: str, days: int = 3, conn: Optional[sqlite3.Connection] = None) -> List[Dict]:
         """Get recent diary entries"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.cursor()
-                
+            with self._reader(conn) as conn:
                 start_date = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
-                
-                cursor.execute("""
-                    SELECT entry_date, title, content, mood
-                    FROM diary_entries 
-                    WHERE user_id = ? AND entry_date >= ?
-                    ORDER BY entry_date DESC
-                """, (user_id, start_date))
-                
-                return [dict(entry) for entry in cursor.fetchall()]
+                rows = conn.execute(RECENT_DIARY_SQL, (user_id, start_date)).fetchall()
+                return [dict(entry) for entry in rows]
                 
         except Exception as e:
             print(f"Error getting diary entries: {e}")
             return []
 
-    def _format_chat_history(self, chat_history: List[Dict]) -> str:
-        """Format chat history for context"""
-        if not chat_history:
-            return "No previous chat history."
-        
+    def _format_chat_history(self, chat_history: List[Dict]) -> List[str]:
+        """Format chat history for context, one line per message"""
         formatted = []
         for msg in chat_history:
             sender = "AI" if msg['is_ai'] else "USER"
@@ -187,43 +432,55 @@ RESPONSE GUIDELINES:
             message = msg['message']
             formatted.append(f"[{timestamp}] {sender}: {message}")
         
-        return "\n".join(formatted)
+        return formatted
 
-    def _format_tasks(self, tasks: List[Dict]) -> str:
-        """Format tasks for context"""
-        if not tasks:
-            return "No tasks for today."
-        
+    def _format_tasks(self, tasks: List[Dict]) -> List[str]:
+        """Format tasks for context, one line per task"""
         formatted = []
         for task in tasks:
             status = "✅ COMPLETED" if task.get('completed') else "❌ FAILED" if task.get('failed') else "⏳ PENDING"
             time_str = f" at {task.get('task_time', 'No time')}" if task.get('task_time') else ""
             formatted.append(f"- {task['title']}{time_str} [{status}]")
         
-        return "\n".join(formatted)
+        return formatted
 
-    def _format_events(self, events: List[Dict]) -> str:
-        """Format events for context"""
-        if not events:
-            return "No events for today."
-        
+    def _format_events(self, events: List[Dict]) -> List[str]:
+        """Format events for context, one line per event"""
         formatted = []
         for event in events:
             time_str = f" at {event.get('event_time', 'No time')}" if event.get('event_time') else ""
             type_str = f" ({event['type']})" if event.get('type') else ""
             formatted.append(f"- {event['title']}{time_str}{type_str}")
         
-        return "\n".join(formatted)
+        return formatted
 
-    def _format_diary_entries(self, entries: List[Dict]) -> str:
-        """Format diary entries for context"""
-        if not entries:
-            return "No recent diary entries."
+    def _format_relevant_snippets(self, snippets: List[Dict], chat_history: List[Dict]) -> List[str]:
+        """Format retrieved snippets, skipping messages already in the recent history"""
+        recent = [msg.get('message', '') for msg in chat_history]
+        labels = {
+            "chat_history": "chat",
+            "chat_messages": "chat",
+            "diary_entries": "diary",
+            "tasks": "task",
+            "calendar_events": "event"
+        }
+        
+        formatted = []
+        for snippet in snippets:
+            text = snippet['text']
+            if any(message and message in text for message in recent):
+                continue
+            preview = text[:300] + "..." if len(text) > 300 else text
+            formatted.append(f"- ({labels.get(snippet['source'], snippet['source'])}) {preview}")
         
+        return formatted
+
+    def _format_diary_entries(self, entries: List[Dict]) -> List[str]:
+        """Format diary entries for context, one item per entry"""
         formatted = []
         for entry in entries:
             mood_str = f" [Mood: {entry['mood']}]" if entry.get('mood') else ""
             content_preview = entry.get('content', '')[:100] + "..." if entry.get('content') and len(entry.get('content', '')) > 100 else entry.get('content', '')
             formatted.append(f"- {entry['entry_date']}: {entry.get('title', 'Untitled')}{mood_str}\n  {content_preview}")
         
-        return "\n".join(formatted)
\ No newline at end of file
+        return formatted
@@ -0,0 +1,213 @@
+import asyncio
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Any, Optional, Tuple
+
+from .semantic_index import SemanticIndex, SOURCE_TEXT, SOURCE_CHANGE_COLUMN, embed_texts
+from .sqlite_pool import get_connection_pool
+
+class BackgroundIndexer:
+    """
+    Keeps the semantic index in step with wingman.db, off the request path.
+
+    Every `interval` seconds it tails each source table past its watermark
+    (row id for append-only tables, (updated_at, id) for editable ones),
+    embeds the new or changed rows in batches on a worker process pool and
+    upserts them into the index. Rows that disappeared from the database are
+    tombstoned. Lag and throughput are kept for get_metrics().
+    """
+
+    def __init__(self, index: SemanticIndex, batch_size: int = 64, interval: float = 30.0, workers: int = 1):
+        self.index = index
+        self.batch_size = batch_size
+        self.interval = interval
+        self.workers = workers
+
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._task: Optional[asyncio.Task] = None
+        self._run_lock = asyncio.Lock()
+
+        self.indexed_rows = 0
+        self.deleted_rows = 0
+        self.embed_seconds = 0.0
+        self.passes = 0
+        self.errors = 0
+        self.pending_rows = 0
+        self.last_pass_at: Optional[float] = None
+        self.last_pass_seconds = 0.0
+        self.last_pass_rows = 0
+        self._behind_since: Optional[float] = None
+
+    @property
+    def available(self) -> bool:
+        return self.index is not None and self.index.available
+
+    def start(self):
+        """Start the periodic indexing loop (call from inside the running event loop)"""
+        if not self.available or (self._task is not None and not self._task.done()):
+            return
+        self._task = asyncio.create_task(self._run_loop())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    async def _run_loop(self):
+        while True:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.errors += 1
+                print(f"Semantic indexer pass failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    async def run_once(self) -> int:
+        """Index everything changed since the last pass; returns how many rows were embedded"""
+        if not self.available:
+            return 0
+
+        async with self._run_lock:
+            start_time = time.monotonic()
+            self.pending_rows = await asyncio.to_thread(self._count_pending)
+            if self.pending_rows and self._behind_since is None:
+                self._behind_since = start_time
+
+            embedded = 0
+            for source in SOURCE_TEXT:
+                while True:
+                    rows = await asyncio.to_thread(self._read_changes, source)
+                    if not rows:
+                        break
+                    embedded += await self._index_batch(source, rows)
+                    if len(rows) < self.batch_size:
+                        break
+
+            self.deleted_rows += await asyncio.to_thread(self._remove_deleted)
+
+            finished = time.monotonic()
+            self.pending_rows = await asyncio.to_thread(self._count_pending)
+            if not self.pending_rows:
+                self._behind_since = None
+            self.passes += 1
+            self.last_pass_at = finished
+            self.last_pass_seconds = finished - start_time
+            self.last_pass_rows = embedded
+
+            if embedded:
+                print(f"Semantic indexer: embedded {embedded} rows in {self.last_pass_seconds:.2f}s")
+            return embedded
+
+    async def _index_batch(self, source: str, rows: List[Tuple]) -> int:
+        items = [{"source": source, "row_id": row_id, "user_id": user_id} for row_id, user_id, _, _ in rows]
+        texts = [text or "" for _, _, _, text in rows]
+        last_id, _, last_changed, _ = rows[-1]
+
+        embed_start = time.monotonic()
+        vectors = await self._embed(texts)
+        self.embed_seconds += time.monotonic() - embed_start
+
+        await asyncio.to_thread(self.index.upsert, items, vectors, {source: [last_changed, last_id]})
+        self.indexed_rows += len(items)
+        return len(items)
+
+    async def _embed(self, texts: List[str]):
+        """Embed one batch on the process pool, recreating it if a worker died"""
+        loop = asyncio.get_running_loop()
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        try:
+            return await loop.run_in_executor(self._pool, embed_texts, self.index.model_name, texts)
+        except BrokenProcessPool:
+            self._pool = None
+            raise
+
+    # Database side (runs on worker threads)
+
+    def _change_filter(self, source: str) -> Tuple[str, str, tuple]:
+        """(changed expression, WHERE clause, params) selecting rows past the watermark"""
+        changed_at, last_id = self.index.get_watermark(source)
+        column = SOURCE_CHANGE_COLUMN[source]
+        if column is None:
+            return "''", "id > ?", (last_id,)
+
+        # datetime() normalises the ISO and SQLite timestamp formats the app writes
+        changed = f"COALESCE(datetime({column}), '')"
+        return changed, f"{changed} > ? OR ({changed} = ? AND id > ?)", (changed_at, changed_at, last_id)
+
+    def _read_changes(self, source: str) -> List[Tuple]:
+        changed, where, params = self._change_filter(source)
+        sql = f"""
+            SELECT id, user_id, {changed} AS changed_at, {SOURCE_TEXT[source]}
+            FROM {source}
+            WHERE {where}
+            ORDER BY changed_at ASC, id ASC
+            LIMIT ?
+        """
+        try:
+            with get_connection_pool(self.index.db_path).read_transaction() as conn:
+                return conn.execute(sql, params + (self.batch_size,)).fetchall()
+        except Exception as e:
+            print(f"Skipping {source} in semantic indexer: {e}")
+            return []
+
+    def _count_pending(self) -> int:
+        pending = 0
+        try:
+            with get_connection_pool(self.index.db_path).read_transaction() as conn:
+                for source in SOURCE_TEXT:
+                    _, where, params = self._change_filter(source)
+                    try:
+                        pending += conn.execute(f"SELECT COUNT(*) FROM {source} WHERE {where}", params).fetchone()[0]
+                    except Exception:
+                        continue
+        except Exception as e:
+            print(f"Error counting unindexed rows: {e}")
+        return pending
+
+    def _remove_deleted(self) -> int:
+        """Tombstone vectors whose rows no longer exist"""
+        removed = 0
+        for source in SOURCE_TEXT:
+            indexed = self.index.indexed_ids(source)
+            if not indexed:
+                continue
+            try:
+                with get_connection_pool(self.index.db_path).read_transaction() as conn:
+                    existing = {row[0] for row in conn.execute(f"SELECT id FROM {source}")}
+            except Exception as e:
+                print(f"Error checking deleted {source} rows: {e}")
+                continue
+            gone = [(source, row_id) for row_id in indexed - existing]
+            if gone:
+                removed += self.index.delete(gone)
+        return removed
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Indexing lag, throughput and store size"""
+        now = time.monotonic()
+        return {
+            "available": self.available,
+            "running": self._task is not None and not self._task.done(),
+            "pending_rows": self.pending_rows,
+            "lag_seconds": now - self._behind_since if self._behind_since is not None else 0.0,
+            "seconds_since_last_pass": now - self.last_pass_at if self.last_pass_at is not None else None,
+            "last_pass_seconds": self.last_pass_seconds,
+            "last_pass_rows": self.last_pass_rows,
+            "indexed_rows": self.indexed_rows,
+            "deleted_rows": self.deleted_rows,
+            "rows_per_second": self.indexed_rows / self.embed_seconds if self.embed_seconds else 0.0,
+            "passes": self.passes,
+            "errors": self.errors,
+            "store": self.index.stats() if self.index is not None else None
+        }
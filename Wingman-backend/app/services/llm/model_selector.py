@@ -0,0 +1,175 @@
+import os
+import re
+from typing import Any, Dict, List, Optional
+
+import psutil
+
+from .model_stats import ModelPerformanceTracker
+
+GB = 1024 ** 3
+
+# Cold-start priors, replaced by measurements as soon as a model has run here.
+# CPU decoding is roughly memory-bandwidth bound, so tokens/s falls with model
+# size and rises with cores up to about eight.
+EVAL_TPS_PER_CORE_GB = 4.0
+PROMPT_TO_EVAL_RATIO = 15.0
+DISK_GB_PER_SECOND = 1.0
+
+def parse_size_gb(size: Any) -> Optional[float]:
+    """'4.7GB' / '900MB' from the model table, or a byte count from /api/tags"""
+    if isinstance(size, (int, float)):
+        return size / GB if size else None
+    match = re.match(r"\s*([\d.]+)\s*([GM])B", str(size or ""), re.IGNORECASE)
+    if not match:
+        return None
+    value = float(match.group(1))
+    return value if match.group(2).upper() == "G" else value / 1024
+
+class AdaptiveModelSelector:
+    """
+    Picks the largest downloaded model expected to answer within a latency SLO.
+
+    Each candidate's latency for a request is predicted as
+        load time (unless resident) + prompt tokens / prompt tok/s
+        + expected reply tokens / eval tok/s
+    using this machine's rolling measurements from ModelPerformanceTracker
+    (benchmark_models() fills them in for models that never ran), and a rough prior
+    from model size and CPU cores otherwise. Models that don't fit in free RAM
+    plus what evicting other resident models would release are skipped, so
+    the choice drops to smaller models under memory pressure.
+
+    The choice is sticky: a resident model that meets the SLO keeps being
+    used until another model is already loaded or clearly better, i.e. at
+    least `switch_margin` larger (or, when nothing meets the SLO, that much
+    faster). Otherwise prompts of slightly different lengths would flip
+    between models and pay a load for each switch.
+    """
+
+    def __init__(
+        self,
+        models: Dict[str, Dict[str, Any]],
+        performance: ModelPerformanceTracker,
+        latency_slo: float = 30.0,
+        expected_output_tokens: int = 256,
+        memory_headroom_gb: float = 1.0,
+        switch_margin: float = 0.5
+    ):
+        self.models = models
+        self.performance = performance
+        self.latency_slo = latency_slo
+        self.expected_output_tokens = expected_output_tokens
+        self.memory_headroom_gb = memory_headroom_gb
+        self.switch_margin = switch_margin
+        self.last_selected: Optional[str] = None
+        self.cpu_cores = min(os.cpu_count() or 4, 8)
+
+    def _size_gb(self, name: str, downloaded: Dict[str, Dict]) -> float:
+        size = parse_size_gb(downloaded.get(name, {}).get("size")) or parse_size_gb(self.models.get(name, {}).get("size"))
+        return size or float(self.models.get(name, {}).get("ram_required", 4))
+
+    def predict(self, name: str, prompt_tokens: int, size_gb: float, resident: bool) -> Dict[str, Any]:
+        """Predicted time to first token and to a full reply for one model"""
+        summary = self.performance.summary(name) or {}
+        measured = bool(summary.get("eval_tokens_per_second"))
+
+        eval_tps = summary.get("recent_eval_tokens_per_second") or summary.get("eval_tokens_per_second")
+        if not eval_tps:
+            eval_tps = EVAL_TPS_PER_CORE_GB * self.cpu_cores / max(size_gb, 0.5)
+        prompt_tps = summary.get("prompt_tokens_per_second") or eval_tps * PROMPT_TO_EVAL_RATIO
+
+        load_seconds = 0.0
+        if not resident:
+            load_seconds = summary.get("avg_load_seconds") or size_gb / DISK_GB_PER_SECOND
+
+        time_to_first_token = load_seconds + prompt_tokens / prompt_tps
+        return {
+            "model": name,
+            "measured": measured,
+            "eval_tokens_per_second": round(eval_tps, 2),
+            "time_to_first_token": round(time_to_first_token, 2),
+            "latency": round(time_to_first_token + self.expected_output_tokens / eval_tps, 2)
+        }
+
+    def rank(
+        self,
+        prompt_tokens: int,
+        downloaded: List[Dict],
+        resident: List[Dict],
+        available_gb: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """Every downloaded model we know how to size, largest first, with its prediction and fit"""
+        by_name = {model.get("name") or model.get("model"): model for model in downloaded}
+        resident_sizes = {
+            (model.get("name") or model.get("model")): (model.get("size") or 0) / GB
+            for model in resident
+        }
+        if available_gb is None:
+            available_gb = psutil.virtual_memory().available / GB
+        reclaimable_gb = sum(resident_sizes.values())
+
+        ranked = []
+        for name in by_name:
+            if name not in self.models and name not in resident_sizes:
+                continue
+            size_gb = self._size_gb(name, by_name)
+            required_gb = float(self.models.get(name, {}).get("ram_required", size_gb))
+            is_resident = name in resident_sizes
+            prediction = self.predict(name, prompt_tokens, size_gb, is_resident)
+            prediction["fits_memory"] = is_resident or required_gb + self.memory_headroom_gb <= available_gb + reclaimable_gb
+            prediction["meets_slo"] = prediction["latency"] <= self.latency_slo
+            prediction["size_gb"] = round(size_gb, 2)
+            ranked.append(prediction)
+        return sorted(ranked, key=lambda candidate: candidate["size_gb"], reverse=True)
+
+    def select(
+        self,
+        prompt_tokens: int,
+        downloaded: List[Dict],
+        resident: List[Dict],
+        available_gb: Optional[float] = None
+    ) -> Optional[str]:
+        """
+        Largest model that fits in memory and meets the SLO; failing that the
+        fastest one that fits, and failing that the smallest one, unless a
+        resident model should be kept (see the class docstring). None when no
+        downloaded model is known, so the caller can fall back.
+        """
+        ranked = self.rank(prompt_tokens, downloaded, resident, available_gb)
+        if not ranked:
+            return None
+        loaded = {self._name(model) for model in resident}
+        best = self._best(ranked)
+        incumbent = self._incumbent(ranked, loaded)
+        if best["model"] not in loaded and incumbent is not None and not self._clearly_better(best, incumbent):
+            best = incumbent
+        self.last_selected = best["model"]
+        return best["model"]
+
+    @staticmethod
+    def _name(model: Dict) -> Optional[str]:
+        return model.get("name") or model.get("model")
+
+    def _best(self, ranked: List[Dict[str, Any]]) -> Dict[str, Any]:
+        fitting = [candidate for candidate in ranked if candidate["fits_memory"]]
+        for candidate in fitting:
+            if candidate["meets_slo"]:
+                return candidate
+        if fitting:
+            return min(fitting, key=lambda candidate: candidate["latency"])
+        return ranked[-1]
+
+    def _incumbent(self, ranked: List[Dict[str, Any]], resident: set) -> Optional[Dict[str, Any]]:
+        """The resident model to stick with: the last one chosen, else the largest loaded one"""
+        loaded = [candidate for candidate in ranked if candidate["model"] in resident]
+        for candidate in loaded:
+            if candidate["model"] == self.last_selected:
+                return candidate
+        return loaded[0] if loaded else None
+
+    def _clearly_better(self, candidate: Dict[str, Any], incumbent: Dict[str, Any]) -> bool:
+        if not incumbent["meets_slo"]:
+            # Switch away when the incumbent is too slow and the candidate isn't
+            return candidate["meets_slo"] or candidate["latency"] * (1 + self.switch_margin) <= incumbent["latency"]
+        if not candidate["meets_slo"]:
+            return False
+        return candidate["size_gb"] >= incumbent["size_gb"] * (1 + self.switch_margin)
@@ -0,0 +1,129 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+NS_PER_SECOND = 1e9
+
+def parse_generation_stats(data: Dict[str, Any], time_to_first_token: Optional[float] = None) -> Dict[str, float]:
+    """
+    Turn the counters on Ollama's final chunk into seconds and tokens per
+    second. Ollama reports *_duration in nanoseconds; fields it left out
+    (e.g. prompt_eval_count when the whole prompt came from its cache) are
+    left out here too. Without a streamed first token, load + prompt eval
+    stands in for time to first token.
+    """
+    stats: Dict[str, float] = {}
+    if data.get("load_duration") is not None:
+        stats["load_seconds"] = data["load_duration"] / NS_PER_SECOND
+    if data.get("total_duration") is not None:
+        stats["total_seconds"] = data["total_duration"] / NS_PER_SECOND
+
+    for prefix, count_key, duration_key in (
+        ("prompt", "prompt_eval_count", "prompt_eval_duration"),
+        ("eval", "eval_count", "eval_duration")
+    ):
+        count, duration = data.get(count_key), data.get(duration_key)
+        if count is None:
+            continue
+        stats[f"{prefix}_tokens"] = count
+        if duration:
+            stats[f"{prefix}_seconds"] = duration / NS_PER_SECOND
+            stats[f"{prefix}_tokens_per_second"] = count / (duration / NS_PER_SECOND)
+
+    if time_to_first_token is not None:
+        stats["time_to_first_token"] = time_to_first_token
+    elif "prompt_seconds" in stats:
+        stats["time_to_first_token"] = stats.get("load_seconds", 0.0) + stats["prompt_seconds"]
+    return stats
+
+class ModelPerformanceTracker:
+    """
+    Observed generation performance per model on this machine.
+
+    Keeps lifetime token and time totals (throughput is total tokens over
+    total time, so long replies weigh more than one-liners) and the last
+    `window` generations for recent averages. Saved to a small JSON file so
+    the numbers survive backend restarts.
+    """
+
+    def __init__(self, path: Optional[str] = None, window: int = 20):
+        self.path = path
+        self.window = window
+        self._totals: Dict[str, Dict[str, float]] = {}
+        self._recent: Dict[str, Deque[Dict[str, float]]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, model: str, stats: Dict[str, float]):
+        with self._lock:
+            totals = self._totals.setdefault(model, {
+                "generations": 0, "prompt_tokens": 0, "prompt_seconds": 0.0,
+                "eval_tokens": 0, "eval_seconds": 0.0, "load_seconds": 0.0, "last_seen": 0.0
+            })
+            totals["generations"] += 1
+            for key in ("prompt_tokens", "prompt_seconds", "eval_tokens", "eval_seconds", "load_seconds"):
+                totals[key] += stats.get(key, 0)
+            totals["last_seen"] = time.time()
+            self._recent.setdefault(model, deque(maxlen=self.window)).append(dict(stats))
+
+    def summary(self, model: str) -> Optional[Dict[str, Any]]:
+        """Throughput figures for one model, or None if it hasn't been used yet"""
+        with self._lock:
+            totals = self._totals.get(model)
+            if totals is None:
+                return None
+            recent = list(self._recent.get(model, ()))
+
+        def rate(tokens, seconds):
+            return round(tokens / seconds, 2) if seconds else None
+
+        def recent_mean(key):
+            values = [sample[key] for sample in recent if key in sample]
+            return round(sum(values) / len(values), 3) if values else None
+
+        return {
+            "generations": int(totals["generations"]),
+            "eval_tokens_per_second": rate(totals["eval_tokens"], totals["eval_seconds"]),
+            "prompt_tokens_per_second": rate(totals["prompt_tokens"], totals["prompt_seconds"]),
+            "avg_load_seconds": round(totals["load_seconds"] / totals["generations"], 3),
+            "recent_eval_tokens_per_second": recent_mean("eval_tokens_per_second"),
+            "recent_time_to_first_token": recent_mean("time_to_first_token"),
+            "recent_prompt_tokens": recent_mean("prompt_tokens"),
+            "last_seen": totals["last_seen"]
+        }
+
+    def summaries(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            models = list(self._totals)
+        return {model: self.summary(model) for model in models}
+
+    def load(self):
+        """Read totals saved by an earlier run; a missing or corrupt file starts fresh"""
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                saved = json.load(f)
+            with self._lock:
+                self._totals = saved.get("totals", {})
+                self._recent = {
+                    model: deque(samples, maxlen=self.window)
+                    for model, samples in saved.get("recent", {}).items()
+                }
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable model stats file {self.path}: {e}")
+
+    def save(self):
+        if not self.path:
+            return
+        with self._lock:
+            data = {"totals": self._totals, "recent": {model: list(samples) for model, samples in self._recent.items()}}
+        tmp_path = self.path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Could not save model stats to {self.path}: {e}")
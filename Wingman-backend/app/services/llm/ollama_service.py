@@ -1,7 +1,47 @@
+import asyncio
+import hashlib
 import httpx
+import json
 import psutil
-from typing import Dict, Any, Optional, List
-from datetime import datetime
+import time
+from typing import Dict, Any, Optional, List, AsyncIterator, Tuple
+
+from app.core.config import settings
+from app.core.metrics import OLLAMA_TTFT_SECONDS, OLLAMA_PROMPT_EVAL_RATE, OLLAMA_EVAL_RATE
+from .admission import OllamaAdmissionController, AdmissionRejected
+from .model_selector import AdaptiveModelSelector
+from .model_stats import ModelPerformanceTracker, parse_generation_stats
+from .token_budget import estimate_tokens
+
+WINGMAN_SYSTEM_PROMPT = """You are Wingman, an intelligent productivity assistant with FULL database access.
+
+CAPABILITIES:
+- Access user's complete task history, calendar events, and diary entries
+- Perform analytics and trend analysis
+- Present data in tables, charts, and organized formats
+- Provide insights based on historical patterns
+
+RESPONSE GUIDELINES:
+- PROVIDE COMPREHENSIVE, DETAILED RESPONSES - No word limits!
+- When user asks about specific dates, ACCESS THE DATABASE and show actual data
+- Present data in organized tables, bullet points, or visual formats
+- Be analytical and insightful, not just conversational
+- If user asks "can you access June 1st data", respond with actual data from that date
+- Use functions like get_tasks('2025-06-01') to fetch specific information
+- Give thorough explanations, step-by-step analysis, and detailed insights
+- Don't abbreviate or summarize unless specifically asked
+- Feel free to provide examples, suggestions, and comprehensive guidance
+
+ALWAYS REMEMBER:
+- You have database access - USE IT and show the data
+- Provide detailed analysis, not brief responses
+- Show actual data from database queries
+- Be thorough and helpful like a professional assistant
+- The user wants comprehensive responses, not short answers
+
+"""
+
+DEFAULT_NUM_CTX = 8192
 
 class WingmanOllamaService:
     """
@@ -9,9 +49,44 @@ class WingmanOllamaService:
     """
     
     def __init__(self):
-        self.ollama_url = "http://localhost:11434"
+        self.ollama_url = settings.OLLAMA_URL.rstrip("/")
         self.current_model = None
-        self.client = httpx.AsyncClient(timeout=60.0)  # Increased timeout
+        # Created on first request, see client and control_client
+        self._client: Optional[httpx.AsyncClient] = None
+        self._control_client: Optional[httpx.AsyncClient] = None
+        self.connect_timeout = settings.OLLAMA_CONNECT_TIMEOUT
+        self.first_byte_timeout = settings.OLLAMA_FIRST_BYTE_TIMEOUT
+        self.total_timeout = settings.OLLAMA_TOTAL_TIMEOUT
+        
+        # Status cache so the chat path doesn't probe /api/tags on every request
+        self.status_cache_ttl = 30.0
+        self.status_error_ttl = 5.0  # Retry sooner while Ollama is down
+        self._status_cache: Optional[Dict[str, Any]] = None
+        self._status_cached_at = 0.0
+        self._downloaded_models: Optional[List[Dict]] = None
+        self._status_lock = asyncio.Lock()
+        self._status_refresh_task: Optional[asyncio.Task] = None
+        self._total_ram_gb: Optional[float] = None
+        
+        # Tokens kept free in num_ctx for the model's reply
+        self.response_token_reserve = 1024
+        
+        # Keep-alive / warm-up state
+        self.keep_alive = settings.OLLAMA_KEEP_ALIVE
+        self._resident_models: List[Dict] = []
+        self._warm_up_tasks: Dict[str, asyncio.Task] = {}
+        self._selected_warm_up: Optional[asyncio.Task] = None
+        
+        # Backpressure in front of the single local Ollama instance
+        self.admission = OllamaAdmissionController(
+            max_concurrent_per_model=settings.OLLAMA_MAX_CONCURRENT_PER_MODEL,
+            max_queue_depth=settings.OLLAMA_MAX_QUEUE_DEPTH,
+            max_wait_seconds=settings.OLLAMA_MAX_QUEUE_WAIT
+        )
+        self._inflight: Dict[Tuple[str, str], asyncio.Task] = {}  # (model, request digest) -> generation
+        
+        # Observed tokens/s per model; runtime points it at a file next to wingman.db
+        self.performance = ModelPerformanceTracker()
         
         # ✅ EXPANDED: Model configurations with DeepSeek
         self.models = {
@@ -21,21 +96,24 @@ class WingmanOllamaService:
                 "size": "1.3GB",
                 "ram_required": 2,
                 "description": "Compact model for low-resource systems",
-                "provider": "Meta"
+                "provider": "Meta",
+                "num_ctx": 4096  # Smaller window keeps prompt eval fast on low-end machines
             },
             "llama3.2:3b": {
                 "name": "llama3.2:3b", 
                 "size": "2.0GB",
                 "ram_required": 4,
                 "description": "Balanced model for most systems",
-                "provider": "Meta"
+                "provider": "Meta",
+                "num_ctx": 8192
             },
             "llama3.2:8b": {
                 "name": "llama3.2:8b",
                 "size": "4.9GB", 
                 "ram_required": 8,
                 "description": "Advanced model for complex tasks",
-                "provider": "Meta"
+                "provider": "Meta",
+                "num_ctx": 8192
             },
             # ✅ NEW: DeepSeek models
             "deepseek-r1:1.5b": {
@@ -43,63 +121,157 @@ class WingmanOllamaService:
                 "size": "0.9GB",
                 "ram_required": 2,
                 "description": "Fast reasoning model, excellent for coding and math",
-                "provider": "DeepSeek"
+                "provider": "DeepSeek",
+                "num_ctx": 4096  # Smaller window keeps prompt eval fast on low-end machines
             },
             "deepseek-r1:7b": {
                 "name": "deepseek-r1:7b",
                 "size": "4.1GB",
                 "ram_required": 6,
                 "description": "Advanced reasoning model with superior logic",
-                "provider": "DeepSeek"
+                "provider": "DeepSeek",
+                "num_ctx": 8192
             },
             "deepseek-r1:14b": {
                 "name": "deepseek-r1:14b",
                 "size": "8.2GB",
                 "ram_required": 12,
                 "description": "Top-tier reasoning model for complex problems",
-                "provider": "DeepSeek"
+                "provider": "DeepSeek",
+                "num_ctx": 8192
             }
         }
+        
+        self.selector = AdaptiveModelSelector(
+            self.models,
+            self.performance,
+            latency_slo=settings.MODEL_LATENCY_SLO,
+            expected_output_tokens=settings.MODEL_EXPECTED_OUTPUT_TOKENS,
+            memory_headroom_gb=settings.MODEL_MEMORY_HEADROOM_GB,
+            switch_margin=settings.MODEL_SWITCH_MARGIN
+        )
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """
+        HTTP client for generations, pulls and warm-ups.
+
+        Ollama serves HTTP/1.1 and httpx doesn't pipeline, so each request in
+        flight occupies a whole connection until its last token. The pool is
+        sized for the concurrent generations the admission controller allows
+        and keeps those connections alive between chats; the read timeout is
+        the first-byte timeout, which then bounds the gap between chunks.
+        """
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.first_byte_timeout, connect=self.connect_timeout),
+                limits=httpx.Limits(
+                    max_connections=settings.OLLAMA_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.OLLAMA_MAX_CONNECTIONS,
+                    keepalive_expiry=settings.OLLAMA_KEEPALIVE_EXPIRY
+                )
+            )
+        return self._client
+
+    @property
+    def control_client(self) -> httpx.AsyncClient:
+        """
+        Separate small pool for /api/tags, /api/ps, unload and delete calls,
+        so status checks never queue behind long generations for a socket.
+        """
+        if self._control_client is None:
+            self._control_client = httpx.AsyncClient(
+                timeout=httpx.Timeout(settings.OLLAMA_CONTROL_TIMEOUT, connect=self.connect_timeout),
+                limits=httpx.Limits(
+                    max_connections=4,
+                    max_keepalive_connections=2,
+                    keepalive_expiry=settings.OLLAMA_KEEPALIVE_EXPIRY
+                )
+            )
+        return self._control_client
 
     async def generate_response(
         self, 
         prompt: str, 
         context: str = "", 
-        model: Optional[str] = None
+        model: Optional[str] = None,
+        chat_history: Optional[List[Dict]] = None,
+        user_id: Optional[str] = None
     ) -> Dict[str, Any]:
-        """Generate AI response with UNLIMITED TOKENS for comprehensive responses"""
+        """
+        Generate AI response with UNLIMITED TOKENS for comprehensive responses.
+
+        Passing chat_history switches to Ollama's /api/chat endpoint, see _build_messages.
+        Identical requests already in flight share one generation, and every
+        generation goes through the admission controller, which raises
+        AdmissionRejected when Ollama is saturated.
+        """
         
         if not model:
-            model = self._get_recommended_model()
+            model = self.select_model(prompt)
         
-        full_prompt = self._build_prompt(prompt, context)
+        endpoint, payload = self._build_request(prompt, context, model, chat_history, stream=False)
         
+        key = (model, hashlib.sha256(
+            (endpoint + json.dumps(payload, sort_keys=True)).encode("utf-8")
+        ).hexdigest())
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(
+                self._generate_admitted(prompt, context, model, endpoint, payload, user_id)
+            )
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            print(f"Coalescing duplicate request for {model}")
+        
+        # Shielded so one client disconnecting doesn't cancel the others' answer
+        return await asyncio.shield(task)
+
+    async def _generate_admitted(
+        self,
+        prompt: str,
+        context: str,
+        model: str,
+        endpoint: str,
+        payload: Dict[str, Any],
+        user_id: Optional[str]
+    ) -> Dict[str, Any]:
+        """Wait for an admission slot, then generate"""
+        async with self.admission.slot(model, user_id or "anonymous") as waited:
+            result = await self._generate(prompt, context, model, endpoint, payload)
+            result["queue_wait"] = waited
+            return result
+
+    async def _generate(
+        self,
+        prompt: str,
+        context: str,
+        model: str,
+        endpoint: str,
+        payload: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Send one blocking generation request to Ollama"""
         try:
-            start_time = datetime.now()
+            start_time = time.perf_counter()
             
-            response = await self.client.post(
-                f"{self.ollama_url}/api/generate",
-                json={
-                    "model": model,
-                    "prompt": full_prompt,
-                    "stream": False,
-                    "options": {
-                        "num_predict": -1,      # 🔥 UNLIMITED TOKENS!
-                        "temperature": 0.7,
-                        "top_p": 0.9,
-                        "num_ctx": 8192,       # 🔥 MASSIVE context window
-                        "repeat_penalty": 1.1,
-                        "stop": ["Human:", "User:"]  # Natural stopping points
-                    }
-                },
-                timeout=120.0  # 🔥 2 MINUTE timeout for detailed responses
+            # Without streaming Ollama answers in one piece, so the first byte is
+            # also the last; the read timeout is stretched to the total deadline
+            response = await asyncio.wait_for(
+                self.client.post(
+                    f"{self.ollama_url}{endpoint}",
+                    json=payload,
+                    timeout=httpx.Timeout(self.total_timeout, connect=self.connect_timeout)
+                ),
+                self.total_timeout
             )
             
-            processing_time = (datetime.now() - start_time).total_seconds()
+            processing_time = time.perf_counter() - start_time
             
             if response.status_code == 200:
                 result = response.json()
-                ai_response = result.get("response", "No response generated")
+                stats = self._observe_generation(model, result)
+                ai_response = self._extract_text(result) or "No response generated"
                 
                 # Log response length for debugging
                 print(f"Generated response length: {len(ai_response)} characters")
@@ -110,7 +282,8 @@ class WingmanOllamaService:
                     "model_used": model,
                     "processing_time": processing_time,
                     "context_used": bool(context),
-                    "response_length": len(ai_response)
+                    "response_length": len(ai_response),
+                    "stats": stats
                 }
             else:
                 return {
@@ -120,7 +293,7 @@ class WingmanOllamaService:
                     "processing_time": processing_time
                 }
                 
-        except httpx.TimeoutException:
+        except (httpx.TimeoutException, asyncio.TimeoutError):
             return {
                 "success": False,
                 "fallback_response": f"I'm taking longer to provide a detailed response. {self._fallback_response(prompt)}",
@@ -135,35 +308,235 @@ class WingmanOllamaService:
                 "error": str(e)
             }
 
-    def _build_prompt(self, user_message: str, context: str) -> str:
-        """Build the complete prompt encouraging DETAILED responses"""
-        system_prompt = """You are Wingman, an intelligent productivity assistant with FULL database access.
+    async def stream_response(
+        self,
+        prompt: str,
+        context: str = "",
+        model: Optional[str] = None,
+        chat_history: Optional[List[Dict]] = None,
+        user_id: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream the AI response token by token as Ollama produces it.
 
-CAPABILITIES:
-- Access user's complete task history, calendar events, and diary entries
-- Perform analytics and trend analysis
-- Present data in tables, charts, and organized formats
-- Provide insights based on historical patterns
+        Yields {"type": "token", "content": ...} events, followed by a single
+        {"type": "done", ...} event carrying the same metadata as
+        generate_response plus time_to_first_token. If the admission controller
+        turns the request away, only the "done" event is sent, with the reason
+        in "error".
+        """
+        if not model:
+            model = self.select_model(prompt)
 
-RESPONSE GUIDELINES:
-- PROVIDE COMPREHENSIVE, DETAILED RESPONSES - No word limits!
-- When user asks about specific dates, ACCESS THE DATABASE and show actual data
-- Present data in organized tables, bullet points, or visual formats
-- Be analytical and insightful, not just conversational
-- If user asks "can you access June 1st data", respond with actual data from that date
-- Use functions like get_tasks('2025-06-01') to fetch specific information
-- Give thorough explanations, step-by-step analysis, and detailed insights
-- Don't abbreviate or summarize unless specifically asked
-- Feel free to provide examples, suggestions, and comprehensive guidance
+        endpoint, payload = self._build_request(prompt, context, model, chat_history, stream=True)
+        
+        try:
+            async with self.admission.slot(model, user_id or "anonymous") as waited:
+                async for event in self._stream(prompt, context, model, endpoint, payload):
+                    if event["type"] == "done":
+                        event["queue_wait"] = waited
+                    yield event
+        except AdmissionRejected as e:
+            yield {
+                "type": "done",
+                "success": False,
+                "fallback_response": self._fallback_response(prompt),
+                "model_used": model,
+                "error": e.reason,
+                "retry_after": e.retry_after
+            }
 
-ALWAYS REMEMBER:
-- You have database access - USE IT and show the data
-- Provide detailed analysis, not brief responses
-- Show actual data from database queries
-- Be thorough and helpful like a professional assistant
-- The user wants comprehensive responses, not short answers
+    async def _stream(
+        self,
+        prompt: str,
+        context: str,
+        model: str,
+        endpoint: str,
+        payload: Dict[str, Any]
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Relay one streaming generation request from Ollama"""
+        start_time = time.perf_counter()
+        time_to_first_token = None
+        stats: Dict[str, float] = {}
+        chunks: List[str] = []
 
-"""
+        try:
+            async with self.client.stream(
+                "POST",
+                f"{self.ollama_url}{endpoint}",
+                json=payload
+            ) as response:
+                if response.status_code != 200:
+                    yield {
+                        "type": "done",
+                        "success": False,
+                        "fallback_response": self._fallback_response(prompt),
+                        "model_used": model,
+                        "processing_time": time.perf_counter() - start_time,
+                        "error": f"HTTP {response.status_code}"
+                    }
+                    return
+
+                async for line in response.aiter_lines():
+                    if not line:
+                        continue
+
+                    data = json.loads(line)
+                    if data.get("error"):
+                        raise RuntimeError(data["error"])
+
+                    token = self._extract_text(data)
+                    if token:
+                        if time_to_first_token is None:
+                            time_to_first_token = time.perf_counter() - start_time
+                        chunks.append(token)
+                        yield {"type": "token", "content": token}
+
+                    if data.get("done"):
+                        stats = self._observe_generation(model, data, time_to_first_token)
+                        break
+
+                    if time.perf_counter() - start_time > self.total_timeout:
+                        raise httpx.ReadTimeout(f"Generation exceeded {self.total_timeout:.0f}s")
+
+            ai_response = "".join(chunks)
+            processing_time = time.perf_counter() - start_time
+            print(
+                f"Streamed response: {len(ai_response)} characters, "
+                f"first token after {time_to_first_token or 0:.2f}s, total {processing_time:.2f}s"
+            )
+
+            yield {
+                "type": "done",
+                "success": True,
+                "response": ai_response,
+                "model_used": model,
+                "processing_time": processing_time,
+                "time_to_first_token": time_to_first_token,
+                "context_used": bool(context),
+                "response_length": len(ai_response),
+                "stats": stats
+            }
+
+        except httpx.TimeoutException:
+            yield {
+                "type": "done",
+                "success": False,
+                "response": "".join(chunks),
+                "fallback_response": f"I'm taking longer to provide a detailed response. {self._fallback_response(prompt)}",
+                "model_used": model,
+                "time_to_first_token": time_to_first_token,
+                "error": "timeout"
+            }
+        except Exception as e:
+            yield {
+                "type": "done",
+                "success": False,
+                "response": "".join(chunks),
+                "fallback_response": self._fallback_response(prompt),
+                "model_used": model,
+                "time_to_first_token": time_to_first_token,
+                "error": str(e)
+            }
+
+    def _observe_generation(self, model: str, data: Dict[str, Any], time_to_first_token: Optional[float] = None) -> Dict[str, float]:
+        """Parse the timings on Ollama's final chunk, record them and return them"""
+        stats = parse_generation_stats(data, time_to_first_token)
+        
+        if "time_to_first_token" in stats:
+            mode = "stream" if time_to_first_token is not None else "blocking"
+            OLLAMA_TTFT_SECONDS.observe(stats["time_to_first_token"], model=model, mode=mode)
+        if "prompt_tokens_per_second" in stats:
+            OLLAMA_PROMPT_EVAL_RATE.observe(stats["prompt_tokens_per_second"], model=model)
+        if "eval_tokens_per_second" in stats:
+            OLLAMA_EVAL_RATE.observe(stats["eval_tokens_per_second"], model=model)
+        self.performance.record(model, stats)
+        
+        print(
+            f"{model}: prompt {stats.get('prompt_tokens', 0)} tokens at {stats.get('prompt_tokens_per_second', 0):.1f} tok/s, "
+            f"eval {stats.get('eval_tokens', 0)} tokens at {stats.get('eval_tokens_per_second', 0):.1f} tok/s, "
+            f"load {stats.get('load_seconds', 0):.2f}s"
+        )
+        return stats
+
+    def _build_request(
+        self,
+        prompt: str,
+        context: str,
+        model: str,
+        chat_history: Optional[List[Dict]],
+        stream: bool
+    ) -> Tuple[str, Dict[str, Any]]:
+        """Pick the Ollama endpoint and build its JSON body"""
+        if chat_history is not None:
+            return "/api/chat", {
+                "model": model,
+                "messages": self._build_messages(prompt, context, chat_history),
+                "stream": stream,
+                "keep_alive": self.keep_alive,
+                "options": self.generation_options(model)
+            }
+        
+        return "/api/generate", {
+            "model": model,
+            "prompt": self._build_prompt(prompt, context),
+            "stream": stream,
+            "keep_alive": self.keep_alive,
+            "options": self.generation_options(model)
+        }
+
+    @staticmethod
+    def _extract_text(data: Dict[str, Any]) -> str:
+        """Generated text from an /api/generate or /api/chat response (or stream chunk)"""
+        if "message" in data:
+            return data["message"].get("content", "")
+        return data.get("response", "")
+
+    def generation_options(self, model: str) -> Dict[str, Any]:
+        """Sampling options shared by blocking and streaming generation"""
+        return {
+            "num_predict": -1,      # 🔥 UNLIMITED TOKENS!
+            "temperature": 0.7,
+            "top_p": 0.9,
+            "num_ctx": self.get_num_ctx(model),
+            "repeat_penalty": 1.1,
+            "stop": ["Human:", "User:"]  # Natural stopping points
+        }
+
+    def get_num_ctx(self, model: Optional[str]) -> int:
+        """Context window configured for a model"""
+        return self.models.get(model or "", {}).get("num_ctx", DEFAULT_NUM_CTX)
+
+    def get_context_budget(self, model: Optional[str], user_message: str) -> int:
+        """Tokens left for user-data context once the system prompt, message and reply are accounted for"""
+        prompt_tokens = estimate_tokens(self._build_prompt(user_message, ""))
+        return max(0, self.get_num_ctx(model) - self.response_token_reserve - prompt_tokens)
+
+    def _build_messages(self, user_message: str, context: str, chat_history: List[Dict]) -> List[Dict[str, str]]:
+        """
+        Build an /api/chat message list whose prefix stays byte-identical between turns.
+
+        The system prompt and earlier turns never change once sent, so Ollama
+        can reuse their KV cache; everything that varies per request (today's
+        data, the new question) only appears in the final user message.
+        """
+        messages = [{"role": "system", "content": WINGMAN_SYSTEM_PROMPT}]
+        for msg in chat_history:
+            messages.append({
+                "role": "assistant" if msg.get("is_ai") else "user",
+                "content": msg.get("message", "")
+            })
+        
+        if context:
+            final_turn = f"{context}\n\nUser Request: {user_message}"
+        else:
+            final_turn = user_message
+        messages.append({"role": "user", "content": final_turn})
+        return messages
+
+    def _build_prompt(self, user_message: str, context: str) -> str:
+        """Build the complete prompt encouraging DETAILED responses"""
+        system_prompt = WINGMAN_SYSTEM_PROMPT
         
         if context:
             full_prompt = f"{system_prompt}\n{context}\n\nUser Request: {user_message}\n\nDetailed Response:"
@@ -176,7 +549,7 @@ ALWAYS REMEMBER:
         """Delete a model from Ollama"""
         try:
             print(f"Attempting to delete model: {model_name}")
-            response = await self.client.request(
+            response = await self.control_client.request(
                 "DELETE",
                 f"{self.ollama_url}/api/delete",
                 json={"name": model_name}
@@ -184,6 +557,9 @@ ALWAYS REMEMBER:
             
             if response.status_code == 200:
                 print(f"Successfully deleted model: {model_name}")
+                self.invalidate_status_cache()
+                if self.current_model == model_name:
+                    self.current_model = None
                 return {"success": True, "message": f"Model {model_name} deleted successfully"}
             else:
                 error_msg = f"Failed to delete model: HTTP {response.status_code}"
@@ -193,15 +569,20 @@ ALWAYS REMEMBER:
             print(f"Error deleting model {model_name}: {e}")
             return {"success": False, "error": str(e)}
 
-    async def get_downloaded_models(self) -> List[Dict]:
+    async def get_downloaded_models(self, use_cache: bool = False) -> List[Dict]:
         """Get list of downloaded models from Ollama"""
+        if use_cache:
+            await self.get_status()
+            return self._downloaded_models or []
+        
         try:
             print("Fetching downloaded models from Ollama...")
-            response = await self.client.get(f"{self.ollama_url}/api/tags")
+            response = await self.control_client.get(f"{self.ollama_url}/api/tags")
             
             if response.status_code == 200:
                 data = response.json()
                 models = data.get("models", [])
+                self._downloaded_models = models
                 print(f"Found {len(models)} models in Ollama")
                 return models
             else:
@@ -219,7 +600,7 @@ ALWAYS REMEMBER:
             # Check if model is currently being downloaded via Ollama
             try:
                 # Try to get download status from Ollama
-                response = await self.client.get(f"{self.ollama_url}/api/ps")
+                response = await self.control_client.get(f"{self.ollama_url}/api/ps")
                 if response.status_code == 200:
                     data = response.json()
                     # Check if any models are currently downloading
@@ -268,24 +649,78 @@ ALWAYS REMEMBER:
             }
 
     async def check_ollama_status(self) -> Dict[str, Any]:
-        """Check if Ollama is running and available"""
+        """Check if Ollama is running and available, refreshing the status cache"""
         try:
-            response = await self.client.get(f"{self.ollama_url}/api/tags")
+            response = await self.control_client.get(f"{self.ollama_url}/api/tags")
             if response.status_code == 200:
                 models_data = response.json()
-                available_models = [model.get("name", "") for model in models_data.get("models", [])]
-                return {
+                self._downloaded_models = models_data.get("models", [])
+                available_models = [model.get("name", "") for model in self._downloaded_models]
+                status = {
                     "status": "running",
                     "available": True,
                     "models": available_models,
-                    "recommended_model": self._get_recommended_model()
+                    "recommended_model": self.select_model()
                 }
             else:
-                return {"status": "error", "available": False, "error": f"HTTP {response.status_code}"}
+                status = {"status": "error", "available": False, "error": f"HTTP {response.status_code}"}
         except httpx.ConnectError:
-            return {"status": "not_running", "available": False, "error": "Ollama not running"}
+            status = {"status": "not_running", "available": False, "error": "Ollama not running"}
         except Exception as e:
-            return {"status": "error", "available": False, "error": str(e)}
+            status = {"status": "error", "available": False, "error": str(e)}
+        
+        self._status_cache = status
+        self._status_cached_at = time.monotonic()
+        return status
+
+    def _status_is_fresh(self) -> bool:
+        """Whether the cached status is still within its TTL"""
+        if self._status_cache is None:
+            return False
+        ttl = self.status_cache_ttl if self._status_cache.get("available") else self.status_error_ttl
+        return time.monotonic() - self._status_cached_at < ttl
+
+    async def get_status(self) -> Dict[str, Any]:
+        """Return the cached Ollama status, probing only when it has expired"""
+        if self._status_is_fresh():
+            return self._status_cache
+        
+        async with self._status_lock:
+            # Another request may have refreshed it while we waited
+            if self._status_is_fresh():
+                return self._status_cache
+            return await self.check_ollama_status()
+
+    def invalidate_status_cache(self):
+        """Force the next status read to probe Ollama again"""
+        self._status_cache = None
+        self._downloaded_models = None
+        self._status_cached_at = 0.0
+
+    def start_status_refresher(self):
+        """Keep the status cache warm in the background"""
+        if self._status_refresh_task is None or self._status_refresh_task.done():
+            self._status_refresh_task = asyncio.create_task(self._refresh_status_loop())
+
+    async def stop_status_refresher(self):
+        """Stop the background status refresh"""
+        if self._status_refresh_task is not None:
+            self._status_refresh_task.cancel()
+            try:
+                await self._status_refresh_task
+            except asyncio.CancelledError:
+                pass
+            self._status_refresh_task = None
+
+    async def _refresh_status_loop(self):
+        """Refresh the status cache at half its TTL so readers rarely see it expire"""
+        while True:
+            try:
+                async with self._status_lock:
+                    await self.check_ollama_status()
+            except Exception as e:
+                print(f"Error refreshing Ollama status: {e}")
+            await asyncio.sleep(self.status_cache_ttl / 2)
 
     async def pull_model(self, model_name: str) -> Dict[str, Any]:
         """Download/pull a model from Ollama"""
@@ -293,10 +728,11 @@ ALWAYS REMEMBER:
             response = await self.client.post(
                 f"{self.ollama_url}/api/pull",
                 json={"name": model_name},
-                timeout=300.0  # 5 minutes for download
+                timeout=httpx.Timeout(self.total_timeout, connect=self.connect_timeout)  # Downloads take minutes
             )
             
             if response.status_code == 200:
+                self.invalidate_status_cache()
                 return {
                     "success": True,
                     "message": f"Successfully started download of {model_name}",
@@ -316,10 +752,218 @@ ALWAYS REMEMBER:
                 "model": model_name
             }
 
+    async def get_loaded_models(self) -> List[Dict]:
+        """Get the models Ollama currently holds in memory (/api/ps)"""
+        try:
+            response = await self.control_client.get(f"{self.ollama_url}/api/ps")
+            if response.status_code == 200:
+                self._resident_models = response.json().get("models", [])
+            else:
+                print(f"Failed to fetch loaded models, status: {response.status_code}")
+        except Exception as e:
+            print(f"Error getting loaded models: {e}")
+        return self._resident_models
+
+    async def is_loaded(self, model_name: str) -> bool:
+        """Whether Ollama holds the model in memory right now, per /api/ps"""
+        resident = await self.get_loaded_models()
+        return any(self._model_name(m) == model_name for m in resident)
+
+    def is_in_use(self, model_name: str) -> bool:
+        """Whether any generation is running or waiting on the model"""
+        return self.admission.is_busy(model_name) or any(model == model_name for model, _ in self._inflight)
+
+    async def warm_up_model(self, model_name: str) -> Dict[str, Any]:
+        """
+        Load a model into memory ahead of the first chat and pin it with keep_alive.
+
+        Concurrent calls for the same model share one load.
+        """
+        task = self._warm_up_tasks.get(model_name)
+        if task is None or task.done():
+            task = asyncio.create_task(self._warm_up(model_name))
+            self._warm_up_tasks[model_name] = task
+        return await asyncio.shield(task)
+
+    def schedule_warm_up(self, model_name: str):
+        """Start warming a model in the background without waiting for it"""
+        task = self._warm_up_tasks.get(model_name)
+        if task is None or task.done():
+            self._warm_up_tasks[model_name] = asyncio.create_task(self._warm_up(model_name))
+
+    def schedule_warm_up_selected(self):
+        """Warm up whichever model select_model picks once Ollama has listed its models"""
+        async def warm_up_selected():
+            await self.get_status()
+            await self.get_loaded_models()
+            await self.warm_up_model(self.select_model())
+        self._selected_warm_up = asyncio.create_task(warm_up_selected())
+
+    async def _warm_up(self, model_name: str) -> Dict[str, Any]:
+        """Make room for a model, then load it with an empty prompt"""
+        try:
+            evicted = await self._make_room_for(model_name)
+            
+            start_time = time.perf_counter()
+            # An empty prompt makes Ollama load the model without generating anything
+            response = await self.client.post(
+                f"{self.ollama_url}/api/generate",
+                json={"model": model_name, "prompt": "", "keep_alive": self.keep_alive},
+                timeout=httpx.Timeout(self.total_timeout, connect=self.connect_timeout)  # Large models can take minutes to read from disk
+            )
+            load_time = time.perf_counter() - start_time
+            
+            if response.status_code == 200:
+                self.current_model = model_name
+                await self.get_loaded_models()
+                print(f"Warmed up {model_name} in {load_time:.1f}s (evicted: {evicted or 'none'})")
+                return {"success": True, "model": model_name, "load_time": load_time, "evicted": evicted}
+            
+            return {
+                "success": False,
+                "model": model_name,
+                "error": f"Failed to load model: HTTP {response.status_code}",
+                "evicted": evicted
+            }
+        except Exception as e:
+            print(f"Error warming up {model_name}: {e}")
+            return {"success": False, "model": model_name, "error": str(e)}
+
+    async def _make_room_for(self, model_name: str) -> List[str]:
+        """
+        Unload other resident models, largest first, until the target fits in
+        free RAM. Models with generations running or queued are left alone.
+        """
+        required_gb = self.models.get(model_name, {}).get("ram_required")
+        if not required_gb:
+            return []
+        
+        if await self.is_loaded(model_name):
+            return []
+        
+        free_gb = psutil.virtual_memory().available / (1024**3)
+        evicted = []
+        for model in sorted(self._resident_models, key=lambda m: m.get("size", 0), reverse=True):
+            if free_gb >= required_gb:
+                break
+            if self.is_in_use(self._model_name(model)):
+                continue
+            if await self.unload_model(self._model_name(model)):
+                evicted.append(self._model_name(model))
+                free_gb += model.get("size", 0) / (1024**3)
+        
+        if free_gb < required_gb:
+            print(f"Warning: {model_name} needs ~{required_gb}GB but only {free_gb:.1f}GB is free")
+        return evicted
+
+    async def unload_model(self, model_name: str) -> bool:
+        """Ask Ollama to drop a model from memory immediately"""
+        try:
+            response = await self.control_client.post(
+                f"{self.ollama_url}/api/generate",
+                json={"model": model_name, "keep_alive": 0}
+            )
+            if response.status_code == 200:
+                self._resident_models = [m for m in self._resident_models if self._model_name(m) != model_name]
+                if self.current_model == model_name:
+                    self.current_model = None
+                return True
+            print(f"Failed to unload {model_name}: HTTP {response.status_code}")
+        except Exception as e:
+            print(f"Error unloading {model_name}: {e}")
+        return False
+
+    @staticmethod
+    def _model_name(model: Dict) -> str:
+        """/api/ps and /api/tags entries carry the tag in 'name' (newer builds also in 'model')"""
+        return model.get("name") or model.get("model", "")
+
+    def _expected_prompt_tokens(self, user_message: str) -> int:
+        """System prompt + message, plus the context recent chats actually sent"""
+        recent = [
+            summary["recent_prompt_tokens"]
+            for summary in self.performance.summaries().values()
+            if summary and summary.get("recent_prompt_tokens")
+        ]
+        typical_context = sum(recent) / len(recent) if recent else DEFAULT_NUM_CTX // 4
+        return estimate_tokens(self._build_prompt(user_message, "")) + int(typical_context)
+
+    def select_model(self, user_message: str = "") -> str:
+        """
+        Model for a request that didn't name one. With MODEL_SELECTION=adaptive
+        this is the largest downloaded model predicted to meet the latency SLO
+        given free memory and measured speed (see AdaptiveModelSelector); the
+        RAM-based choice is used when Ollama hasn't listed its models yet.
+        """
+        if settings.MODEL_SELECTION == "adaptive" and self._downloaded_models:
+            try:
+                model = self.selector.select(
+                    self._expected_prompt_tokens(user_message),
+                    self._downloaded_models,
+                    self._resident_models
+                )
+                if model:
+                    return model
+            except Exception as e:
+                print(f"Adaptive model selection failed, using RAM-based choice: {e}")
+        return self._get_recommended_model()
+
+    def rank_models(self, user_message: str = "") -> List[Dict[str, Any]]:
+        """The selector's predictions for every downloaded model, for inspection"""
+        return self.selector.rank(
+            self._expected_prompt_tokens(user_message),
+            self._downloaded_models or [],
+            self._resident_models
+        )
+
+    async def benchmark_models(self, models: Optional[List[str]] = None, num_predict: int = 64) -> List[Dict[str, Any]]:
+        """
+        Measure each downloaded model (or the given ones) that fits in memory
+        with a short fixed generation, so the selector has real numbers for
+        them. Loads models one after another, evicting others, so this takes
+        a while; it runs through the admission controller like any chat.
+        """
+        await self.get_downloaded_models()
+        await self.get_loaded_models()
+        if models is None:
+            models = [candidate["model"] for candidate in self.rank_models() if candidate["fits_memory"]]
+        
+        results = []
+        for model in models:
+            warm = await self.warm_up_model(model)
+            if not warm.get("success"):
+                results.append({"model": model, "success": False, "error": warm.get("error")})
+                continue
+            payload = {
+                "model": model,
+                "prompt": "Write three sentences about planning a productive week.",
+                "stream": False,
+                "keep_alive": self.keep_alive,
+                "options": {**self.generation_options(model), "num_predict": num_predict}
+            }
+            try:
+                async with self.admission.slot(model, "benchmark"):
+                    response = await self.client.post(
+                        f"{self.ollama_url}/api/generate",
+                        json=payload,
+                        timeout=httpx.Timeout(self.total_timeout, connect=self.connect_timeout)
+                    )
+                response.raise_for_status()
+                stats = self._observe_generation(model, response.json())
+                results.append({"model": model, "success": True, "stats": stats})
+            except Exception as e:
+                results.append({"model": model, "success": False, "error": str(e)})
+        
+        await asyncio.to_thread(self.performance.save)
+        return results
+
     def _get_recommended_model(self) -> str:
-        """Determine best model based on system RAM"""
+        """Determine best model based on system RAM (fallback for select_model)"""
         try:
-            total_ram_gb = psutil.virtual_memory().total / (1024**3)
+            # Installed RAM doesn't change while we're running
+            if self._total_ram_gb is None:
+                self._total_ram_gb = psutil.virtual_memory().total / (1024**3)
+            total_ram_gb = self._total_ram_gb
             
             if total_ram_gb >= 12:
                 return "deepseek-r1:7b"
@@ -339,7 +983,7 @@ ALWAYS REMEMBER:
             return {
                 "total_ram_gb": round(total_ram_gb, 1),
                 "available_ram_gb": round(memory.available / (1024**3), 1),
-                "recommended_model": self._get_recommended_model(),
+                "recommended_model": self.select_model(),
                 "can_run_3b": total_ram_gb >= 4,
                 "can_run_1b": total_ram_gb >= 2
             }
@@ -375,4 +1019,9 @@ ALWAYS REMEMBER:
 
     async def close(self):
         """Clean up resources"""
-        await self.client.aclose()
\ No newline at end of file
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        if self._control_client is not None:
+            await self._control_client.aclose()
+            self._control_client = None
\ No newline at end of file
@@ -0,0 +1,191 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import closing, contextmanager
+from typing import Dict, Any, Iterator, Optional, Tuple
+
+class ResponseCache:
+    """
+    Cache of completed chat responses keyed on everything that shapes the answer.
+
+    Entries live in an in-memory LRU bounded by count and size, expire after a
+    TTL, and are written through to a small SQLite file so they survive a
+    backend restart.
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        max_entries: int = 256,
+        max_bytes: int = 16 * 1024 * 1024,
+        ttl_seconds: float = 3600.0,
+        max_disk_entries: int = 2048
+    ):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.max_disk_entries = max_disk_entries
+
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if self.db_path:
+            self._init_disk()
+
+    @staticmethod
+    def make_key(model: str, prompt: str, context_fingerprint: str, options: Dict[str, Any]) -> str:
+        """Hash of (model, normalized prompt, context fingerprint, sampling options)"""
+        normalized_prompt = " ".join(prompt.lower().split())
+        raw = json.dumps(
+            [model, normalized_prompt, context_fingerprint, options],
+            sort_keys=True,
+            ensure_ascii=False
+        )
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return a cached response, or None on a miss or expiry"""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, value = entry
+                if now - stored_at < self.ttl_seconds:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                self._drop(key)
+
+        value = self._disk_get(key, now)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._store(key, value[0], value[1])
+            return value[1]
+
+    def put(self, key: str, value: Dict[str, Any]):
+        """Store a completed response in memory and on disk"""
+        now = time.time()
+        with self._lock:
+            self._store(key, now, value)
+        self._disk_put(key, now, value)
+
+    def clear(self):
+        """Drop every entry, in memory and on disk"""
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self._bytes = 0
+        if self.db_path:
+            try:
+                with self._connect() as conn:
+                    conn.execute("DELETE FROM response_cache")
+            except sqlite3.Error as e:
+                print(f"Error clearing response cache: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit rate and memory use"""
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0
+            }
+
+    # Memory tier (callers hold self._lock)
+
+    def _store(self, key: str, stored_at: float, value: Dict[str, Any]):
+        size = len(json.dumps(value, ensure_ascii=False).encode("utf-8"))
+        if size > self.max_bytes:
+            return
+
+        if key in self._entries:
+            self._drop(key)
+        self._entries[key] = (stored_at, value)
+        self._sizes[key] = size
+        self._bytes += size
+
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._drop(oldest)
+
+    def _drop(self, key: str):
+        self._entries.pop(key, None)
+        self._bytes -= self._sizes.pop(key, 0)
+
+    # Disk tier
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """A connection that commits (or rolls back) and is closed on exit"""
+        with closing(sqlite3.connect(self.db_path, timeout=5.0)) as conn:
+            with conn:
+                yield conn
+
+    def _init_disk(self):
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+            with self._connect() as conn:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS response_cache (
+                        key TEXT PRIMARY KEY,
+                        value TEXT NOT NULL,
+                        created_at REAL NOT NULL
+                    )
+                """)
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_response_cache_created ON response_cache(created_at)")
+        except sqlite3.Error as e:
+            print(f"Response cache disk store unavailable, using memory only: {e}")
+            self.db_path = None
+
+    def _disk_get(self, key: str, now: float) -> Optional[Tuple[float, Dict[str, Any]]]:
+        if not self.db_path:
+            return None
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT value, created_at FROM response_cache WHERE key = ? AND created_at > ?",
+                    (key, now - self.ttl_seconds)
+                ).fetchone()
+            if row:
+                return row[1], json.loads(row[0])
+        except (sqlite3.Error, ValueError) as e:
+            print(f"Error reading response cache: {e}")
+        return None
+
+    def _disk_put(self, key: str, stored_at: float, value: Dict[str, Any]):
+        if not self.db_path:
+            return
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO response_cache (key, value, created_at) VALUES (?, ?, ?)",
+                    (key, json.dumps(value, ensure_ascii=False), stored_at)
+                )
+                # Prune expired rows and cap the file to the newest entries
+                conn.execute("DELETE FROM response_cache WHERE created_at <= ?", (stored_at - self.ttl_seconds,))
+                conn.execute("""
+                    DELETE FROM response_cache WHERE key NOT IN (
+                        SELECT key FROM response_cache ORDER BY created_at DESC LIMIT ?
+                    )
+                """, (self.max_disk_entries,))
+        except sqlite3.Error as e:
+            print(f"Error writing response cache: {e}")
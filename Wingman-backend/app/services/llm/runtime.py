@@ -0,0 +1,102 @@
+import asyncio
+import os
+import threading
+from typing import TYPE_CHECKING, Optional
+
+from app.core.config import settings
+
+if TYPE_CHECKING:
+    from .context_builder import WingmanContextBuilder
+    from .ollama_service import WingmanOllamaService
+    from .response_cache import ResponseCache
+    from .indexer import BackgroundIndexer
+
+# Built on app startup (or on first use outside the app, e.g. in scripts)
+# rather than at import, so importing the API stays cheap; the classes are
+# imported in _build_locked too, since they pull in numpy and the semantic index
+_ollama_service: Optional["WingmanOllamaService"] = None
+_context_builder: Optional["WingmanContextBuilder"] = None
+_response_cache: Optional["ResponseCache"] = None
+_indexer: Optional["BackgroundIndexer"] = None
+_built = False
+_build_lock = threading.Lock()
+
+def _build():
+    """Construct the chat services; opens wingman.db and loads the semantic index"""
+    with _build_lock:
+        if not _built:
+            _build_locked()
+
+def _build_locked():
+    global _ollama_service, _context_builder, _response_cache, _indexer, _built
+    from .context_builder import WingmanContextBuilder
+    from .ollama_service import WingmanOllamaService
+    from .response_cache import ResponseCache
+    from .indexer import BackgroundIndexer
+
+    ollama_service = WingmanOllamaService()
+    context_builder = WingmanContextBuilder()  # Shared so its SQLite pool outlives a single request
+    
+    ollama_service.performance.path = os.path.join(os.path.dirname(context_builder.db_path), "wingman-model-stats.json")
+    ollama_service.performance.load()
+
+    response_cache = None
+    if settings.RESPONSE_CACHE_ENABLED:
+        response_cache = ResponseCache(
+            db_path=os.path.join(os.path.dirname(context_builder.db_path), "wingman-response-cache.db"),
+            max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES,
+            max_bytes=settings.RESPONSE_CACHE_MAX_MB * 1024 * 1024,
+            ttl_seconds=settings.RESPONSE_CACHE_TTL
+        )
+
+    indexer = None
+    if context_builder.semantic_index is not None:
+        indexer = BackgroundIndexer(
+            context_builder.semantic_index,
+            batch_size=settings.INDEXER_BATCH_SIZE,
+            interval=settings.INDEXER_INTERVAL,
+            workers=settings.INDEXER_WORKERS
+        )
+
+    _ollama_service, _context_builder, _response_cache, _indexer = ollama_service, context_builder, response_cache, indexer
+    _built = True
+
+def get_ollama_service() -> "WingmanOllamaService":
+    _build()
+    return _ollama_service
+
+def get_context_builder() -> "WingmanContextBuilder":
+    _build()
+    return _context_builder
+
+def get_response_cache() -> Optional["ResponseCache"]:
+    _build()
+    return _response_cache
+
+def get_indexer() -> Optional["BackgroundIndexer"]:
+    _build()
+    return _indexer
+
+async def startup():
+    """Build the services off the event loop and start their background tasks"""
+    await asyncio.to_thread(_build)
+    # Keep Ollama status warm so chat requests never wait on /api/tags
+    _ollama_service.start_status_refresher()
+    # Load the recommended model now so the first chat doesn't wait for it
+    _ollama_service.schedule_warm_up_selected()
+    # Embed new chat, diary, task and event rows for semantic search
+    if _indexer is not None:
+        _indexer.start()
+
+async def shutdown():
+    """Stop background tasks, close the Ollama client and save model stats"""
+    global _ollama_service, _context_builder, _response_cache, _indexer, _built
+    if not _built:
+        return
+    await _ollama_service.stop_status_refresher()
+    if _indexer is not None:
+        await _indexer.stop()
+    await _ollama_service.close()
+    await asyncio.to_thread(_ollama_service.performance.save)
+    _ollama_service = _context_builder = _response_cache = _indexer = None
+    _built = False
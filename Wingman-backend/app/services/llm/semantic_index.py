@@ -0,0 +1,362 @@
+import importlib.util
+import json
+import os
+import threading
+from typing import Dict, List, Any, Optional, Tuple
+
+from .sqlite_pool import get_connection_pool
+
+# Optional dependencies: without them semantic search is simply switched off
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# sentence-transformers drags in torch, so only check it is installed here and
+# import it when a model is first loaded
+HAS_SENTENCE_TRANSFORMERS = importlib.util.find_spec("sentence_transformers") is not None
+
+DEFAULT_EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+INDEX_FORMAT_VERSION = 2
+INT8_SCALE = 127.0
+
+# source table -> SQL expression rendering one row as searchable text
+SOURCE_TEXT = {
+    "chat_history": "'[' || COALESCE(timestamp, '') || '] ' || CASE WHEN is_ai THEN 'AI' ELSE 'USER' END || ': ' || message",
+    "chat_messages": "'[' || COALESCE(timestamp, '') || '] ' || CASE WHEN is_ai THEN 'AI' ELSE 'USER' END || ': ' || message",
+    "diary_entries": "COALESCE(entry_date, '') || ': ' || COALESCE(title, 'Untitled') || ' - ' || COALESCE(content, '')",
+    "tasks": "'Task on ' || COALESCE(task_date, '') || ' ' || COALESCE(task_time, '') || ': ' || title"
+             " || CASE WHEN completed THEN ' (completed)' WHEN failed THEN ' (failed)' ELSE ' (pending)' END",
+    "calendar_events": "'Event on ' || COALESCE(event_date, '') || ' ' || COALESCE(event_time, '') || ': ' || title"
+                       " || COALESCE(' - ' || description, '')"
+}
+
+# Tables whose rows are edited in place carry an updated_at watermark; the rest are append-only
+SOURCE_CHANGE_COLUMN = {
+    "chat_history": None,
+    "chat_messages": "updated_at",
+    "diary_entries": "updated_at",
+    "tasks": "updated_at",
+    "calendar_events": "updated_at"
+}
+
+_models: Dict[str, Any] = {}
+
+def embed_texts(model_name: str, texts: List[str]):
+    """
+    Embed texts as L2-normalised float32 rows.
+
+    Module-level so it can run in a ProcessPoolExecutor worker; each process
+    loads the model once and keeps it for later batches.
+    """
+    model = _models.get(model_name)
+    if model is None:
+        from sentence_transformers import SentenceTransformer
+        model = _models[model_name] = SentenceTransformer(model_name, device="cpu")
+    vectors = model.encode(texts, batch_size=32, normalize_embeddings=True, show_progress_bar=False)
+    return np.asarray(vectors, dtype=np.float32)
+
+class SemanticIndex:
+    """
+    Compact on-disk vector store over wingman.db rows, searched by cosine similarity.
+
+    Vectors are quantized to int8 (or float16) and appended to vectors.bin,
+    which is memory-mapped for search. meta.json maps every slot to its
+    (source, row id, user id); an updated or deleted row leaves a null
+    tombstone in its old slot, and the file is compacted once tombstones
+    pile up. Row text is read back from wingman.db at query time, so the
+    index never holds a stale copy of it. Filling the index is the job of
+    BackgroundIndexer in indexer.py.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        index_dir: Optional[str] = None,
+        model_name: str = DEFAULT_EMBEDDING_MODEL,
+        dtype: str = "int8"
+    ):
+        if dtype not in ("int8", "float16"):
+            raise ValueError(f"Unsupported index dtype: {dtype}")
+
+        self.db_path = db_path
+        self.index_dir = index_dir or os.path.join(os.path.dirname(os.path.abspath(db_path)), "wingman-index")
+        self.model_name = model_name
+        self.dtype = dtype
+        self.compact_ratio = 0.25
+
+        self._model_failed = False
+        self._dim: Optional[int] = None
+        self._vectors = None
+        self._slots: List[Optional[List[Any]]] = []  # slot -> [source, row_id, user_id] or None
+        self._positions: Dict[Tuple[str, int], int] = {}
+        self._user_slots: Dict[str, set] = {}
+        self._watermarks: Dict[str, List[Any]] = {}
+        self._lock = threading.Lock()
+
+        if self.available:
+            self._load()
+
+    @property
+    def available(self) -> bool:
+        """Whether the optional numpy/sentence-transformers stack is installed and usable"""
+        return np is not None and HAS_SENTENCE_TRANSFORMERS and not self._model_failed
+
+    @property
+    def _vectors_path(self) -> str:
+        return os.path.join(self.index_dir, "vectors.bin")
+
+    @property
+    def _meta_path(self) -> str:
+        return os.path.join(self.index_dir, "meta.json")
+
+    @property
+    def _np_dtype(self):
+        return np.int8 if self.dtype == "int8" else np.float16
+
+    def _embed_query(self, text: str):
+        try:
+            return embed_texts(self.model_name, [text])[0]
+        except Exception as e:
+            print(f"Semantic search disabled, could not load {self.model_name}: {e}")
+            self._model_failed = True
+            return None
+
+    # Persistence
+
+    def _load(self):
+        """Open a previously persisted index, discarding it if its format or model changed"""
+        try:
+            with open(self._meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            if (meta.get("version"), meta.get("model"), meta.get("dtype")) != (INDEX_FORMAT_VERSION, self.model_name, self.dtype):
+                print(f"Semantic index format or model changed, rebuilding with {self.model_name}/{self.dtype}")
+                return
+            self._dim = meta["dim"]
+            self._slots = meta["slots"]
+            self._watermarks = meta["watermarks"]
+            self._rebuild_maps()
+            self._map_vectors()
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Error loading semantic index, rebuilding: {e}")
+            self._dim = None
+            self._slots = []
+            self._watermarks = {}
+            self._rebuild_maps()
+            self._vectors = None
+
+    def _rebuild_maps(self):
+        self._positions = {}
+        self._user_slots = {}
+        for slot, entry in enumerate(self._slots):
+            if entry is not None:
+                self._positions[(entry[0], entry[1])] = slot
+                self._user_slots.setdefault(entry[2], set()).add(slot)
+
+    def _map_vectors(self):
+        if not self._slots or self._dim is None:
+            self._vectors = None
+            return
+        self._vectors = np.memmap(self._vectors_path, dtype=self._np_dtype, mode="r", shape=(len(self._slots), self._dim))
+
+    def _save_meta(self):
+        """Write slot metadata and watermarks, replacing the previous file atomically"""
+        os.makedirs(self.index_dir, exist_ok=True)
+        tmp_meta = self._meta_path + ".tmp"
+        with open(tmp_meta, "w", encoding="utf-8") as f:
+            json.dump({
+                "version": INDEX_FORMAT_VERSION,
+                "model": self.model_name,
+                "dtype": self.dtype,
+                "dim": self._dim,
+                "slots": self._slots,
+                "watermarks": self._watermarks
+            }, f)
+        os.replace(tmp_meta, self._meta_path)
+
+    def _quantize(self, vectors):
+        if self.dtype == "int8":
+            return np.clip(np.rint(vectors * INT8_SCALE), -INT8_SCALE, INT8_SCALE).astype(np.int8)
+        return vectors.astype(np.float16)
+
+    def _dequantize(self, vectors):
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if self.dtype == "int8":
+            vectors /= INT8_SCALE
+        return vectors
+
+    # Writes (called from the indexer)
+
+    def get_watermark(self, source: str) -> List[Any]:
+        """Last indexed [changed_at, row_id] for a source table"""
+        return list(self._watermarks.get(source, ["", 0]))
+
+    def indexed_ids(self, source: str) -> set:
+        """Row ids of a source table that currently have a live vector"""
+        with self._lock:
+            return {row_id for (src, row_id) in self._positions if src == source}
+
+    def upsert(self, items: List[Dict[str, Any]], vectors, watermarks: Dict[str, List[Any]]):
+        """
+        Append vectors for new or changed rows and advance the watermarks.
+
+        `items` are {"source", "row_id", "user_id"} dicts matching `vectors`;
+        a row that already had a vector gets its old slot tombstoned.
+        """
+        quantized = self._quantize(np.asarray(vectors, dtype=np.float32))
+
+        with self._lock:
+            if self._dim is None:
+                self._dim = int(quantized.shape[1])
+            elif quantized.shape[1] != self._dim:
+                raise ValueError(f"Embedding size changed from {self._dim} to {quantized.shape[1]}")
+
+            os.makedirs(self.index_dir, exist_ok=True)
+            expected = len(self._slots) * self._dim * quantized.itemsize
+            mode = "r+b" if os.path.exists(self._vectors_path) else "wb"
+            with open(self._vectors_path, mode) as f:
+                f.seek(0, os.SEEK_END)
+                if f.tell() != expected:
+                    # Leftovers of an append whose metadata never made it to disk
+                    f.truncate(expected)
+                f.seek(expected)
+                f.write(quantized.tobytes())
+
+            for item in items:
+                self._tombstone((item["source"], item["row_id"]))
+                slot = len(self._slots)
+                self._slots.append([item["source"], item["row_id"], item["user_id"]])
+                self._positions[(item["source"], item["row_id"])] = slot
+                self._user_slots.setdefault(item["user_id"], set()).add(slot)
+
+            self._watermarks.update(watermarks)
+            self._save_meta()
+            self._map_vectors()
+
+        self.maybe_compact()
+
+    def delete(self, keys: List[Tuple[str, int]]) -> int:
+        """Tombstone the vectors of deleted rows; returns how many were live"""
+        with self._lock:
+            removed = sum(1 for key in keys if self._tombstone(key))
+            if removed:
+                self._save_meta()
+        if removed:
+            self.maybe_compact()
+        return removed
+
+    def _tombstone(self, key: Tuple[str, int]) -> bool:
+        slot = self._positions.pop(key, None)
+        if slot is None:
+            return False
+        user_id = self._slots[slot][2]
+        self._user_slots.get(user_id, set()).discard(slot)
+        self._slots[slot] = None
+        return True
+
+    def maybe_compact(self) -> bool:
+        """Rewrite the vector file without tombstoned slots once they exceed compact_ratio"""
+        with self._lock:
+            dead = len(self._slots) - len(self._positions)
+            if dead < 256 or dead < len(self._slots) * self.compact_ratio:
+                return False
+
+            live = [slot for slot, entry in enumerate(self._slots) if entry is not None]
+            vectors = np.asarray(self._vectors[live]) if live else np.zeros((0, self._dim), dtype=self._np_dtype)
+
+            tmp_vectors = self._vectors_path + ".tmp"
+            with open(tmp_vectors, "wb") as f:
+                f.write(vectors.tobytes())
+
+            # Release the old memory map first, Windows can't replace a mapped file
+            self._vectors = None
+            try:
+                os.replace(tmp_vectors, self._vectors_path)
+            except OSError as e:
+                print(f"Could not compact semantic index yet: {e}")
+                self._map_vectors()
+                return False
+
+            self._slots = [self._slots[slot] for slot in live]
+            self._rebuild_maps()
+            self._save_meta()
+            self._map_vectors()
+
+        print(f"Semantic index compacted: dropped {dead} tombstones, {len(live)} vectors left")
+        return True
+
+    # Reads
+
+    def search(self, user_id: str, query: str, k: int = 5, min_score: float = 0.3) -> List[Dict[str, Any]]:
+        """Top-k rows for this user by cosine similarity to the query, with their current text"""
+        if not self.available or not query.strip():
+            return []
+
+        with self._lock:
+            vectors = self._vectors
+            user_rows = np.fromiter(sorted(self._user_slots.get(user_id, ())), dtype=np.int64)
+            entries = [self._slots[slot] for slot in user_rows]
+        if vectors is None or not len(user_rows):
+            return []
+
+        query_vector = self._embed_query(query)
+        if query_vector is None:
+            return []
+
+        scores = self._dequantize(vectors[user_rows]) @ query_vector
+        top = np.argsort(-scores)[:k]
+
+        hits = []
+        for position in top:
+            score = float(scores[position])
+            if score < min_score:
+                break
+            source, row_id, owner = entries[position]
+            hits.append({"source": source, "row_id": row_id, "user_id": owner, "score": score})
+
+        return self._attach_text(hits)
+
+    def _attach_text(self, hits: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Read the current text of each hit from wingman.db, dropping rows deleted meanwhile"""
+        if not hits:
+            return []
+
+        by_source: Dict[str, List[int]] = {}
+        for hit in hits:
+            by_source.setdefault(hit["source"], []).append(hit["row_id"])
+
+        texts = {}
+        with get_connection_pool(self.db_path).read_transaction() as conn:
+            for source, row_ids in by_source.items():
+                placeholders = ",".join("?" for _ in row_ids)
+                rows = conn.execute(
+                    f"SELECT id, {SOURCE_TEXT[source]} FROM {source} WHERE id IN ({placeholders})",
+                    row_ids
+                ).fetchall()
+                for row_id, text in rows:
+                    texts[(source, row_id)] = text
+
+        results = []
+        for hit in hits:
+            text = texts.get((hit["source"], hit["row_id"]))
+            if text is not None:
+                results.append({**hit, "text": text})
+        return results
+
+    def stats(self) -> Dict[str, Any]:
+        """Size of the store and how much of it is tombstones"""
+        with self._lock:
+            slots = len(self._slots)
+            live = len(self._positions)
+            itemsize = 1 if self.dtype == "int8" else 2
+            return {
+                "model": self.model_name,
+                "dtype": self.dtype,
+                "dimensions": self._dim,
+                "vectors": live,
+                "tombstones": slots - live,
+                "bytes": slots * (self._dim or 0) * itemsize,
+                "watermarks": dict(self._watermarks)
+            }
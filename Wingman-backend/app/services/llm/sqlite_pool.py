@@ -0,0 +1,144 @@
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+class SQLiteConnectionPool:
+    """
+    Thread-safe pool of long-lived, read-only connections to the local Wingman database
+    """
+
+    def __init__(self, db_path: str, max_connections: int = 4, cached_statements: int = 64):
+        self.db_path = db_path
+        self.max_connections = max_connections
+        self.cached_statements = cached_statements
+
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(max_connections)
+        self._lock = threading.Lock()
+        self._connections: List[sqlite3.Connection] = []
+        self._wal_checked = False
+
+    def _ensure_wal(self):
+        """Switch the database to WAL once so our readers never block the Electron writer"""
+        if self._wal_checked or not os.path.exists(self.db_path):
+            return
+
+        with self._lock:
+            if self._wal_checked:
+                return
+            # journal_mode is persisted in the file but can only be changed by a writable connection
+            try:
+                conn = sqlite3.connect(self.db_path, timeout=5.0)
+                try:
+                    conn.execute("PRAGMA journal_mode=WAL")
+                finally:
+                    conn.close()
+            except sqlite3.Error as e:
+                print(f"Could not enable WAL mode on {self.db_path}: {e}")
+            self._wal_checked = True
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a new read-only connection"""
+        self._ensure_wal()
+
+        uri = f"{Path(self.db_path).resolve().as_uri()}?mode=ro"
+        conn = sqlite3.connect(
+            uri,
+            uri=True,
+            timeout=5.0,
+            check_same_thread=False,          # Connections move between worker threads
+            cached_statements=self.cached_statements,
+            isolation_level=None              # We issue BEGIN/COMMIT ourselves
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA query_only = ON")
+
+        with self._lock:
+            self._connections.append(conn)
+        return conn
+
+    def _discard(self, conn: sqlite3.Connection):
+        """Close a connection that should not go back into the pool"""
+        with self._lock:
+            if conn in self._connections:
+                self._connections.remove(conn)
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a pooled connection, blocking while all of them are in use"""
+        self._slots.acquire()
+        try:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                conn = self._connect()
+        except Exception:
+            self._slots.release()
+            raise
+
+        healthy = True
+        try:
+            yield conn
+        except sqlite3.DatabaseError:
+            healthy = False
+            raise
+        finally:
+            if healthy and conn.in_transaction:
+                try:
+                    conn.rollback()
+                except sqlite3.Error:
+                    healthy = False
+
+            if healthy:
+                self._idle.put(conn)
+            else:
+                self._discard(conn)
+            self._slots.release()
+
+    @contextmanager
+    def read_transaction(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a connection with an open read transaction, so every query sees one snapshot"""
+        with self.connection() as conn:
+            conn.execute("BEGIN")
+            try:
+                yield conn
+            finally:
+                if conn.in_transaction:
+                    conn.execute("COMMIT")
+
+    def close(self):
+        """Close every connection owned by the pool"""
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+
+        while True:
+            try:
+                self._idle.get_nowait()
+            except queue.Empty:
+                break
+
+_pools: Dict[str, SQLiteConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+def get_connection_pool(db_path: str) -> SQLiteConnectionPool:
+    """Return the process-wide pool for a database file, creating it on first use"""
+    key = os.path.abspath(db_path)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = SQLiteConnectionPool(key)
+            _pools[key] = pool
+        return pool
@@ -0,0 +1,89 @@
+from typing import Dict, List, Any, Iterable, Optional
+
+# Llama/DeepSeek BPE vocabularies average roughly four characters per token on English text
+CHARS_PER_TOKEN = 4.0
+TOKENS_PER_WORD = 1.3
+
+# Lower number = more important, trimmed last when the budget is tight
+SECTION_PRIORITIES = {
+    "tasks": 0,
+    "events": 0,
+    "chat_history": 1,
+    "relevant": 1,
+    "diary": 2
+}
+
+# When chat history is sent as /api/chat messages it is the prompt prefix Ollama
+# caches, so everything in the final message gives way before it does
+STABLE_PREFIX_PRIORITIES = {**SECTION_PRIORITIES, "chat_history": -1}
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate for prompt budgeting, without loading a tokenizer"""
+    if not text:
+        return 0
+    by_chars = len(text) / CHARS_PER_TOKEN
+    by_words = len(text.split()) * TOKENS_PER_WORD
+    return int(max(by_chars, by_words)) + 1
+
+def _omitted_note(count: int) -> str:
+    """Summary line left in place of trimmed items"""
+    noun = "entry" if count == 1 else "entries"
+    return f"({count} older {noun} omitted to fit the context window)"
+
+def fit_sections(
+    sections: Dict[str, List[str]],
+    budget: int,
+    oldest_first: Iterable[str] = (),
+    priorities: Dict[str, int] = SECTION_PRIORITIES,
+    steps: Optional[Dict[str, int]] = None
+) -> Dict[str, Any]:
+    """
+    Trim formatted context sections until their estimated size fits the budget.
+
+    Items are dropped oldest-first from the lowest-priority section that still
+    has any; each trimmed section gets a one-line note saying how much was cut.
+    `oldest_first` names the sections whose lists are in chronological order,
+    every other list is assumed to be newest-first. `steps` makes a section
+    give up that many items at a time instead of one.
+    """
+    oldest_first = set(oldest_first)
+    steps = steps or {}
+    lines = {name: list(items) for name, items in sections.items()}
+    item_tokens = {name: [estimate_tokens(item) for item in items] for name, items in lines.items()}
+    omitted = {name: 0 for name in lines}
+
+    def section_total(name: str) -> int:
+        note = estimate_tokens(_omitted_note(omitted[name])) if omitted[name] else 0
+        return sum(item_tokens[name]) + note
+
+    total = sum(section_total(name) for name in lines)
+
+    # Least important sections first; ties broken by size so the biggest one gives way
+    trim_order = sorted(lines, key=lambda name: (-priorities.get(name, 0), -section_total(name)))
+    for name in trim_order:
+        while total > budget and lines[name]:
+            before = section_total(name)
+            drop_at = 0 if name in oldest_first else -1
+            count = min(steps.get(name, 1), len(lines[name]))
+            for _ in range(count):
+                lines[name].pop(drop_at)
+                item_tokens[name].pop(drop_at)
+            omitted[name] += count
+            total += section_total(name) - before
+
+    tokens = {}
+    for name in lines:
+        if omitted[name]:
+            note = _omitted_note(omitted[name])
+            if name in oldest_first:
+                lines[name].insert(0, note)
+            else:
+                lines[name].append(note)
+        tokens[name] = section_total(name)
+
+    return {
+        "lines": lines,
+        "tokens": tokens,
+        "omitted": omitted,
+        "total_tokens": total
+    }
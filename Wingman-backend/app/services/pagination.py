@@ -0,0 +1,69 @@
+import base64
+import json
+from typing import Dict, List, Any, Callable, Optional, Tuple
+
+def encode_cursor(*values) -> str:
+    """Opaque cursor holding the sort key of the last row on a page"""
+    raw = json.dumps(list(values), separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[str, int]:
+    """The (sort value, id) pair from encode_cursor; anything else is an invalid cursor"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if (
+        not isinstance(values, list) or len(values) != 2
+        or not isinstance(values[0], str)
+        or not isinstance(values[1], int) or isinstance(values[1], bool)
+    ):
+        raise ValueError("Invalid cursor")
+    return values[0], values[1]
+
+def after_filter(column: str, value: Any, row_id: int, descending: bool = False) -> str:
+    """
+    PostgREST or=() expression for rows strictly after (value, id) in
+    (column, id) order, the keyset condition for the next page.
+    """
+    op = "lt" if descending else "gt"
+    quoted = json.dumps(str(value))
+    return f"{column}.{op}.{quoted},and({column}.eq.{quoted},id.{op}.{int(row_id)})"
+
+def paginate(
+    rows: List[Dict[str, Any]],
+    limit: int,
+    sort_key: Callable[[Dict[str, Any]], Tuple]
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Trim rows fetched with limit + 1 to one page; the extra row only tells
+    us whether there is a next page, whose cursor is the last kept row's key.
+    """
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(*sort_key(rows[-1]))
+
+def select_columns(fields: Optional[List[str]], allowed: List[str], required: List[str]) -> str:
+    """
+    PostgREST select list for a projection request. `required` columns
+    (row id, pagination key) are always included; unknown names are rejected
+    rather than passed through to the query.
+    """
+    if not fields:
+        return ",".join(allowed)
+
+    unknown = [field for field in fields if field not in allowed]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}; allowed: {', '.join(allowed)}")
+
+    columns = list(required) + [field for field in fields if field not in required]
+    return ",".join(columns)
+
+def group_by_date(rows: List[Dict[str, Any]], column: str) -> Dict[str, List[Dict[str, Any]]]:
+    """Bucket rows (already sorted by date) into {date: [rows]}"""
+    days: Dict[str, List[Dict[str, Any]]] = {}
+    for row in rows:
+        days.setdefault(row.get(column) or "", []).append(row)
+    return days
@@ -1,41 +1,115 @@
-from app.core.supabase import get_supabase_client
+from app.core.config import settings
+from app.core.supabase import get_async_supabase_client, execute
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
 import logging
+import threading
+import time
 import uuid
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
-supabase = get_supabase_client()
 
-def get_user_by_username_and_password(username: str, password: str):
+# Columns safe to keep in memory; the password never enters the cache
+PROFILE_COLUMNS = "id, username, email, name, created_at, updated_at"
+
+class UserCache:
+    """
+    In-process cache of user profiles keyed by user id.
+
+    Known users are kept for `ttl_seconds`; ids that turned out not to exist
+    are remembered for the much shorter `negative_ttl_seconds`, so a user
+    created elsewhere shows up quickly. Least recently used entries are
+    evicted beyond `max_entries`.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 300.0, negative_ttl_seconds: float = 10.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, Optional[Dict[str, Any]]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id: str) -> Tuple[bool, Optional[Dict[str, Any]]]:
+        """(found, profile); a cached "no such user" is (True, None)"""
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None:
+                expires_at, profile = entry
+                if time.monotonic() < expires_at:
+                    self._entries.move_to_end(user_id)
+                    self.hits += 1
+                    return True, profile
+                del self._entries[user_id]
+            self.misses += 1
+            return False, None
+
+    def put(self, user_id: str, profile: Optional[Dict[str, Any]]):
+        """Cache a profile, or None to remember that the user doesn't exist"""
+        ttl = self.ttl_seconds if profile is not None else self.negative_ttl_seconds
+        if profile is not None:
+            profile = {key: value for key, value in profile.items() if key != "password"}
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + ttl, profile)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: str):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
+
+user_cache = UserCache(
+    max_entries=settings.USER_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.USER_CACHE_TTL,
+    negative_ttl_seconds=settings.USER_CACHE_NEGATIVE_TTL
+)
+
+async def get_user_by_username_and_password(username: str, password: str):
     """
     Get a user by username and password.
     """
     try:
         logger.info(f"Attempting to find user with username: {username}")
-        
-        # Support both older and newer Supabase client versions
-        try:
-            # Try newer style first (table method)
-            response = supabase.table("users").select("*").eq("username", username).eq("password", password).execute()
-        except Exception:
-            # Fall back to older style (from_ method)
-            response = supabase.from_("users").select("*").eq("username", username).eq("password", password).execute()
-        
+
+        supabase = get_async_supabase_client()
+        response = await execute(
+            supabase.table("users").select("*").eq("username", username).eq("password", password)
+        )
+
         # Log information about the response
         if hasattr(response, 'data'):
             logger.info(f"Found {len(response.data)} matching users")
-            
+
             if response.data and len(response.data) > 0:
+                user_cache.put(response.data[0]["id"], response.data[0])
                 return response.data[0]
         else:
             logger.warning("Supabase response doesn't have data attribute")
-        
+
         return None
     except Exception as e:
         logger.error(f"Error in get_user_by_username_and_password: {str(e)}")
         return None
 
-def create_user(user_data):
+async def create_user(user_data):
     """
     Create a new user.
     """
@@ -44,32 +118,29 @@ def create_user(user_data):
         if not all(k in user_data for k in ['username', 'email', 'password']):
             logger.error("Missing required user fields")
             return None
-        
+
         # Add uuid if not provided
         if 'id' not in user_data:
             user_data['id'] = str(uuid.uuid4())
-        
+
         # Add username if not provided
         if 'username' not in user_data or not user_data['username']:
             user_data['username'] = user_data['email'].split('@')[0]
-        
+
         # Add timestamps
         now = datetime.now().isoformat()
         user_data['created_at'] = now
         user_data['updated_at'] = now
-        
+
         logger.info(f"Creating user with username: {user_data['username']}")
-        
-        # Support both older and newer Supabase client versions
-        try:
-            # Try newer style first
-            response = supabase.table("users").insert(user_data).execute()
-        except Exception:
-            # Fall back to older style
-            response = supabase.from_("users").insert(user_data).execute()
-        
+
+        supabase = get_async_supabase_client()
+        response = await execute(supabase.table("users").insert(user_data))
+
         if hasattr(response, 'data') and response.data:
             logger.info(f"User created: {response.data[0]['id']}")
+            # Replaces any "doesn't exist" entry left by an earlier check
+            user_cache.put(response.data[0]["id"], response.data[0])
             return response.data[0]
         else:
             logger.warning("User creation response doesn't have data")
@@ -78,17 +149,34 @@ def create_user(user_data):
         logger.error(f"Error in create_user: {str(e)}")
         return None
 
-def update_user(user_id: str, name: str = None):
+async def update_user(user_id: str, name: str = None):
     update_data = {}
     if name: update_data["name"] = name
-    response = supabase.table("users").update(update_data).eq("id", user_id).execute()
+    supabase = get_async_supabase_client()
+    response = await execute(supabase.table("users").update(update_data).eq("id", user_id))
+    # Drop whatever a concurrent lookup cached while the update was in flight
+    user_cache.invalidate(user_id)
+    if response.data:
+        user_cache.put(user_id, response.data[0])
     return response.data[0] if response.data else None
 
-def verify_user_exists(user_id: str) -> bool:
+async def get_user_profile(user_id: str) -> Optional[Dict[str, Any]]:
+    """Get a user's profile (without password), served from the user cache when possible"""
+    found, profile = user_cache.get(user_id)
+    if found:
+        return profile
+
+    supabase = get_async_supabase_client()
+    response = await execute(supabase.table("users").select(PROFILE_COLUMNS).eq("id", user_id))
+    profile = response.data[0] if response.data else None
+    user_cache.put(user_id, profile)
+    return profile
+
+async def verify_user_exists(user_id: str) -> bool:
     """Check if a user exists in the database"""
     try:
-        response = supabase.table("users").select("id").eq("id", user_id).execute()
-        return len(response.data) > 0
+        return await get_user_profile(user_id) is not None
     except Exception as e:
+        # Errors are not cached, the next write checks again
         print(f"Error verifying user: {e}")
-        return False
\ No newline at end of file
+        return False
@@ -1,32 +1,100 @@
 from datetime import date
 from app.api.v1.schemas.task import TaskCreate, TaskUpdate
-from app.core.supabase import supabase
+from app.core.supabase import get_async_supabase_client, execute
 from app.services.user import verify_user_exists
+from app.services.bulk import item_result, verify_users, bulk_write, bulk_update, bulk_delete
+from app.services.pagination import decode_cursor, after_filter, paginate, group_by_date
+from typing import List, Optional
 import traceback
 
-def get_tasks_by_date(date_str, user_id):
+async def get_tasks_by_date(date_str, user_id):
     try:
+        supabase = get_async_supabase_client()
         # Filter by both date and user_id
-        response = supabase.table("tasks").select("*").eq("task_date", date_str).eq("user_id", user_id).execute()
+        response = await execute(
+            supabase.table("tasks").select("*").eq("task_date", date_str).eq("user_id", user_id)
+        )
         
         # ✅ CRITICAL FIX: Database has 'title' field, send as-is
-        result = []
-        for task in response.data:
-            task_copy = dict(task)
-            # Add date and time fields for frontend compatibility only
-            task_copy["date"] = task_copy["task_date"]
-            task_copy["time"] = task_copy.get("task_time", "")
-            # ✅ Keep 'title' as-is - no field mapping needed
-            result.append(task_copy)
-        
-        return result
+        # Add date and time fields for frontend compatibility only
+        return [_task_for_frontend(task) for task in response.data]
     except Exception as e:
         traceback.print_exc()
         print(f"Error fetching tasks: {e}")
         return []
 
-def create_task(task_data: dict):
+async def get_tasks_in_range(
+    user_id: str,
+    start: str,
+    end: str,
+    status: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = 500
+):
+    """
+    Tasks between two dates (inclusive) in one query, grouped by date.
+    status is pending, completed or failed; pages are keyed on (task_date, id).
+    """
+    supabase = get_async_supabase_client()
+    query = (
+        supabase.table("tasks").select("*")
+        .eq("user_id", user_id)
+        .gte("task_date", start)
+        .lte("task_date", end)
+    )
+    
+    if status == "completed":
+        query = query.eq("completed", True)
+    elif status == "failed":
+        query = query.eq("failed", True)
+    elif status == "pending":
+        # IS NOT TRUE, so rows where the flags are NULL still count as pending
+        query = query.not_.is_("completed", "true").not_.is_("failed", "true")
+    elif status is not None:
+        raise ValueError(f"Unknown status '{status}', expected pending, completed or failed")
+    
+    if cursor:
+        last_date, last_id = decode_cursor(cursor)
+        query = query.or_(after_filter("task_date", last_date, last_id))
+    
+    response = await execute(query.order("task_date").order("id").limit(limit + 1))
+    tasks, next_cursor = paginate(response.data, limit, lambda task: (task["task_date"], task["id"]))
+    
+    return {
+        "days": group_by_date([_task_for_frontend(task) for task in tasks], "task_date"),
+        "count": len(tasks),
+        "next_cursor": next_cursor
+    }
+
+def _task_row(task_data: dict) -> dict:
+    """Map a frontend task to the columns of a new tasks row"""
+    db_data = {
+        'title': task_data['title'],  # ✅ Database expects 'title'
+        'task_date': task_data.get('task_date', ''),
+        'task_time': task_data.get('task_time', ''),
+        'completed': task_data.get('completed', False),
+        'user_id': task_data['user_id']
+    }
+    
+    # Handle frontend 'date' field
+    if 'date' in task_data and 'task_date' not in task_data:
+        db_data['task_date'] = task_data['date']
+        
+    # Handle frontend 'time' field
+    if 'time' in task_data and 'task_time' not in task_data:
+        db_data['task_time'] = task_data['time']
+    
+    return db_data
+
+def _task_for_frontend(task: dict) -> dict:
+    # Add frontend compatibility fields
+    task["date"] = task.get("task_date")
+    task["time"] = task.get("task_time", "")
+    return task
+
+async def create_task(task_data: dict):
     try:
+        supabase = get_async_supabase_client()
         print(f"Backend Service: create_task called with: {task_data}")
         
         # ✅ VALIDATION: Ensure required fields
@@ -36,28 +104,14 @@ def create_task(task_data: dict):
             raise ValueError("User ID is required")
             
         # Verify user exists
-        if not verify_user_exists(task_data["user_id"]):
+        if not await verify_user_exists(task_data["user_id"]):
             raise ValueError(f"User with ID {task_data['user_id']} does not exist")
         
         # ✅ Map frontend to database fields
-        db_data = {
-            'title': task_data['title'],  # ✅ Database expects 'title'
-            'task_date': task_data.get('task_date', ''),
-            'task_time': task_data.get('task_time', ''),
-            'completed': task_data.get('completed', False),
-            'user_id': task_data['user_id']
-        }
-        
-        # Handle frontend 'date' field
-        if 'date' in task_data and 'task_date' not in task_data:
-            db_data['task_date'] = task_data['date']
-            
-        # Handle frontend 'time' field
-        if 'time' in task_data and 'task_time' not in task_data:
-            db_data['task_time'] = task_data['time']
+        db_data = _task_row(task_data)
         
         print(f"Creating task with data: {db_data}")
-        response = supabase.table("tasks").insert(db_data).execute()
+        response = await execute(supabase.table("tasks").insert(db_data))
         
         if response.data and len(response.data) > 0:
             task = response.data[0]
@@ -72,8 +126,9 @@ def create_task(task_data: dict):
         print(f"Backend Service: Error creating task: {str(e)}")
         raise e
 
-def update_task(task_id: int, task: dict):
+async def update_task(task_id: int, task: dict):
     try:
+        supabase = get_async_supabase_client()
         print(f"Backend Service: update_task called for ID {task_id}")
         data = dict(task)
         
@@ -93,11 +148,11 @@ def update_task(task_id: int, task: dict):
         # ✅ Keep 'title' as-is since database expects 'title'
         
         # Execute the update query
-        response = supabase.table("tasks").update(data).eq("id", task_id).execute()
+        response = await execute(supabase.table("tasks").update(data).eq("id", task_id))
         
         # If no data returned, fetch the updated task
         if not response.data or len(response.data) == 0:
-            get_response = supabase.table("tasks").select("*").eq("id", task_id).execute()
+            get_response = await execute(supabase.table("tasks").select("*").eq("id", task_id))
             if get_response.data and len(get_response.data) > 0:
                 task_data = get_response.data[0]
                 # Add frontend compatibility fields
@@ -131,12 +186,66 @@ def update_task(task_id: int, task: dict):
             "message": "Failed to update task"
         }
 
-def delete_task(task_id: int):
-    response = supabase.table("tasks").delete().eq("id", task_id).execute()
+async def delete_task(task_id: int):
+    supabase = get_async_supabase_client()
+    response = await execute(supabase.table("tasks").delete().eq("id", task_id))
     if response.data and len(response.data) > 0:
         task_data = response.data[0]
         # Add frontend compatibility fields
         task_data["date"] = task_data["task_date"]
         task_data["time"] = task_data.get("task_time", "")
         return task_data
-    return None
\ No newline at end of file
+    return None
+
+async def create_tasks_bulk(tasks: List[dict]) -> List[dict]:
+    """Create many tasks with a single insert; returns one result per input task"""
+    known_users = await verify_users(task.get('user_id') for task in tasks)
+    
+    results = []
+    rows = {}
+    for index, task_data in enumerate(tasks):
+        if 'text' in task_data and 'title' not in task_data:
+            task_data['title'] = task_data.pop('text')
+        if not task_data.get('title'):
+            results.append(item_result(index, error="Title is required"))
+        elif not task_data.get('user_id'):
+            results.append(item_result(index, error="User ID is required"))
+        elif not known_users.get(task_data['user_id']):
+            results.append(item_result(index, error=f"User with ID {task_data['user_id']} does not exist"))
+        else:
+            rows[index] = _task_row(task_data)
+    
+    results.extend(await bulk_write("tasks", rows, to_frontend=_task_for_frontend))
+    return results
+
+async def update_tasks_bulk(tasks: List[dict]) -> List[dict]:
+    """
+    Update many existing tasks by id; returns one result per input task.
+    Ids that don't exist and unknown user_ids are reported per task.
+    """
+    known_users = await verify_users(task.get('user_id') for task in tasks)
+    
+    results = []
+    rows = {}
+    for index, task in enumerate(tasks):
+        data = dict(task)
+        if 'text' in data and 'title' not in data:
+            data['title'] = data.pop('text')
+        if "date" in data:
+            data["task_date"] = data.pop("date")
+        if "time" in data:
+            data["task_time"] = data.pop("time")
+        
+        if not data.get('id'):
+            results.append(item_result(index, error="Missing required fields: id"))
+        elif 'user_id' in data and not known_users.get(data['user_id']):
+            results.append(item_result(index, error=f"User with ID {data['user_id']} does not exist"))
+        else:
+            rows[index] = data
+    
+    results.extend(await bulk_update("tasks", rows, to_frontend=_task_for_frontend))
+    return results
+
+async def delete_tasks_bulk(task_ids: List[int]) -> List[dict]:
+    """Delete many tasks with a single request; returns one result per id"""
+    return await bulk_delete("tasks", task_ids, to_frontend=_task_for_frontend)
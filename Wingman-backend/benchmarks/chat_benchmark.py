@@ -0,0 +1,306 @@
+"""
+End-to-end benchmark of POST /api/v1/chat/ against the fake Ollama server.
+
+Runs the real FastAPI app in process (lifespan included) on a seeded
+throwaway wingman.db, with Ollama replaced by benchmarks.fake_ollama, and
+steps through increasing numbers of concurrent users. For each level it
+reports throughput, p50/p95/p99 latency, context-build cost (from each
+response's context_timings) and peak process RSS. Run from Wingman-backend:
+
+    python -m benchmarks.chat_benchmark --users 1,4,16,64 --token-latency 0.01
+    python -m benchmarks.chat_benchmark --json results.json
+    python -m benchmarks.chat_benchmark --baseline results.json  # exits 1 on regression
+
+Requests go through the response cache like the app's own (every message
+is distinct, so each one is still generated); --bypass-cache skips it.
+Any chat answered with the fallback reply also makes the run exit 1.
+
+Nothing leaves the machine: Supabase points at a closed local port and the
+semantic index is off unless SEMANTIC_SEARCH_ENABLED is set. Other backend
+settings (OLLAMA_MAX_CONCURRENT_PER_MODEL, OLLAMA_MAX_QUEUE_DEPTH, ...) are
+taken from the environment as usual.
+"""
+import argparse
+import asyncio
+import contextlib
+import importlib
+import itertools
+import json
+import logging
+import os
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional
+
+import httpx
+import psutil
+
+from benchmarks.fake_ollama import FakeOllama
+from benchmarks.stats import find_regressions, latency_summary, ms, percentile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS chat_history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id TEXT NOT NULL,
+    message TEXT NOT NULL,
+    timestamp TEXT DEFAULT CURRENT_TIMESTAMP,
+    is_ai BOOLEAN DEFAULT FALSE
+);
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id TEXT NOT NULL,
+    title TEXT NOT NULL,
+    task_date TEXT,
+    task_time TEXT,
+    completed BOOLEAN DEFAULT FALSE,
+    failed BOOLEAN DEFAULT FALSE,
+    task_type TEXT,
+    urgency_level INTEGER
+);
+CREATE TABLE IF NOT EXISTS calendar_events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id TEXT NOT NULL,
+    title TEXT NOT NULL,
+    event_date TEXT,
+    event_time TEXT,
+    type TEXT,
+    description TEXT
+);
+CREATE TABLE IF NOT EXISTS diary_entries (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id TEXT NOT NULL,
+    entry_date TEXT,
+    title TEXT,
+    content TEXT,
+    mood TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_chat_history_user_id ON chat_history(user_id);
+CREATE INDEX IF NOT EXISTS idx_tasks_user_id ON tasks(user_id);
+CREATE INDEX IF NOT EXISTS idx_calendar_user_id ON calendar_events(user_id);
+CREATE INDEX IF NOT EXISTS idx_diary_user_id ON diary_entries(user_id);
+"""
+
+# Compared against --baseline; throughput regresses downwards, the rest upwards
+REGRESSION_METRICS = {"throughput": -1, "p50": 1, "p95": 1, "p99": 1, "context_p95": 1}
+
+def seed_database(path: str, users: int, history: int):
+    """One user per simulated client, each with chat history and a day of tasks, events and diary"""
+    today = date.today()
+    with contextlib.closing(sqlite3.connect(path)) as conn:
+        conn.executescript(SCHEMA)
+        for index in range(users):
+            user_id = f"bench-user-{index}"
+            conn.executemany(
+                "INSERT INTO chat_history (user_id, message, timestamp, is_ai) VALUES (?, ?, ?, ?)",
+                [
+                    (user_id, f"Message {turn} about planning the week and staying on top of work", f"{today} 08:{turn % 60:02d}:{turn // 60:02d}", turn % 2)
+                    for turn in range(history)
+                ]
+            )
+            conn.executemany(
+                "INSERT INTO tasks (user_id, title, task_date, task_time, completed, task_type, urgency_level) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(user_id, f"Task {n}", today.isoformat(), f"{9 + n:02d}:00", n % 2, "daily", n % 4) for n in range(5)]
+            )
+            conn.executemany(
+                "INSERT INTO calendar_events (user_id, title, event_date, event_time, type, description) VALUES (?, ?, ?, ?, ?, ?)",
+                [(user_id, f"Event {n}", today.isoformat(), f"{13 + n:02d}:30", "meeting", "Weekly sync") for n in range(3)]
+            )
+            conn.executemany(
+                "INSERT INTO diary_entries (user_id, entry_date, title, content, mood) VALUES (?, ?, ?, ?, ?)",
+                [(user_id, (today - timedelta(days=n)).isoformat(), f"Day {n}", "Productive day with a few meetings. " * 10, "good") for n in range(5)]
+            )
+        conn.commit()
+
+async def _sample_rss(process: psutil.Process, peak: List[int], stop: asyncio.Event):
+    while not stop.is_set():
+        peak[0] = max(peak[0], process.memory_info().rss)
+        try:
+            await asyncio.wait_for(stop.wait(), 0.05)
+        except asyncio.TimeoutError:
+            pass
+
+# Numbers every chat so no two messages in a run match in the response cache
+_request_ids = itertools.count()
+
+async def run_level(
+    client: httpx.AsyncClient,
+    users: int,
+    requests_per_user: int,
+    model: Optional[str],
+    bypass_cache: bool = False
+) -> Dict[str, Any]:
+    """`users` clients each sending `requests_per_user` chats back to back"""
+    latencies: List[float] = []
+    context_seconds: List[float] = []
+    outcomes: Dict[str, int] = {}
+
+    async def user(index: int):
+        for turn in range(requests_per_user):
+            body = {
+                "user_id": f"bench-user-{index}",
+                "message": f"What should I focus on next? (request {next(_request_ids)})",
+                "bypass_cache": bypass_cache
+            }
+            if model:
+                body["model"] = model
+            start = time.perf_counter()
+            try:
+                response = await client.post("/api/v1/chat/", json=body)
+                elapsed = time.perf_counter() - start
+                if response.status_code != 200:
+                    outcome = f"http_{response.status_code}"
+                else:
+                    data = response.json()
+                    if not data["success"] or data["fallback_used"]:
+                        outcome = "fallback"
+                    else:
+                        outcome = "cached" if data["cached"] else "ok"
+                    if data.get("context_timings"):
+                        context_seconds.append(data["context_timings"]["total"])
+            except httpx.HTTPError as e:
+                elapsed = time.perf_counter() - start
+                outcome = type(e).__name__
+            outcomes[outcome] = outcomes.get(outcome, 0) + 1
+            if outcome == "ok":
+                latencies.append(elapsed)
+
+    process = psutil.Process()
+    peak = [process.memory_info().rss]
+    rss_before = peak[0]
+    stop = asyncio.Event()
+    sampler = asyncio.create_task(_sample_rss(process, peak, stop))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(user(index) for index in range(users)))
+    wall = time.perf_counter() - start
+    stop.set()
+    await sampler
+
+    return {
+        "users": users,
+        "requests": users * requests_per_user,
+        "outcomes": outcomes,
+        "wall_seconds": round(wall, 3),
+        "throughput": round(len(latencies) / wall, 2) if wall else 0.0,
+        **latency_summary(latencies),
+        "context_mean": ms(statistics.fmean(context_seconds)) if context_seconds else None,
+        "context_p95": ms(percentile(context_seconds, 95)),
+        "rss_mb": round(rss_before / 2 ** 20, 1),
+        "peak_rss_mb": round(peak[0] / 2 ** 20, 1)
+    }
+
+def print_table(results: List[Dict[str, Any]]):
+    header = f"{'users':>5} {'reqs':>5} {'ok':>5} {'req/s':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'ctx ms':>7} {'ctx p95':>7} {'peak MB':>8}  other"
+    print(header)
+    print("-" * len(header))
+    for row in results:
+        other = ", ".join(f"{name}={count}" for name, count in sorted(row["outcomes"].items()) if name != "ok")
+        print(
+            f"{row['users']:>5} {row['requests']:>5} {row['outcomes'].get('ok', 0):>5} {row['throughput']:>7} "
+            f"{row['p50'] or '-':>8} {row['p95'] or '-':>8} {row['p99'] or '-':>8} "
+            f"{row['context_mean'] or '-':>7} {row['context_p95'] or '-':>7} {row['peak_rss_mb']:>8}  {other}"
+        )
+
+async def run(args) -> List[Dict[str, Any]]:
+    async with FakeOllama(
+        token_latency=args.token_latency,
+        prompt_latency=args.prompt_latency,
+        load_latency=args.load_latency,
+        reply_tokens=args.reply_tokens,
+        parallel=args.parallel
+    ) as fake_ollama:
+        os.environ["OLLAMA_URL"] = fake_ollama.url
+        sys.path.insert(0, BACKEND_DIR)
+        backend = importlib.import_module("main")  # Settings read the environment at import
+
+        quiet = open(os.devnull, "w") if not args.verbose else None
+        if quiet:
+            logging.getLogger("httpx").setLevel(logging.WARNING)
+        with contextlib.redirect_stdout(quiet) if quiet else contextlib.nullcontext():
+            async with backend.lifespan(backend.app):
+                transport = httpx.ASGITransport(app=backend.app)
+                async with httpx.AsyncClient(transport=transport, base_url="http://wingman", timeout=None) as client:
+                    # Load the model and warm the SQLite pool before measuring
+                    await run_level(client, 1, 1, args.model, args.bypass_cache)
+                    results = []
+                    for users in args.users:
+                        result = await run_level(client, users, args.requests, args.model, args.bypass_cache)
+                        results.append(result)
+                        if quiet:
+                            print(f"{users} users done in {result['wall_seconds']}s", file=sys.stderr)
+        if quiet:
+            quiet.close()
+        return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark POST /api/v1/chat/ against a fake Ollama")
+    parser.add_argument("--users", default="1,2,4,8,16,32,64", help="comma-separated concurrency levels")
+    parser.add_argument("--requests", type=int, default=4, help="chats per user at each level")
+    parser.add_argument("--model", default="llama3.2:1b", help="model to request; 'auto' lets the backend choose")
+    parser.add_argument("--history", type=int, default=40, help="chat history rows seeded per user")
+    parser.add_argument("--token-latency", type=float, default=0.005, help="fake Ollama seconds per generated token")
+    parser.add_argument("--prompt-latency", type=float, default=0.0001, help="fake Ollama seconds per prompt token")
+    parser.add_argument("--load-latency", type=float, default=0.2, help="fake Ollama model load time")
+    parser.add_argument("--reply-tokens", type=int, default=32, help="tokens per fake reply")
+    parser.add_argument("--parallel", type=int, default=1, help="fake Ollama concurrent generations per model")
+    parser.add_argument("--bypass-cache", action="store_true", help="send bypass_cache so requests skip the response cache")
+    parser.add_argument("--json", help="write the results to this file")
+    parser.add_argument("--baseline", help="results file from an earlier run to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown against --baseline (0.2 = 20%%)")
+    parser.add_argument("--verbose", action="store_true", help="keep the backend's own logging")
+    args = parser.parse_args()
+    args.users = [int(value) for value in args.users.split(",") if value.strip()]
+    args.model = None if args.model == "auto" else args.model
+    output = os.path.abspath(args.json) if args.json else None
+    baseline = os.path.abspath(args.baseline) if args.baseline else None
+
+    workdir = tempfile.mkdtemp(prefix="wingman-bench-")
+    db_dir = os.path.join(workdir, "wingman-data")
+    os.makedirs(db_dir)
+    seed_database(os.path.join(db_dir, "wingman.db"), max(args.users), args.history)
+
+    # The context builder looks for ~/wingman-data/wingman.db
+    os.environ["HOME"] = os.environ["USERPROFILE"] = workdir
+    os.environ["SUPABASE_URL"] = "http://127.0.0.1:9"
+    os.environ["SUPABASE_KEY"] = "benchmark"
+    os.environ.setdefault("SEMANTIC_SEARCH_ENABLED", "False")
+    os.chdir(workdir)
+
+    try:
+        results = asyncio.run(run(args))
+    finally:
+        os.chdir(BACKEND_DIR)
+        shutil.rmtree(workdir, ignore_errors=True)
+    print_table(results)
+
+    failed = sum(row["outcomes"].get("fallback", 0) for row in results)
+    if failed:
+        # A fallback reply means the chat path broke, not that it was slow
+        print(f"\n{failed} chats answered with the fallback response (success=false)", file=sys.stderr)
+
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump({"settings": {k: v for k, v in vars(args).items() if k not in ("json", "baseline")}, "results": results}, f, indent=2)
+
+    if baseline:
+        with open(baseline, "r", encoding="utf-8") as f:
+            regressions = find_regressions(results, json.load(f)["results"], "users", REGRESSION_METRICS, args.tolerance)
+        if regressions:
+            print("\nRegressions against " + baseline + ":")
+            for line in regressions:
+                print("  " + line)
+            sys.exit(1)
+        print(f"\nNo regressions beyond {args.tolerance:.0%} against {baseline}")
+
+    if failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,261 @@
+"""
+Load test of the task, calendar, diary and login endpoints against the
+SQLite-backed fake PostgREST, so data-path changes can be measured offline.
+
+The fake runs in its own thread with the chosen network latency; the
+routers run in process behind httpx's ASGI transport, going through the
+real pooled PostgREST client. Each scenario has `--concurrency` users
+repeating a cycle for `--iterations` rounds:
+
+    tasks     POST /tasks, GET /tasks, GET /tasks/range, PUT /tasks/{id}, DELETE /tasks/{id}
+    calendar  POST /calendar, GET /calendar, GET /calendar/range, PUT /calendar/{id}, DELETE /calendar/{id}
+    diary     POST /diary/entries, GET /diary, GET /diary/entries, PUT /diary/entries/{id}, DELETE /diary/entries/{id}
+    login     POST /user/login
+
+and every endpoint gets its requests per second and p50/p95/p99/max
+latency. Run from Wingman-backend:
+
+    python -m benchmarks.crud_load_test --latency 0.03 --jitter 0.01 --concurrency 32
+    python -m benchmarks.crud_load_test --json crud.json
+    python -m benchmarks.crud_load_test --baseline crud.json  # exits 1 on regression
+"""
+import argparse
+import asyncio
+import contextlib
+import importlib
+import json
+import logging
+import os
+import sys
+import time
+from datetime import date, timedelta
+from typing import Any, Awaitable, Callable, Dict, List
+
+import httpx
+
+from benchmarks.fake_postgrest import FakePostgrest
+from benchmarks.stats import find_regressions, latency_summary
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+API = "/api/v1"
+
+SCENARIOS = ("tasks", "calendar", "diary", "login")
+
+# Compared against --baseline; throughput regresses downwards, the rest upwards
+REGRESSION_METRICS = {"rps": -1, "p50": 1, "p95": 1, "p99": 1}
+
+def seed(fake: FakePostgrest, users: int, rows_per_user: int):
+    """Users to log in as, and some existing rows so reads return real pages"""
+    today = date.today()
+    fake.insert_rows("users", [
+        {"id": f"bench-user-{index}", "username": f"bench{index}", "email": f"bench{index}@example.com", "password": f"password{index}"}
+        for index in range(users)
+    ])
+    for index in range(users):
+        user_id = f"bench-user-{index}"
+        days = [(today + timedelta(days=n % 14)).isoformat() for n in range(rows_per_user)]
+        fake.insert_rows("tasks", [
+            {"user_id": user_id, "title": f"Seeded task {n}", "task_date": day, "task_time": "09:00", "completed": n % 3 == 0}
+            for n, day in enumerate(days)
+        ])
+        fake.insert_rows("calendar_events", [
+            {"user_id": user_id, "title": f"Seeded event {n}", "event_date": day, "event_time": "14:00", "type": "meeting"}
+            for n, day in enumerate(days)
+        ])
+        fake.insert_rows("diary_entries", [
+            {"user_id": user_id, "entry_date": day, "title": f"Seeded entry {n}", "content": "Notes from the day. " * 20, "mood": "neutral"}
+            for n, day in enumerate(days)
+        ])
+
+def build_app():
+    """The task, calendar, diary and user routers as main.py mounts them, without the chat services"""
+    from fastapi import FastAPI
+    from app.api.v1.endpoints import calendar, diary, task, user
+    from app.core.responses import CustomJSONResponse
+
+    app = FastAPI(default_response_class=CustomJSONResponse)
+    app.include_router(user.router, prefix=API)
+    app.include_router(task.router, prefix=API)
+    app.include_router(calendar.router, prefix=API)
+    app.include_router(diary.router, prefix=API)
+    return app
+
+class Recorder:
+    """Per-endpoint latencies and failures for one scenario"""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+
+    async def call(self, label: str, request: Awaitable[httpx.Response]) -> httpx.Response:
+        start = time.perf_counter()
+        response = await request
+        elapsed = time.perf_counter() - start
+        self.latencies.setdefault(label, [])
+        if response.status_code >= 400:
+            self.errors[label] = self.errors.get(label, 0) + 1
+        else:
+            self.latencies[label].append(elapsed)
+        return response
+
+async def tasks_cycle(client: httpx.AsyncClient, record: Recorder, user_id: str, turn: int):
+    today = date.today().isoformat()
+    created = await record.call("POST /tasks", client.post(f"{API}/tasks", json={
+        "title": f"Load test task {turn}", "task_date": today, "task_time": "10:00", "user_id": user_id
+    }))
+    await record.call("GET /tasks", client.get(f"{API}/tasks", params={"date": today, "user_id": user_id}))
+    await record.call("GET /tasks/range", client.get(f"{API}/tasks/range", params={
+        "start": today, "end": (date.today() + timedelta(days=7)).isoformat(), "user_id": user_id, "limit": 100
+    }))
+    task_id = created.json().get("id") if created.status_code == 200 else None
+    if task_id:
+        await record.call("PUT /tasks/{id}", client.put(f"{API}/tasks/{task_id}", json={"completed": True}))
+        await record.call("DELETE /tasks/{id}", client.delete(f"{API}/tasks/{task_id}"))
+
+async def calendar_cycle(client: httpx.AsyncClient, record: Recorder, user_id: str, turn: int):
+    today = date.today().isoformat()
+    created = await record.call("POST /calendar", client.post(f"{API}/calendar", json={
+        "title": f"Load test event {turn}", "date": today, "time": "15:00", "type": "meeting", "user_id": user_id
+    }))
+    await record.call("GET /calendar", client.get(f"{API}/calendar", params={"date": today, "user_id": user_id}))
+    await record.call("GET /calendar/range", client.get(f"{API}/calendar/range", params={
+        "start": today, "end": (date.today() + timedelta(days=30)).isoformat(), "user_id": user_id, "limit": 100
+    }))
+    event_id = created.json().get("id") if created.status_code == 200 else None
+    if event_id:
+        await record.call("PUT /calendar/{id}", client.put(f"{API}/calendar/{event_id}", json={"description": "Moved"}))
+        await record.call("DELETE /calendar/{id}", client.delete(f"{API}/calendar/{event_id}"))
+
+async def diary_cycle(client: httpx.AsyncClient, record: Recorder, user_id: str, turn: int):
+    entry = {"title": f"Load test entry {turn}", "content": "Wrote some notes. " * 20, "mood": "happy", "date": date.today().isoformat(), "user_id": user_id}
+    created = await record.call("POST /diary/entries", client.post(f"{API}/diary/entries", json=entry))
+    await record.call("GET /diary", client.get(f"{API}/diary", params={"user_id": user_id}))
+    await record.call("GET /diary/entries", client.get(f"{API}/diary/entries", params={
+        "user_id": user_id, "fields": "id,title,entry_date,mood", "limit": 20
+    }))
+    entry_id = created.json().get("id") if created.status_code == 200 else None
+    if entry_id:
+        await record.call("PUT /diary/entries/{id}", client.put(f"{API}/diary/entries/{entry_id}", json={**entry, "mood": "neutral"}))
+        await record.call("DELETE /diary/entries/{id}", client.delete(f"{API}/diary/entries/{entry_id}"))
+
+async def login_cycle(client: httpx.AsyncClient, record: Recorder, user_id: str, turn: int):
+    index = user_id.rsplit("-", 1)[1]
+    await record.call("POST /user/login", client.post(f"{API}/user/login", json={
+        "username": f"bench{index}", "password": f"password{index}"
+    }))
+
+CYCLES: Dict[str, Callable[..., Awaitable[None]]] = {
+    "tasks": tasks_cycle,
+    "calendar": calendar_cycle,
+    "diary": diary_cycle,
+    "login": login_cycle
+}
+
+async def run_scenario(client: httpx.AsyncClient, scenario: str, concurrency: int, iterations: int) -> List[Dict[str, Any]]:
+    """`concurrency` users each running the scenario's cycle `iterations` times"""
+    record = Recorder()
+    cycle = CYCLES[scenario]
+
+    async def user(index: int):
+        for turn in range(iterations):
+            await cycle(client, record, f"bench-user-{index}", turn)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(user(index) for index in range(concurrency)))
+    wall = time.perf_counter() - start
+
+    return [
+        {
+            "scenario": scenario,
+            "endpoint": label,
+            "requests": len(latencies) + record.errors.get(label, 0),
+            "errors": record.errors.get(label, 0),
+            "rps": round(len(latencies) / wall, 1) if wall else 0.0,
+            **latency_summary(latencies)
+        }
+        for label, latencies in record.latencies.items()
+    ]
+
+def print_table(results: List[Dict[str, Any]]):
+    header = f"{'endpoint':<26} {'reqs':>6} {'errors':>6} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}"
+    print(header)
+    print("-" * len(header))
+    for row in results:
+        print(
+            f"{row['endpoint']:<26} {row['requests']:>6} {row['errors']:>6} {row['rps']:>8} "
+            f"{row['p50'] or '-':>8} {row['p95'] or '-':>8} {row['p99'] or '-':>8} {row['max'] or '-':>8}"
+        )
+
+async def run(args) -> List[Dict[str, Any]]:
+    sys.path.insert(0, BACKEND_DIR)
+    supabase = importlib.import_module("app.core.supabase")  # Settings read the environment at import
+    app = build_app()
+
+    results = []
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://wingman", timeout=None) as client:
+            # Open the PostgREST connections and fill the user cache before measuring
+            await run_scenario(client, "login", args.concurrency, 1)
+            for scenario in args.scenarios:
+                rows = await run_scenario(client, scenario, args.concurrency, args.iterations)
+                results.extend(rows)
+                print(f"{scenario} done: {sum(row['requests'] for row in rows)} requests", file=sys.stderr)
+    finally:
+        await supabase.close_async_supabase_client()
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test /tasks, /calendar, /diary and /user/login against a fake PostgREST")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="comma-separated subset of " + ", ".join(SCENARIOS))
+    parser.add_argument("--concurrency", type=int, default=16, help="simultaneous users")
+    parser.add_argument("--iterations", type=int, default=20, help="cycles per user in each scenario")
+    parser.add_argument("--latency", type=float, default=0.02, help="fake PostgREST seconds per request")
+    parser.add_argument("--jitter", type=float, default=0.005, help="up to this many extra seconds per request")
+    parser.add_argument("--rows", type=int, default=30, help="seeded tasks, events and diary entries per user")
+    parser.add_argument("--json", help="write the results to this file")
+    parser.add_argument("--baseline", help="results file from an earlier run to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown against --baseline (0.2 = 20%%)")
+    parser.add_argument("--verbose", action="store_true", help="keep the backend's own logging")
+    args = parser.parse_args()
+    args.scenarios = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = [name for name in args.scenarios if name not in CYCLES]
+    if unknown:
+        parser.error(f"unknown scenario {', '.join(unknown)}; choose from {', '.join(SCENARIOS)}")
+
+    fake = FakePostgrest(latency=args.latency, jitter=args.jitter, seed=0)
+    seed(fake, args.concurrency, args.rows)
+    fake.start_in_thread()
+
+    os.environ["SUPABASE_URL"] = fake.url
+    os.environ["SUPABASE_KEY"] = "benchmark"
+    if not args.verbose:
+        logging.disable(logging.INFO)
+
+    quiet = open(os.devnull, "w") if not args.verbose else None
+    try:
+        with contextlib.redirect_stdout(quiet) if quiet else contextlib.nullcontext():
+            results = asyncio.run(run(args))
+    finally:
+        fake.stop_thread()
+        if quiet:
+            quiet.close()
+    print_table(results)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"settings": {k: v for k, v in vars(args).items() if k not in ("json", "baseline")}, "results": results}, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            regressions = find_regressions(results, json.load(f)["results"], "endpoint", REGRESSION_METRICS, args.tolerance)
+        if regressions:
+            print("\nRegressions against " + args.baseline + ":")
+            for line in regressions:
+                print("  " + line)
+            sys.exit(1)
+        print(f"\nNo regressions beyond {args.tolerance:.0%} against {args.baseline}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+"""
+Local stand-in for the Ollama HTTP API with configurable timings, so the chat
+path can be benchmarked offline and reproducibly.
+
+Serves /api/tags, /api/ps, /api/generate, /api/chat and /api/delete over a
+real socket (blocking and NDJSON streaming replies, keep-alive connections)
+and reports the same load/prompt/eval counters as Ollama on the final chunk.
+Each model answers `parallel` requests at a time like OLLAMA_NUM_PARALLEL.
+Run it on its own to point a backend at it:
+
+    python -m benchmarks.fake_ollama --port 11435 --token-latency 0.02
+"""
+import argparse
+import asyncio
+import json
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from benchmarks.local_server import LocalHTTPServer, Request
+
+NS_PER_SECOND = 1_000_000_000
+GB = 1024 ** 3
+
+DEFAULT_MODELS = {"llama3.2:1b": 1.3, "llama3.2:3b": 2.0}
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+def estimate_tokens(text: str) -> int:
+    """Same rough four-characters-per-token rule the backend budgets with"""
+    return max(1, len(text) // 4)
+
+class FakeOllama(LocalHTTPServer):
+    """
+    Speaks enough of the Ollama API for the backend.
+
+    A generation sleeps `load_latency` if its model isn't resident, then
+    `prompt_latency` per prompt token, then emits `reply_tokens` tokens
+    `token_latency` apart.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        token_latency: float = 0.02,
+        prompt_latency: float = 0.0005,
+        load_latency: float = 0.5,
+        reply_tokens: int = 64,
+        parallel: int = 1,
+        models: Optional[Dict[str, float]] = None
+    ):
+        super().__init__(host, port)
+        self.token_latency = token_latency
+        self.prompt_latency = prompt_latency
+        self.load_latency = load_latency
+        self.reply_tokens = reply_tokens
+        self.parallel = parallel
+        self.models = dict(models or DEFAULT_MODELS)  # name -> size in GB
+        self.resident: Dict[str, float] = {}  # name -> keep-alive expiry (0 = forever)
+        self._slots: Dict[str, asyncio.Semaphore] = {}
+
+    async def handle(self, request: Request, writer: asyncio.StreamWriter):
+        method, path, body = request.method, request.path, request.json() or {}
+        self._expire_resident()
+        if path == "/api/tags" and method == "GET":
+            await self.send_json(writer, {"models": self._tags()})
+        elif path == "/api/ps" and method == "GET":
+            await self.send_json(writer, {"models": self._ps()})
+        elif path in ("/api/generate", "/api/chat") and method == "POST":
+            await self._generation(path, body, writer)
+        elif path == "/api/delete" and method == "DELETE":
+            found = self.models.pop(body.get("model") or body.get("name"), None) is not None
+            await self.send_json(writer, {} if found else {"error": "model not found"}, 200 if found else 404)
+        elif path.startswith("/api/"):
+            await self.send_json(writer, {"error": f"{method} {path} not supported"}, 405)
+        else:
+            await self.send_json(writer, {"error": "not found"}, 404)
+
+    # Ollama API
+
+    def _tags(self) -> List[Dict[str, Any]]:
+        return [
+            {"name": name, "model": name, "size": int(size_gb * GB), "modified_at": _now()}
+            for name, size_gb in self.models.items()
+        ]
+
+    def _ps(self) -> List[Dict[str, Any]]:
+        return [
+            {"name": name, "model": name, "size": int(self.models.get(name, 0) * GB), "expires_at": _now()}
+            for name in self.resident
+        ]
+
+    def _expire_resident(self):
+        now = time.monotonic()
+        for name, expires in list(self.resident.items()):
+            if expires and expires < now:
+                del self.resident[name]
+
+    def _keep(self, model: str, keep_alive: Any):
+        """Apply a request's keep_alive: 0 unloads, a duration or -1 keeps the model resident"""
+        if keep_alive in (0, "0", "0s", "0m"):
+            self.resident.pop(model, None)
+            return
+        seconds = 0.0
+        if isinstance(keep_alive, str) and keep_alive[-1:] in ("s", "m", "h"):
+            seconds = float(keep_alive[:-1]) * {"s": 1, "m": 60, "h": 3600}[keep_alive[-1]]
+        elif isinstance(keep_alive, (int, float)) and keep_alive > 0:
+            seconds = float(keep_alive)
+        self.resident[model] = time.monotonic() + seconds if seconds else 0
+
+    async def _generation(self, path: str, body: Dict[str, Any], writer: asyncio.StreamWriter):
+        model = body.get("model", "")
+        if model not in self.models:
+            await self.send_json(writer, {"error": f"model '{model}' not found"}, 404)
+            return
+
+        is_chat = path == "/api/chat"
+        if is_chat:
+            prompt = "".join(message.get("content", "") for message in body.get("messages", []))
+        else:
+            prompt = body.get("prompt", "")
+        stream = body.get("stream", True)
+        keep_alive = body.get("keep_alive", "5m")
+        num_predict = (body.get("options") or {}).get("num_predict", -1)
+        reply_tokens = self.reply_tokens if num_predict is None or num_predict < 0 else min(num_predict, self.reply_tokens)
+
+        slots = self._slots.setdefault(model, asyncio.Semaphore(self.parallel))
+        async with slots:
+            start = time.perf_counter()
+            load_seconds = 0.0
+            if model not in self.resident:
+                await asyncio.sleep(self.load_latency)
+                load_seconds = time.perf_counter() - start
+            self._keep(model, keep_alive)
+
+            if not prompt:
+                # Empty prompt: just load (or with keep_alive 0, unload) the model
+                done = {"model": model, "created_at": _now(), "done": True, "done_reason": "load" if model in self.resident else "unload"}
+                done.update({"message": {"role": "assistant", "content": ""}} if is_chat else {"response": ""})
+                await self.send_json(writer, done)
+                return
+
+            prompt_tokens = estimate_tokens(prompt)
+            prompt_start = time.perf_counter()
+            await asyncio.sleep(prompt_tokens * self.prompt_latency)
+            prompt_seconds = time.perf_counter() - prompt_start
+
+            if stream:
+                await self.start_stream(writer, "application/x-ndjson")
+            eval_start = time.perf_counter()
+            pieces = []
+            for index in range(reply_tokens):
+                await asyncio.sleep(self.token_latency)
+                piece = f"tok{index} "
+                pieces.append(piece)
+                if stream:
+                    chunk = {"model": model, "created_at": _now(), "done": False}
+                    chunk.update({"message": {"role": "assistant", "content": piece}} if is_chat else {"response": piece})
+                    await self.send_chunk(writer, json.dumps(chunk).encode() + b"\n")
+            eval_seconds = time.perf_counter() - eval_start
+
+            final = {
+                "model": model,
+                "created_at": _now(),
+                "done": True,
+                "done_reason": "stop",
+                "total_duration": int((time.perf_counter() - start) * NS_PER_SECOND),
+                "load_duration": int(load_seconds * NS_PER_SECOND),
+                "prompt_eval_count": prompt_tokens,
+                "prompt_eval_duration": int(prompt_seconds * NS_PER_SECOND),
+                "eval_count": reply_tokens,
+                "eval_duration": int(eval_seconds * NS_PER_SECOND)
+            }
+            text = "" if stream else "".join(pieces)
+            final.update({"message": {"role": "assistant", "content": text}} if is_chat else {"response": text})
+            if stream:
+                await self.send_chunk(writer, json.dumps(final).encode() + b"\n")
+                await self.send_chunk(writer, None)
+            else:
+                await self.send_json(writer, final)
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake Ollama server with configurable token latency")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11435)
+    parser.add_argument("--token-latency", type=float, default=0.02, help="seconds between generated tokens")
+    parser.add_argument("--prompt-latency", type=float, default=0.0005, help="seconds per prompt token")
+    parser.add_argument("--load-latency", type=float, default=0.5, help="seconds to load a model that isn't resident")
+    parser.add_argument("--reply-tokens", type=int, default=64, help="tokens per reply")
+    parser.add_argument("--parallel", type=int, default=1, help="concurrent generations per model")
+    args = parser.parse_args()
+
+    async def serve():
+        server = FakeOllama(
+            args.host, args.port, args.token_latency, args.prompt_latency,
+            args.load_latency, args.reply_tokens, args.parallel
+        )
+        await server.start()
+        print(f"Fake Ollama listening on {server.url} with models {', '.join(server.models)}")
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await server.stop()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
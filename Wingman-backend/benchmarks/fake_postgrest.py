@@ -0,0 +1,430 @@
+"""
+Local PostgREST stand-in backed by SQLite, so the task, calendar, diary and
+user services can be exercised and load-tested without Supabase.
+
+Implements the subset of the PostgREST API that postgrest-py produces for
+this backend: /rest/v1/<table> with select, column filters (eq, neq, gt,
+gte, lt, lte, like, ilike, is, in, not.*), or=() with nested and(), order,
+limit, offset, inserts and upserts (Prefer: resolution=...), PATCH and
+DELETE with Prefer: return=representation, and PostgREST-shaped errors.
+Every request waits `latency` seconds plus up to `jitter` more before it
+is answered, standing in for the network round trip to Supabase.
+
+    python -m benchmarks.fake_postgrest --port 54321 --latency 0.03
+    SUPABASE_URL=http://127.0.0.1:54321 SUPABASE_KEY=local uvicorn main:app
+"""
+import argparse
+import asyncio
+import json
+import random
+import re
+import sqlite3
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from benchmarks.local_server import LocalHTTPServer, Request
+
+REST_PREFIX = "/rest/v1/"
+
+TIMESTAMP_DEFAULT = "(strftime('%Y-%m-%dT%H:%M:%fZ', 'now'))"
+
+# The Supabase tables the backend reads and writes
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS users (
+    id TEXT PRIMARY KEY,
+    username TEXT UNIQUE NOT NULL,
+    email TEXT UNIQUE NOT NULL,
+    password TEXT NOT NULL,
+    name TEXT,
+    created_at TEXT DEFAULT {TIMESTAMP_DEFAULT},
+    updated_at TEXT DEFAULT {TIMESTAMP_DEFAULT}
+);
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id TEXT NOT NULL REFERENCES users(id),
+    title TEXT NOT NULL,
+    task_date TEXT,
+    task_time TEXT,
+    completed BOOLEAN DEFAULT FALSE,
+    failed BOOLEAN DEFAULT FALSE,
+    task_type TEXT,
+    due_date TEXT,
+    last_reset_date TEXT,
+    urgency_level INTEGER,
+    status TEXT,
+    created_at TEXT DEFAULT {TIMESTAMP_DEFAULT},
+    updated_at TEXT DEFAULT {TIMESTAMP_DEFAULT}
+);
+CREATE TABLE IF NOT EXISTS calendar_events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id TEXT NOT NULL REFERENCES users(id),
+    title TEXT NOT NULL,
+    event_date TEXT,
+    event_time TEXT,
+    type TEXT,
+    description TEXT,
+    created_at TEXT DEFAULT {TIMESTAMP_DEFAULT},
+    updated_at TEXT DEFAULT {TIMESTAMP_DEFAULT}
+);
+CREATE TABLE IF NOT EXISTS diary_entries (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id TEXT NOT NULL REFERENCES users(id),
+    entry_date TEXT,
+    title TEXT,
+    content TEXT,
+    mood TEXT,
+    created_at TEXT DEFAULT {TIMESTAMP_DEFAULT},
+    updated_at TEXT DEFAULT {TIMESTAMP_DEFAULT}
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_user_date ON tasks(user_id, task_date);
+CREATE INDEX IF NOT EXISTS idx_calendar_user_date ON calendar_events(user_id, event_date);
+CREATE INDEX IF NOT EXISTS idx_diary_user_date ON diary_entries(user_id, entry_date);
+"""
+
+COMPARISONS = {"eq": "=", "neq": "<>", "gt": ">", "gte": ">=", "lt": "<", "lte": "<="}
+
+RESERVED_PARAMS = {"select", "order", "limit", "offset", "on_conflict", "columns"}
+
+class PostgrestError(Exception):
+    """Answered as PostgREST's {code, message, details, hint} error body"""
+
+    def __init__(self, status: int, code: str, message: str, details: Optional[str] = None):
+        super().__init__(message)
+        self.status = status
+        self.code = code
+        self.message = message
+        self.details = details
+
+    def body(self) -> Dict[str, Any]:
+        return {"code": self.code, "message": self.message, "details": self.details, "hint": None}
+
+def _split_top_level(text: str) -> List[str]:
+    """Split on commas outside parentheses and double quotes"""
+    parts, depth, quoted, current = [], 0, False, []
+    for char in text:
+        if char == '"':
+            quoted = not quoted
+        elif not quoted and char == "(":
+            depth += 1
+        elif not quoted and char == ")":
+            depth -= 1
+        if char == "," and depth == 0 and not quoted:
+            parts.append("".join(current))
+            current = []
+        else:
+            current.append(char)
+    if current:
+        parts.append("".join(current))
+    return parts
+
+def _unquote(value: str) -> str:
+    if len(value) >= 2 and value[0] == value[-1] == '"':
+        return value[1:-1].replace('\\"', '"').replace("\\\\", "\\")
+    return value
+
+class FakePostgrest(LocalHTTPServer):
+    """
+    SQLite-backed PostgREST subset with injectable latency.
+
+    `db_path` defaults to an in-memory database; seed it with `insert_rows`
+    before serving. All SQL runs on the server's own event loop, so start
+    it with start_in_thread() when it shares a process with the app.
+    """
+
+    def __init__(
+        self,
+        db_path: str = ":memory:",
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        seed: Optional[int] = None
+    ):
+        super().__init__(host, port)
+        self.latency = latency
+        self.jitter = jitter
+        self._random = random.Random(seed)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.executescript(SCHEMA)
+        self.columns = self._load_columns()
+
+    def _load_columns(self) -> Dict[str, Dict[str, str]]:
+        """{table: {column: declared type}} so filters and output can treat booleans like Postgres"""
+        tables = [row[0] for row in self.conn.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'")]
+        return {
+            table: {row["name"]: (row["type"] or "").upper() for row in self.conn.execute(f'PRAGMA table_info("{table}")')}
+            for table in tables
+        }
+
+    def insert_rows(self, table: str, rows: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Seed rows directly, without latency; returns them as PostgREST would"""
+        return self._transaction(lambda: [self._insert_one(table, row, upsert=None, conflict=[]) for row in rows])
+
+    # Request handling
+
+    async def handle(self, request: Request, writer: asyncio.StreamWriter):
+        delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        if not request.path.startswith(REST_PREFIX):
+            await self.send_json(writer, PostgrestError(404, "PGRST000", f"{request.path} not found").body(), 404)
+            return
+        try:
+            status, data, headers = self._dispatch(request)
+        except PostgrestError as e:
+            await self.send_json(writer, e.body(), e.status)
+            return
+        except sqlite3.IntegrityError as e:
+            error = self._integrity_error(e)
+            await self.send_json(writer, error.body(), error.status)
+            return
+        await self.send_json(writer, data, status, headers)
+
+    def _dispatch(self, request: Request) -> Tuple[int, Any, Dict[str, str]]:
+        table = request.path[len(REST_PREFIX):].strip("/")
+        if table not in self.columns:
+            raise PostgrestError(404, "42P01", f'relation "public.{table}" does not exist')
+
+        params: Dict[str, str] = {}
+        filters: List[Tuple[str, str]] = []
+        for name, value in request.query:
+            if name in RESERVED_PARAMS:
+                params[name] = value
+            else:
+                filters.append((name, value))
+        where, args = self._where(table, filters)
+        prefer = {
+            key.strip(): value.strip()
+            for key, _, value in (item.partition("=") for item in request.headers.get("prefer", "").split(","))
+            if key.strip()
+        }
+        representation = prefer.get("return", "minimal" if request.method != "GET" else "representation") == "representation"
+
+        if request.method in ("GET", "HEAD"):
+            rows = self._select(table, params, where, args)
+            headers = {}
+            if prefer.get("count"):
+                total = self.conn.execute(f'SELECT COUNT(*) FROM "{table}" WHERE {where}', args).fetchone()[0]
+                first = int(params.get("offset") or 0)
+                headers["Content-Range"] = f"{first}-{first + len(rows) - 1}/{total}" if rows else f"*/{total}"
+            return 200, rows if request.method == "GET" else None, headers
+
+        body = request.json()
+        if request.method == "POST":
+            rows = body if isinstance(body, list) else [body]
+            resolution = prefer.get("resolution")
+            upsert = {"merge-duplicates": "merge", "ignore-duplicates": "ignore"}.get(resolution)
+            conflict = [column.strip() for column in params.get("on_conflict", "").split(",") if column.strip()]
+            written = self._transaction(lambda: [self._insert_one(table, row, upsert, conflict) for row in rows])
+            written = [self._select_columns(table, row, params.get("select")) for row in written if row is not None]
+            return 201, written if representation else None, {}
+
+        if request.method == "PATCH":
+            if not isinstance(body, dict) or not body:
+                raise PostgrestError(400, "PGRST102", "Empty or invalid json")
+            columns = self._check_columns(table, body)
+            assignments = ", ".join(f'"{column}" = ?' for column in columns)
+            values = [self._to_sql(body[column]) for column in columns]
+            rows = self._transaction(lambda: [
+                self._row_out(table, row)
+                for row in self.conn.execute(f'UPDATE "{table}" SET {assignments} WHERE {where} RETURNING *', values + args).fetchall()
+            ])
+            if not representation:
+                return 204, None, {}
+            return 200, [self._select_columns(table, row, params.get("select")) for row in rows], {}
+
+        if request.method == "DELETE":
+            rows = self._transaction(lambda: [
+                self._row_out(table, row)
+                for row in self.conn.execute(f'DELETE FROM "{table}" WHERE {where} RETURNING *', args).fetchall()
+            ])
+            if not representation:
+                return 204, None, {}
+            return 200, [self._select_columns(table, row, params.get("select")) for row in rows], {}
+
+        raise PostgrestError(405, "PGRST117", f"Unsupported HTTP method: {request.method}")
+
+    # SQL building
+
+    def _transaction(self, work):
+        """Run work atomically: one bad row rolls back the whole request, as in PostgREST"""
+        self.conn.execute("BEGIN")
+        try:
+            result = work()
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.conn.execute("COMMIT")
+        return result
+
+    def _check_columns(self, table: str, row: Dict[str, Any]) -> List[str]:
+        unknown = [column for column in row if column not in self.columns[table]]
+        if unknown:
+            raise PostgrestError(400, "PGRST204", f"Could not find the '{unknown[0]}' column of '{table}' in the schema cache")
+        return list(row)
+
+    def _column(self, table: str, column: str) -> str:
+        if column not in self.columns[table]:
+            raise PostgrestError(400, "42703", f"column {table}.{column} does not exist")
+        return column
+
+    def _where(self, table: str, filters: List[Tuple[str, str]]) -> Tuple[str, List[Any]]:
+        clauses, args = [], []
+        for name, value in filters:
+            if name in ("or", "and"):
+                clause, clause_args = self._logic(table, name, value)
+            else:
+                clause, clause_args = self._condition(table, name, value)
+            clauses.append(clause)
+            args.extend(clause_args)
+        return " AND ".join(clauses) or "1", args
+
+    def _logic(self, table: str, operator: str, value: str) -> Tuple[str, List[Any]]:
+        """or=(a.eq.1,and(b.gt.2,c.lt.3)) and its nested groups"""
+        if not (value.startswith("(") and value.endswith(")")):
+            raise PostgrestError(400, "PGRST100", f'"failed to parse logic tree ({value})"')
+        clauses, args = [], []
+        for part in _split_top_level(value[1:-1]):
+            match = re.match(r"^(not\.)?(and|or)(\(.*\))$", part)
+            if match:
+                clause, part_args = self._logic(table, match.group(2), match.group(3))
+                if match.group(1):
+                    clause = f"NOT {clause}"
+            else:
+                column, _, condition = part.partition(".")
+                clause, part_args = self._condition(table, column, condition)
+            clauses.append(clause)
+            args.extend(part_args)
+        return "(" + f" {operator.upper()} ".join(clauses) + ")", args
+
+    def _condition(self, table: str, column: str, expression: str) -> Tuple[str, List[Any]]:
+        """One column filter, e.g. task_date=gte.2025-05-01 or id=in.(1,2,3)"""
+        column = self._column(table, column)
+        negate = expression.startswith("not.")
+        if negate:
+            expression = expression[len("not."):]
+        operator, _, raw = expression.partition(".")
+
+        if operator in COMPARISONS:
+            clause, args = f'"{column}" {COMPARISONS[operator]} ?', [self._filter_value(table, column, _unquote(raw))]
+        elif operator in ("like", "ilike"):
+            # PostgREST spells the % wildcard as *; GLOB keeps like case-sensitive
+            pattern = _unquote(raw)
+            if operator == "like":
+                clause, args = f'"{column}" GLOB ?', [pattern.replace("%", "*")]
+            else:
+                clause, args = f'"{column}" LIKE ?', [pattern.replace("*", "%")]
+        elif operator == "is":
+            keyword = {"null": "NULL", "true": "1", "false": "0"}.get(raw.lower())
+            if keyword is None:
+                raise PostgrestError(400, "PGRST100", f'"failed to parse filter (is.{raw})"')
+            # SQLite's IS is null-safe like Postgres' IS TRUE, so not.is.true keeps NULLs
+            clause, args = f'"{column}" IS {keyword}', []
+        elif operator == "in":
+            if not (raw.startswith("(") and raw.endswith(")")):
+                raise PostgrestError(400, "PGRST100", f'"failed to parse filter (in.{raw})"')
+            values = [self._filter_value(table, column, _unquote(item)) for item in _split_top_level(raw[1:-1])]
+            clause, args = f'"{column}" IN ({", ".join("?" for _ in values)})' if values else "0", values
+        else:
+            raise PostgrestError(400, "PGRST100", f'"failed to parse filter ({operator}.{raw})"')
+        return (f"NOT ({clause})" if negate else clause), args
+
+    def _filter_value(self, table: str, column: str, value: str) -> Any:
+        if self.columns[table][column] == "BOOLEAN" and value.lower() in ("true", "false"):
+            return 1 if value.lower() == "true" else 0
+        return value
+
+    def _select(self, table: str, params: Dict[str, str], where: str, args: List[Any]) -> List[Dict[str, Any]]:
+        sql = f'SELECT * FROM "{table}" WHERE {where}'
+        if params.get("order"):
+            terms = []
+            for term in params["order"].split(","):
+                column, *modifiers = term.strip().split(".")
+                direction = "DESC" if "desc" in modifiers else "ASC"
+                nulls = " NULLS FIRST" if "nullsfirst" in modifiers else (" NULLS LAST" if "nullslast" in modifiers else "")
+                terms.append(f'"{self._column(table, column)}" {direction}{nulls}')
+            sql += " ORDER BY " + ", ".join(terms)
+        if params.get("limit") or params.get("offset"):
+            sql += f" LIMIT {int(params.get('limit') or -1)} OFFSET {int(params.get('offset') or 0)}"
+        return [
+            self._select_columns(table, self._row_out(table, row), params.get("select"))
+            for row in self.conn.execute(sql, args).fetchall()
+        ]
+
+    def _select_columns(self, table: str, row: Dict[str, Any], select: Optional[str]) -> Dict[str, Any]:
+        if not select or select.strip() == "*":
+            return row
+        columns = [self._column(table, column.strip()) for column in select.split(",") if column.strip()]
+        return {column: row[column] for column in columns}
+
+    def _insert_one(self, table: str, row: Dict[str, Any], upsert: Optional[str], conflict: List[str]) -> Optional[Dict[str, Any]]:
+        columns = self._check_columns(table, row)
+        if not columns:
+            sql = f'INSERT INTO "{table}" DEFAULT VALUES'
+            values = []
+        else:
+            names = ", ".join(f'"{column}"' for column in columns)
+            sql = f'INSERT INTO "{table}" ({names}) VALUES ({", ".join("?" for _ in columns)})'
+            values = [self._to_sql(row[column]) for column in columns]
+            if upsert:
+                target = ", ".join(f'"{column}"' for column in (conflict or ["id"]))
+                if upsert == "ignore":
+                    sql += f" ON CONFLICT ({target}) DO NOTHING"
+                else:
+                    updates = ", ".join(f'"{column}" = excluded."{column}"' for column in columns)
+                    sql += f" ON CONFLICT ({target}) DO UPDATE SET {updates}"
+        written = self.conn.execute(sql + " RETURNING *", values).fetchone()
+        return self._row_out(table, written) if written is not None else None
+
+    @staticmethod
+    def _to_sql(value: Any) -> Any:
+        if isinstance(value, (dict, list)):
+            return json.dumps(value)
+        return value
+
+    def _row_out(self, table: str, row: sqlite3.Row) -> Dict[str, Any]:
+        types = self.columns[table]
+        return {
+            key: bool(row[key]) if types.get(key) == "BOOLEAN" and row[key] is not None else row[key]
+            for key in row.keys()
+        }
+
+    @staticmethod
+    def _integrity_error(error: sqlite3.IntegrityError) -> PostgrestError:
+        """Map SQLite constraint failures to the Postgres error codes PostgREST would send"""
+        message = str(error)
+        if "UNIQUE" in message:
+            return PostgrestError(409, "23505", "duplicate key value violates unique constraint", message)
+        if "NOT NULL" in message:
+            return PostgrestError(400, "23502", "null value violates not-null constraint", message)
+        if "FOREIGN KEY" in message:
+            return PostgrestError(409, "23503", "insert or update violates foreign key constraint", message)
+        return PostgrestError(400, "23000", message)
+
+def main():
+    parser = argparse.ArgumentParser(description="SQLite-backed fake PostgREST with injectable latency")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=54321)
+    parser.add_argument("--db", default=":memory:", help="SQLite file to keep data in (default: in memory)")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every request")
+    parser.add_argument("--jitter", type=float, default=0.0, help="up to this many extra seconds per request")
+    args = parser.parse_args()
+
+    async def serve():
+        server = FakePostgrest(args.db, args.latency, args.jitter, args.host, args.port)
+        await server.start()
+        print(f"Fake PostgREST listening on {server.url}{REST_PREFIX} (tables: {', '.join(server.columns)})")
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await server.stop()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
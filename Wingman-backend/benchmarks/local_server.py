@@ -0,0 +1,157 @@
+"""
+Bare-bones asyncio HTTP/1.1 server the benchmark fakes are built on: keep-alive
+connections, Content-Length request bodies, JSON and chunked replies. Just
+enough for httpx, with no dependency beyond the standard library.
+"""
+import asyncio
+import json
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl
+
+REASONS = {
+    200: "OK", 201: "Created", 204: "No Content", 400: "Bad Request",
+    404: "Not Found", 405: "Method Not Allowed", 409: "Conflict", 500: "Internal Server Error"
+}
+
+@dataclass
+class Request:
+    method: str
+    path: str
+    query: List[Tuple[str, str]] = field(default_factory=list)  # [(name, value)] in order, names may repeat
+    headers: Dict[str, str] = field(default_factory=dict)  # lower-cased names
+    body: bytes = b""
+
+    def json(self) -> Any:
+        return json.loads(self.body) if self.body else None
+
+class LocalHTTPServer:
+    """Subclasses implement `handle(request, writer)` and answer with the send_* helpers"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self.host = host
+        self.port = port
+        self.requests: Dict[str, int] = {}  # per path, for sanity checks after a run
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.stop()
+
+    def start_in_thread(self):
+        """
+        Serve from a daemon thread with its own event loop, so the fake's own
+        work doesn't queue behind the app under test on the caller's loop.
+        """
+        ready = threading.Event()
+        errors = []
+
+        def run():
+            self._loop = asyncio.new_event_loop()
+            try:
+                self._loop.run_until_complete(self.start())
+            except Exception as e:
+                errors.append(e)
+                ready.set()
+                return
+            ready.set()
+            self._loop.run_forever()
+            self._loop.run_until_complete(self.stop())
+            self._loop.close()
+
+        self._thread = threading.Thread(target=run, name=type(self).__name__, daemon=True)
+        self._thread.start()
+        ready.wait()
+        if errors:
+            raise errors[0]
+
+    def stop_thread(self):
+        if self._thread is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._thread = None
+
+    async def handle(self, request: Request, writer: asyncio.StreamWriter):
+        raise NotImplementedError
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                request = await self._read_request(reader)
+                if request is None:
+                    break
+                self.requests[request.path] = self.requests.get(request.path, 0) + 1
+                try:
+                    await self.handle(request, writer)
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    raise
+                except Exception as e:
+                    await self.send_json(writer, {"error": f"{type(e).__name__}: {e}"}, 500)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _read_request(reader: asyncio.StreamReader) -> Optional[Request]:
+        request_line = await reader.readline()
+        if not request_line.strip():
+            return None
+        method, target, _ = request_line.decode("latin-1").split(" ", 2)
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        body = await reader.readexactly(int(headers.get("content-length", 0)))
+        path, _, query = target.partition("?")
+        return Request(method, path, parse_qsl(query, keep_blank_values=True), headers, body)
+
+    @staticmethod
+    async def send_json(writer: asyncio.StreamWriter, data: Any, status: int = 200, headers: Optional[Dict[str, str]] = None):
+        payload = json.dumps(data).encode() if data is not None else b""
+        extra = "".join(f"{name}: {value}\r\n" for name, value in (headers or {}).items())
+        writer.write(
+            f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(payload)}\r\n{extra}\r\n".encode() + payload
+        )
+        await writer.drain()
+
+    @staticmethod
+    async def start_stream(writer: asyncio.StreamWriter, content_type: str):
+        writer.write(
+            f"HTTP/1.1 200 OK\r\nContent-Type: {content_type}\r\nTransfer-Encoding: chunked\r\n\r\n".encode()
+        )
+        await writer.drain()
+
+    @staticmethod
+    async def send_chunk(writer: asyncio.StreamWriter, data: Optional[bytes]):
+        """One HTTP chunk; None ends the response"""
+        if data is None:
+            writer.write(b"0\r\n\r\n")
+        else:
+            writer.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        await writer.drain()
@@ -0,0 +1,49 @@
+"""Latency summaries and baseline comparison shared by the benchmarks"""
+from typing import Any, Dict, List, Optional
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile, None for no samples"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, min(len(ordered), round(pct / 100 * len(ordered) + 0.5)))
+    return ordered[rank - 1]
+
+def ms(value: Optional[float]) -> Optional[float]:
+    return round(value * 1000, 1) if value is not None else None
+
+def latency_summary(latencies: List[float]) -> Dict[str, Optional[float]]:
+    """p50/p95/p99/max in milliseconds"""
+    return {
+        "p50": ms(percentile(latencies, 50)),
+        "p95": ms(percentile(latencies, 95)),
+        "p99": ms(percentile(latencies, 99)),
+        "max": ms(max(latencies)) if latencies else None
+    }
+
+def find_regressions(
+    results: List[Dict[str, Any]],
+    baseline: List[Dict[str, Any]],
+    key: str,
+    metrics: Dict[str, int],
+    tolerance: float
+) -> List[str]:
+    """
+    Rows whose metrics got worse than the matching baseline row (same `key`)
+    by more than `tolerance`, a fraction. `metrics` maps a metric to 1 when
+    higher is worse (latency) or -1 when lower is worse (throughput).
+    """
+    previous = {row[key]: row for row in baseline}
+    regressions = []
+    for row in results:
+        before = previous.get(row[key])
+        if before is None:
+            continue
+        for metric, direction in metrics.items():
+            old, new = before.get(metric), row.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old * direction
+            if change > tolerance:
+                regressions.append(f"{key} {row[key]}: {metric} {old} -> {new} ({change:+.0%})")
+    return regressions
@@ -7,14 +7,30 @@ if sys.platform == "win32":
     sys.stdout.reconfigure(encoding='utf-8')
     sys.stderr.reconfigure(encoding='utf-8')
 
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.api.v1.endpoints import user, chat  # Add chat import
+from app.api.v1.endpoints import user, chat, health, task, calendar, diary  # Add chat import
+from app.core.metrics import registry as metrics_registry
 from app.core.responses import CustomJSONResponse
-from fastapi.responses import JSONResponse
+from app.core.supabase import close_async_supabase_client
+from app.services.health import health_monitor
+from app.services.llm import runtime
+from fastapi.responses import JSONResponse, PlainTextResponse
 import logging
 
-app = FastAPI(default_response_class=CustomJSONResponse)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Build the chat services here rather than at import so the server starts
+    # listening quickly; connectivity is checked in the background
+    await runtime.startup()
+    health_monitor.start()
+    yield
+    await health_monitor.stop()
+    await runtime.shutdown()
+    await close_async_supabase_client()
+
+app = FastAPI(default_response_class=CustomJSONResponse, lifespan=lifespan)
 
 # Configure logger
 logging.basicConfig(level=logging.INFO)
@@ -32,6 +48,10 @@ app.add_middleware(
 #  HYBRID ARCHITECTURE: Include authentication + chat routes
 app.include_router(user.router, prefix="/api/v1", tags=["users"])
 app.include_router(chat.router, prefix="/api/v1/chat", tags=["chat"])  
+app.include_router(task.router, prefix="/api/v1", tags=["tasks"])
+app.include_router(calendar.router, prefix="/api/v1", tags=["calendar"])
+app.include_router(diary.router, prefix="/api/v1", tags=["diary"])
+app.include_router(health.router)
 
 @app.get("/")
 def read_root():
@@ -43,16 +63,25 @@ def read_root():
 
 @app.get("/health")
 def health_check():
+    # The Electron shell polls this until the backend is up, so it always
+    # answers 200; /health/ready is the endpoint that fails when a dependency does
+    checks = health_monitor.results()
     return {
-        "status": "healthy",
+        "status": "healthy" if all(check["healthy"] for check in checks.values()) else "degraded",
         "mode": "hybrid",
         "services": {
             "authentication": "supabase",
             "data_storage": "local_sqlite",
             "ai": "ollama"
-        }
+        },
+        "checks": {name: check["healthy"] for name, check in checks.items()}
     }
 
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """Histograms in the Prometheus text exposition format"""
+    return PlainTextResponse(metrics_registry.render(), media_type="text/plain; version=0.0.4")
+
 @app.middleware("http")
 async def add_global_exception_handler(request, call_next):
     try:
@@ -67,11 +96,14 @@ async def add_global_exception_handler(request, call_next):
 #  DATA ENDPOINT STATUS (updated for AI)
 @app.get("/api/v1/status")
 def data_endpoint_status():
+    # Read off the mounted routers so this can't fall behind the include_router calls above
+    resources = sorted({
+        route.path.split("/")[3]
+        for route in app.routes
+        if route.path.startswith("/api/v1/") and route.path != "/api/v1/status"
+    })
     return {
-        "active_endpoints": [
-            "/api/v1/user/*",
-            "/api/v1/chat/*"  # Added
-        ],
+        "active_endpoints": [f"/api/v1/{resource}/*" for resource in resources],
         "data_operations": "Handled by LocalDataManager via Electron IPC",
         "ai_integration": "Ollama-powered chat with context building",
         "migration_status": "complete"
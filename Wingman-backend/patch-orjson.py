@@ -1,29 +1,39 @@
 """
 This script patches FastAPI to work without orjson.
 Run this before starting the application if using Python 3.13+.
+If the real orjson is installed it is left alone, since it is much faster
+than this shim (app/core/responses.py uses it directly when present).
 """
 import sys
 import json
 import types
 
-# Create a fake orjson module
-orjson = types.ModuleType('orjson')
+try:
+    import orjson as _real_orjson
+except ImportError:
+    _real_orjson = None
 
-# Add core functions
-def dumps(obj, **kwargs):
-    return json.dumps(obj).encode('utf-8')
+if _real_orjson is not None:
+    print("orjson is installed, no patch needed")
+else:
+    # Create a fake orjson module
+    orjson = types.ModuleType('orjson')
 
-def loads(obj):
-    if isinstance(obj, bytes):
-        obj = obj.decode('utf-8')
-    return json.loads(obj)
+    # Add core functions
+    def dumps(obj, default=None, option=None, **kwargs):
+        return json.dumps(obj, default=default, ensure_ascii=False, separators=(",", ":")).encode('utf-8')
 
-# Add required options
-orjson.OPT_NON_STR_KEYS = 0 # type: ignore
-orjson.OPT_SERIALIZE_NUMPY = 0 # type: ignore
-orjson.dumps = dumps # type: ignore
-orjson.loads = loads # type: ignore
+    def loads(obj):
+        if isinstance(obj, bytes):
+            obj = obj.decode('utf-8')
+        return json.loads(obj)
 
-# Add to sys.modules
-sys.modules['orjson'] = orjson
-print("Fake orjson module created successfully")
\ No newline at end of file
+    # Add required options
+    orjson.OPT_NON_STR_KEYS = 0 # type: ignore
+    orjson.OPT_SERIALIZE_NUMPY = 0 # type: ignore
+    orjson.dumps = dumps # type: ignore
+    orjson.loads = loads # type: ignore
+
+    # Add to sys.modules
+    sys.modules['orjson'] = orjson
+    print("Fake orjson module created successfully")
@@ -0,0 +1,48 @@
+"""
+Import-time profile of the backend: how long `import main` takes and which
+modules account for it. Run from Wingman-backend:
+
+    python profile_imports.py [--top 25] [--module main]
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+def profile(module: str):
+    """Run `python -X importtime -c "import <module>"` and parse its stderr"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True,
+        text=True
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        rows.append((int(self_us), int(cumulative_us), name.rstrip()))
+    return result.returncode, rows
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--module", default="main", help="module to import (default: main)")
+    parser.add_argument("--top", type=int, default=25, help="number of modules to list")
+    args = parser.parse_args()
+
+    returncode, rows = profile(args.module)
+    if returncode != 0 or not rows:
+        print(f"import {args.module} failed (exit code {returncode})")
+        sys.exit(returncode or 1)
+
+    total = next((cumulative for _, cumulative, name in rows if name.strip() == args.module), None)
+    if total is not None:
+        print(f"import {args.module}: {total / 1000:.0f} ms\n")
+
+    print(f"{'cumulative ms':>14} {'self ms':>8}  module")
+    for self_us, cumulative_us, name in sorted(rows, key=lambda row: row[1], reverse=True)[:args.top]:
+        print(f"{cumulative_us / 1000:>14.1f} {self_us / 1000:>8.1f}  {name}")
+
+if __name__ == "__main__":
+    main()
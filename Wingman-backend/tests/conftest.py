@@ -0,0 +1,59 @@
+"""
+Keep the suite off the developer's machine: settings are read from the
+environment when app.core.config is imported, so point HOME (where the
+context builder finds wingman-data/wingman.db) at a scratch directory and
+Supabase at a closed port before any app module loads.
+"""
+import asyncio
+import os
+import tempfile
+
+import httpx
+import pytest
+
+_HOME = tempfile.mkdtemp(prefix="wingman-tests-")
+os.environ["HOME"] = os.environ["USERPROFILE"] = _HOME
+os.environ["SUPABASE_URL"] = "http://127.0.0.1:9"
+os.environ["SUPABASE_KEY"] = "tests"
+os.environ["SEMANTIC_SEARCH_ENABLED"] = "False"
+
+from benchmarks.fake_postgrest import FakePostgrest
+
+USERS = [
+    {"id": "user-1", "username": "sam", "email": "sam@example.com", "password": "password1"},
+    {"id": "user-2", "username": "alex", "email": "alex@example.com", "password": "password2"}
+]
+
+@pytest.fixture
+def postgrest(monkeypatch):
+    """A seeded fake PostgREST that the app's Supabase client talks to"""
+    from app.core.config import settings
+    from app.services.user import user_cache
+
+    fake = FakePostgrest()
+    fake.insert_rows("users", USERS)
+    fake.start_in_thread()
+    monkeypatch.setattr(settings, "SUPABASE_URL", fake.url)
+    user_cache.clear()
+    yield fake
+    fake.stop_thread()
+    user_cache.clear()
+
+@pytest.fixture
+def api(postgrest):
+    """Send one request to the app, e.g. api("post", "/api/v1/tasks/bulk", json=[...])"""
+    import main
+    from app.core.supabase import close_async_supabase_client
+
+    def request(method: str, path: str, **kwargs) -> httpx.Response:
+        async def send():
+            transport = httpx.ASGITransport(app=main.app)
+            try:
+                async with httpx.AsyncClient(transport=transport, base_url="http://wingman") as client:
+                    return await client.request(method, path, **kwargs)
+            finally:
+                # The pooled client belongs to this event loop
+                await close_async_supabase_client()
+        return asyncio.run(send())
+
+    return request
@@ -0,0 +1,61 @@
+def _rows(postgrest):
+    return {row["id"]: dict(row) for row in postgrest.conn.execute("SELECT * FROM calendar_events")}
+
+def _seed_events(postgrest, count=3):
+    return [
+        row["id"] for row in postgrest.insert_rows("calendar_events", [
+            {"user_id": "user-1", "title": f"Event {n}", "event_date": f"2026-03-0{n + 1}", "event_time": "14:00", "type": "meeting"}
+            for n in range(count)
+        ])
+    ]
+
+def test_bulk_create_checks_users(api, postgrest):
+    response = api("post", "/api/v1/calendar/bulk", json=[
+        {"title": "Standup", "date": "2026-03-01", "time": "09:00", "type": "meeting", "user_id": "user-1"},
+        {"title": "Ghost", "date": "2026-03-01", "user_id": "nobody"}
+    ])
+    results = response.json()["results"]
+
+    assert results[0]["success"] and results[0]["data"]["date"] == "2026-03-01"
+    assert results[1]["error"] == "User with ID nobody does not exist in the users table"
+    assert len(_rows(postgrest)) == 1
+
+def test_bulk_update_does_not_insert_unknown_ids(api, postgrest):
+    first, _, _ = _seed_events(postgrest)
+    response = api("put", "/api/v1/calendar/bulk", json=[
+        {"id": first, "time": "16:30"},
+        {"id": 31337, "title": "Not there", "user_id": "user-1"},
+        {"id": first, "user_id": "nobody"}
+    ])
+    results = response.json()["results"]
+
+    assert [result["success"] for result in results] == [True, False, False]
+    assert results[0]["data"]["time"] == "16:30"
+    assert results[1]["error"] == "31337 not found"
+    rows = _rows(postgrest)
+    assert 31337 not in rows and rows[first]["user_id"] == "user-1"
+
+def test_bulk_delete_reports_missing_ids(api, postgrest):
+    first, second, third = _seed_events(postgrest)
+    response = api("post", "/api/v1/calendar/bulk/delete", json=[third, 8, first])
+    results = response.json()["results"]
+
+    assert [result["success"] for result in results] == [True, False, True]
+    assert list(_rows(postgrest)) == [second]
+
+def test_range_groups_events_by_day(api, postgrest):
+    _seed_events(postgrest, count=3)
+    postgrest.insert_rows("calendar_events", [
+        {"user_id": "user-1", "title": "Lunch", "event_date": "2026-03-02", "type": "personal"},
+        {"user_id": "user-2", "title": "Someone else's", "event_date": "2026-03-02", "type": "meeting"}
+    ])
+
+    body = api("get", "/api/v1/calendar/range", params={
+        "start": "2026-03-02", "end": "2026-03-31", "user_id": "user-1", "type": "meeting"
+    }).json()
+
+    assert {day: [event["title"] for event in events] for day, events in body["days"].items()} == {
+        "2026-03-02": ["Event 1"],
+        "2026-03-03": ["Event 2"]
+    }
+    assert body["count"] == 2 and body["next_cursor"] is None
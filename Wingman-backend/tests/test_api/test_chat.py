@@ -0,0 +1,92 @@
+import asyncio
+import json
+
+import httpx
+
+from benchmarks.chat_benchmark import seed_database
+from benchmarks.fake_ollama import FakeOllama
+
+MODEL = "llama3.2:1b"
+
+async def _with_app(monkeypatch, send):
+    """Run `send(client)` against the app started with main.lifespan and a fake Ollama"""
+    import main
+    from app.core.config import settings
+    from app.services.llm.context_builder import _resolve_user_db_path
+
+    seed_database(_resolve_user_db_path(), users=1, history=4)
+    async with FakeOllama(token_latency=0, prompt_latency=0, load_latency=0, reply_tokens=8) as fake_ollama:
+        monkeypatch.setattr(settings, "OLLAMA_URL", fake_ollama.url)
+        async with main.lifespan(main.app):
+            transport = httpx.ASGITransport(app=main.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://wingman") as client:
+                return await send(client)
+
+async def _chat_twice(monkeypatch, body):
+    async def send(client):
+        first = (await client.post("/api/v1/chat/", json=body)).json()
+        second = (await client.post("/api/v1/chat/", json=body)).json()
+        return first, second
+    return await _with_app(monkeypatch, send)
+
+def _sse_events(raw):
+    events = []
+    for frame in raw.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in frame.splitlines())
+        events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+def test_repeated_chat_is_served_from_response_cache(monkeypatch):
+    body = {"user_id": "bench-user-0", "message": "What should I focus on today?", "model": MODEL}
+    first, second = asyncio.run(_chat_twice(monkeypatch, body))
+
+    assert first["success"] and not first["fallback_used"]
+    assert not first["cached"]
+    assert second["success"] and second["cached"]
+    assert second["response"] == first["response"]
+
+def test_bypass_cache_generates_again(monkeypatch):
+    body = {"user_id": "bench-user-0", "message": "Plan my evening", "model": MODEL, "bypass_cache": True}
+    first, second = asyncio.run(_chat_twice(monkeypatch, body))
+
+    assert first["success"] and second["success"]
+    assert not first["cached"] and not second["cached"]
+
+def test_stream_sends_tokens_then_done(monkeypatch):
+    body = {"user_id": "bench-user-0", "message": "Walk me through my afternoon", "model": MODEL}
+
+    async def send(client):
+        async with client.stream("POST", "/api/v1/chat/stream", json=body) as response:
+            return response.headers["content-type"], (await response.aread()).decode()
+
+    content_type, raw = asyncio.run(_with_app(monkeypatch, send))
+    events = _sse_events(raw)
+
+    assert content_type.startswith("text/event-stream")
+    assert [name for name, _ in events] == ["token"] * 8 + ["done"]
+    done = events[-1][1]
+    assert done["success"] and not done["fallback_used"]
+    assert done["response"] == "".join(data["content"] for _, data in events[:-1])
+    assert done["time_to_first_token"] is not None
+
+def test_resident_model_is_not_warmed_again(monkeypatch):
+    from app.api.v1.endpoints import chat
+    from app.services.llm.ollama_service import WingmanOllamaService
+
+    async def scenario():
+        async with FakeOllama(load_latency=0) as fake_ollama:
+            fake_ollama.resident = {MODEL: 0}
+            service = WingmanOllamaService()
+            service.ollama_url = fake_ollama.url
+            monkeypatch.setattr(chat, "get_ollama_service", lambda: service)
+            try:
+                await chat._ensure_model_loaded(MODEL)
+                await chat._ensure_model_loaded("llama3.2:3b")
+            finally:
+                await service.close()
+            return fake_ollama.requests
+
+    requests = asyncio.run(scenario())
+
+    # Only the model Ollama didn't already hold is loaded
+    assert requests == {"/api/ps": 4, "/api/generate": 1}
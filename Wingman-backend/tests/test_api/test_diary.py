@@ -0,0 +1,86 @@
+def _rows(postgrest):
+    return {row["id"]: dict(row) for row in postgrest.conn.execute("SELECT * FROM diary_entries")}
+
+def _seed_entries(postgrest, count=3):
+    return [
+        row["id"] for row in postgrest.insert_rows("diary_entries", [
+            {"user_id": "user-1", "entry_date": f"2026-03-0{n + 1}", "title": f"Day {n}", "content": "Notes", "mood": "neutral"}
+            for n in range(count)
+        ])
+    ]
+
+def test_bulk_create_retries_rows_after_a_failed_batch(api, postgrest):
+    response = api("post", "/api/v1/diary/entries/bulk", json=[
+        {"user_id": "user-1", "date": "2026-03-01", "title": "Fine", "content": "a", "mood": "happy"},
+        {"user_id": "nobody", "date": "2026-03-02", "title": "Unknown user", "content": "b", "mood": "happy"},
+        {"user_id": "user-1", "date": "2026-03-03", "title": "Also fine", "content": "c", "mood": "grumpy"},
+        {"date": "2026-03-04", "title": "No user"}
+    ])
+    body = response.json()
+
+    assert [result["success"] for result in body["results"]] == [True, False, True, False]
+    assert body["results"][3]["error"] == "user_id is required"
+    assert body["results"][2]["data"]["mood"] == "neutral"
+    assert sorted(row["title"] for row in _rows(postgrest).values()) == ["Also fine", "Fine"]
+
+def test_bulk_update_does_not_insert_unknown_ids(api, postgrest):
+    first, _, _ = _seed_entries(postgrest)
+    response = api("put", "/api/v1/diary/entries/bulk", json=[
+        {"id": first, "mood": "happy", "date": "2026-04-01"},
+        {"id": 4242, "user_id": "user-1", "title": "Not there"},
+        {"id": first, "user_id": "user-2"},
+        {"id": first, "user_id": "nobody"}
+    ])
+    body = response.json()
+
+    assert [result["success"] for result in body["results"]] == [True, False, True, False]
+    assert body["results"][1]["error"] == "4242 not found"
+    assert body["results"][3]["error"] == "User with ID nobody does not exist"
+    rows = _rows(postgrest)
+    assert 4242 not in rows
+    assert rows[first]["mood"] == "happy" and rows[first]["entry_date"] == "2026-04-01"
+    assert rows[first]["user_id"] == "user-2"
+
+def test_bulk_delete_reports_missing_ids(api, postgrest):
+    first, second, third = _seed_entries(postgrest)
+    response = api("post", "/api/v1/diary/entries/bulk/delete", json=[second, 777])
+    body = response.json()
+
+    assert (body["succeeded"], body["failed"]) == (1, 1)
+    assert body["results"][1] == {"index": 1, "success": False, "error": "777 not found"}
+    assert sorted(_rows(postgrest)) == [first, third]
+
+def test_entries_page_with_projection(api, postgrest):
+    _seed_entries(postgrest, count=5)
+    params = {"user_id": "user-1", "fields": "title,mood", "limit": 3}
+
+    first = api("get", "/api/v1/diary/entries", params=params).json()
+    second = api("get", "/api/v1/diary/entries", params={**params, "cursor": first["next_cursor"]}).json()
+
+    assert [item["title"] for item in first["items"]] == ["Day 4", "Day 3", "Day 2"]
+    assert [item["title"] for item in second["items"]] == ["Day 1", "Day 0"]
+    assert second["next_cursor"] is None
+    assert "content" not in first["items"][0]
+
+def test_diary_is_read_a_page_at_a_time(api, postgrest, monkeypatch):
+    from app.services import diary_crud
+
+    monkeypatch.setattr(diary_crud, "DIARY_PAGE_SIZE", 2)
+    _seed_entries(postgrest, count=5)
+
+    response = api("get", "/api/v1/diary", params={"user_id": "user-1"})
+
+    assert [entry["title"] for entry in response.json()] == ["Day 4", "Day 3", "Day 2", "Day 1", "Day 0"]
+    assert "x-next-cursor" not in response.headers
+    assert postgrest.requests["/rest/v1/diary_entries"] == 3
+
+def test_diary_limit_hands_back_a_cursor(api, postgrest):
+    _seed_entries(postgrest, count=5)
+    params = {"user_id": "user-1", "limit": 3}
+
+    first = api("get", "/api/v1/diary", params=params)
+    second = api("get", "/api/v1/diary", params={**params, "cursor": first.headers["x-next-cursor"]})
+
+    assert [entry["title"] for entry in first.json()] == ["Day 4", "Day 3", "Day 2"]
+    assert [entry["title"] for entry in second.json()] == ["Day 1", "Day 0"]
+    assert "x-next-cursor" not in second.headers
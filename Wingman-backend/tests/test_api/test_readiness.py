@@ -0,0 +1,27 @@
+import asyncio
+
+from app.services.health import HealthMonitor
+
+async def _healthy():
+    return None
+
+async def _failing():
+    raise RuntimeError("connection refused")
+
+def _monitor(probes):
+    monitor = HealthMonitor(probes)
+    asyncio.run(monitor.check_all())
+    return monitor
+
+def test_ready_endpoint_answers_503_while_a_required_probe_fails(api, monkeypatch):
+    from app.api.v1.endpoints import health as endpoint
+
+    monkeypatch.setattr(endpoint, "health_monitor", _monitor({"supabase": _healthy, "ollama": _failing}))
+    monkeypatch.setattr(endpoint.settings, "HEALTH_REQUIRED_PROBES", "supabase")
+    ready = api("get", "/health/ready")
+    monkeypatch.setattr(endpoint.settings, "HEALTH_REQUIRED_PROBES", "supabase,ollama")
+    not_ready = api("get", "/health/ready")
+
+    assert ready.status_code == 200 and ready.json()["status"] == "ready"
+    assert not_ready.status_code == 503 and not_ready.json()["failing"] == ["ollama"]
+    assert api("get", "/health/live").json()["status"] == "alive"
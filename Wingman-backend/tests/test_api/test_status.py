@@ -0,0 +1,10 @@
+def test_status_lists_every_mounted_router(api):
+    body = api("get", "/api/v1/status").json()
+
+    assert body["active_endpoints"] == [
+        "/api/v1/calendar/*",
+        "/api/v1/chat/*",
+        "/api/v1/diary/*",
+        "/api/v1/tasks/*",
+        "/api/v1/user/*"
+    ]
@@ -0,0 +1,104 @@
+def _rows(postgrest, table="tasks"):
+    return {row["id"]: dict(row) for row in postgrest.conn.execute(f"SELECT * FROM {table}")}
+
+def _seed_tasks(postgrest, count=3, user_id="user-1"):
+    return [
+        row["id"] for row in postgrest.insert_rows("tasks", [
+            {"user_id": user_id, "title": f"Task {n}", "task_date": "2026-03-01", "task_time": "09:00"}
+            for n in range(count)
+        ])
+    ]
+
+def test_bulk_create_reports_each_task(api, postgrest):
+    response = api("post", "/api/v1/tasks/bulk", json=[
+        {"title": "Write report", "date": "2026-03-01", "time": "10:00", "user_id": "user-1"},
+        {"title": "", "user_id": "user-1"},
+        {"title": "Ghost task", "user_id": "nobody"},
+        {"text": "Call home", "task_date": "2026-03-02", "user_id": "user-2"}
+    ])
+    body = response.json()
+
+    assert response.status_code == 200
+    assert (body["succeeded"], body["failed"]) == (2, 2)
+    results = body["results"]
+    assert [result["index"] for result in results] == [0, 1, 2, 3]
+    assert results[0]["data"]["title"] == "Write report" and results[0]["data"]["date"] == "2026-03-01"
+    assert results[1]["error"] == "Title is required"
+    assert results[2]["error"] == "User with ID nobody does not exist"
+    assert results[3]["data"]["title"] == "Call home"
+    assert len(_rows(postgrest)) == 2
+
+def test_bulk_update_changes_existing_tasks_only(api, postgrest):
+    first, second, _ = _seed_tasks(postgrest)
+    response = api("put", "/api/v1/tasks/bulk", json=[
+        {"id": first, "completed": True},
+        {"id": second, "title": "Renamed", "date": "2026-03-05"},
+        {"id": 99999, "title": "Not there", "user_id": "user-1"},
+        {"title": "No id"}
+    ])
+    body = response.json()
+
+    assert (body["succeeded"], body["failed"]) == (2, 2)
+    assert body["results"][2]["error"] == "99999 not found"
+    assert body["results"][3]["error"] == "Missing required fields: id"
+    rows = _rows(postgrest)
+    assert 99999 not in rows and len(rows) == 3
+    assert rows[first]["completed"] == 1 and rows[first]["title"] == "Task 0"
+    assert rows[second]["title"] == "Renamed" and rows[second]["task_date"] == "2026-03-05"
+
+def test_bulk_update_checks_user_ids(api, postgrest):
+    task_id, = _seed_tasks(postgrest, count=1)
+    response = api("put", "/api/v1/tasks/bulk", json=[{"id": task_id, "user_id": "nobody"}])
+    result = response.json()["results"][0]
+
+    assert result == {"index": 0, "success": False, "error": "User with ID nobody does not exist"}
+    assert _rows(postgrest)[task_id]["user_id"] == "user-1"
+
+def test_bulk_delete_fails_ids_that_were_not_deleted(api, postgrest):
+    first, second, third = _seed_tasks(postgrest)
+    response = api("post", "/api/v1/tasks/bulk/delete", json=[first, 424242, second, first])
+    body = response.json()
+
+    assert [result["success"] for result in body["results"]] == [True, False, True, False]
+    assert body["results"][1]["error"] == "424242 not found"
+    assert body["results"][3]["error"] == f"{first} appears more than once"
+    assert body["results"][0]["data"]["id"] == first
+    assert list(_rows(postgrest)) == [third]
+
+def test_bulk_endpoints_reject_oversized_batches(api, monkeypatch):
+    from app.core.config import settings
+
+    response = api("post", "/api/v1/tasks/bulk/delete", json=list(range(settings.BULK_MAX_ITEMS + 1)))
+
+    assert response.status_code == 422
+
+def test_range_pages_through_pending_tasks(api, postgrest):
+    postgrest.insert_rows("tasks", [
+        {"user_id": "user-1", "title": f"Task {n}", "task_date": f"2026-03-0{n % 3 + 1}", "completed": completed, "failed": failed}
+        for n, (completed, failed) in enumerate([(False, False), (False, None), (None, None), (True, False), (False, True)] * 2)
+    ])
+    params = {"start": "2026-03-01", "end": "2026-03-31", "user_id": "user-1", "status": "pending", "limit": 4}
+
+    first = api("get", "/api/v1/tasks/range", params=params).json()
+    second = api("get", "/api/v1/tasks/range", params={**params, "cursor": first["next_cursor"]}).json()
+
+    titles = [task["title"] for page in (first, second) for day in page["days"].values() for task in day]
+    assert first["count"] == 4 and second["count"] == 2 and second["next_cursor"] is None
+    assert sorted(titles) == sorted(f"Task {n}" for n in (0, 1, 2, 5, 6, 7))
+
+def test_range_rejects_malformed_cursor(api, postgrest):
+    response = api("get", "/api/v1/tasks/range", params={
+        "start": "2026-03-01", "end": "2026-03-31", "user_id": "user-1", "cursor": "WzFd"
+    })
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
+
+def test_bulk_update_reads_and_writes_once(api, postgrest):
+    ids = _seed_tasks(postgrest, count=5)
+    response = api("put", "/api/v1/tasks/bulk", json=[{"id": task_id, "completed": True} for task_id in ids])
+
+    assert response.json()["succeeded"] == 5
+    # One select for the ids and one upsert, however many tasks the batch has
+    assert postgrest.requests["/rest/v1/tasks"] == 2
+    assert all(row["completed"] == 1 for row in _rows(postgrest).values())
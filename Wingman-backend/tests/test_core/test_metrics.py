@@ -0,0 +1,43 @@
+from app.core.metrics import Histogram, MetricsRegistry
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram("wingman_test_seconds", "Test latency", ["route"], buckets=(0.1, 1.0))
+    histogram.observe(0.05, route="/a")
+    histogram.observe(0.5, route="/a")
+    histogram.observe(2, route="/a")
+
+    assert histogram.render() == [
+        "# HELP wingman_test_seconds Test latency",
+        "# TYPE wingman_test_seconds histogram",
+        'wingman_test_seconds_bucket{route="/a",le="0.1"} 1',
+        'wingman_test_seconds_bucket{route="/a",le="1"} 2',
+        'wingman_test_seconds_bucket{route="/a",le="+Inf"} 3',
+        'wingman_test_seconds_sum{route="/a"} 2.55',
+        'wingman_test_seconds_count{route="/a"} 3'
+    ]
+
+def test_histogram_bucket_bounds_are_inclusive():
+    histogram = Histogram("wingman_test_seconds", "Test", buckets=(1.0,))
+    histogram.observe(1.0)
+
+    assert 'wingman_test_seconds_bucket{le="1"} 1' in histogram.render()
+
+def test_histogram_escapes_label_values_and_sorts_series():
+    histogram = Histogram("wingman_test_seconds", "Test", ["model"], buckets=(1.0,))
+    histogram.observe(0.5, model='b"\\\n')
+    histogram.observe(0.5, model="a")
+
+    lines = histogram.render()
+    assert lines[2] == 'wingman_test_seconds_bucket{model="a",le="1"} 1'
+    assert 'wingman_test_seconds_count{model="b\\"\\\\\\n"} 1' in lines
+
+def test_registry_renders_every_histogram_once():
+    registry = MetricsRegistry()
+    first = registry.histogram("wingman_a_seconds", "A")
+    assert registry.histogram("wingman_a_seconds", "A") is first
+    registry.histogram("wingman_b_seconds", "B")
+
+    output = registry.render()
+    assert output.endswith("\n")
+    assert output.count("# TYPE wingman_a_seconds histogram") == 1
+    assert "# TYPE wingman_b_seconds histogram" in output
@@ -0,0 +1,30 @@
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from uuid import UUID
+
+import pytest
+
+from app.core.responses import _select_serializer
+
+BODY = {
+    "amount": Decimal("12.50"),
+    "day": date(2026, 3, 1),
+    "at": datetime(2026, 3, 1, 8, 30),
+    "id": UUID("12345678-1234-5678-1234-567812345678"),
+    "text": "café"
+}
+
+@pytest.mark.parametrize("name", ["json", "msgspec", "orjson"])
+def test_every_serializer_produces_the_same_json(name):
+    selected, dumps = _select_serializer(name)
+    if selected != name:
+        pytest.skip(f"{name} is not installed")
+
+    assert json.loads(dumps(BODY)) == {
+        "amount": 12.5,
+        "day": "2026-03-01",
+        "at": "2026-03-01T08:30:00",
+        "id": "12345678-1234-5678-1234-567812345678",
+        "text": "café"
+    }
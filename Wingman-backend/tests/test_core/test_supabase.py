@@ -0,0 +1,42 @@
+import asyncio
+
+import pytest
+
+from app.core.metrics import SUPABASE_REQUEST_SECONDS
+from app.core.supabase import close_async_supabase_client, execute, get_async_supabase_client
+
+def _count(table, method, outcome):
+    series = SUPABASE_REQUEST_SECONDS._series.get((table, method, outcome))
+    return series[-1] if series else 0
+
+class SlowQuery:
+    path = "/tasks"
+    http_method = "GET"
+
+    async def execute(self):
+        await asyncio.sleep(1)
+
+def test_execute_records_latency_per_table(postgrest):
+    async def scenario():
+        client = get_async_supabase_client()
+        try:
+            first = await execute(client.table("users").select("id, username").eq("id", "user-1"))
+            second = await execute(client.table("users").select("id").eq("id", "user-2"))
+            return first.data, second.data, client is get_async_supabase_client()
+        finally:
+            await close_async_supabase_client()
+
+    before = _count("users", "GET", "ok")
+    first, second, shared = asyncio.run(scenario())
+
+    assert first == [{"id": "user-1", "username": "sam"}] and second == [{"id": "user-2"}]
+    assert shared
+    assert _count("users", "GET", "ok") == before + 2
+
+def test_execute_gives_up_at_the_deadline():
+    before = _count("tasks", "GET", "timeout")
+
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(execute(SlowQuery(), timeout=0.05))
+
+    assert _count("tasks", "GET", "timeout") == before + 1
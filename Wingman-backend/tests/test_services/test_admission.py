@@ -0,0 +1,97 @@
+import asyncio
+
+import pytest
+
+from app.services.llm.admission import AdmissionRejected, OllamaAdmissionController
+
+MODEL = "llama3.2:1b"
+
+async def _hold(controller, user_id, order, release):
+    async with controller.slot(MODEL, user_id):
+        order.append(user_id)
+        await release.wait()
+
+def test_waiting_users_are_served_round_robin():
+    async def scenario():
+        controller = OllamaAdmissionController(max_concurrent_per_model=1, max_queue_depth=10)
+        order = []
+        release = asyncio.Event()
+        release.set()
+
+        # "busy" takes the only slot, then queues three more requests ahead of "quiet"
+        gate = asyncio.Event()
+        holder = asyncio.create_task(_hold(controller, "first", order, gate))
+        await asyncio.sleep(0)
+        waiters = [asyncio.create_task(_hold(controller, "busy", order, release)) for _ in range(3)]
+        await asyncio.sleep(0)
+        waiters.append(asyncio.create_task(_hold(controller, "quiet", order, release)))
+        await asyncio.sleep(0)
+
+        gate.set()
+        await asyncio.gather(holder, *waiters)
+        return order
+
+    assert asyncio.run(scenario()) == ["first", "busy", "quiet", "busy", "busy"]
+
+def test_full_queue_rejects_immediately():
+    async def scenario():
+        controller = OllamaAdmissionController(max_concurrent_per_model=1, max_queue_depth=1)
+        gate = asyncio.Event()
+        order = []
+        held = asyncio.create_task(_hold(controller, "a", order, gate))
+        await asyncio.sleep(0)
+        queued = asyncio.create_task(_hold(controller, "b", order, gate))
+        await asyncio.sleep(0)
+
+        assert controller.is_saturated(MODEL)
+        with pytest.raises(AdmissionRejected) as rejected:
+            await controller._acquire(MODEL, "c")
+
+        gate.set()
+        await asyncio.gather(held, queued)
+        return rejected.value, controller.get_metrics()["models"][MODEL]
+
+    error, metrics = asyncio.run(scenario())
+    assert error.reason == "queue_full"
+    assert error.retry_after >= 1.0
+    assert metrics["rejected"] == 1
+    assert metrics["admitted"] == 2
+    assert metrics["active"] == 0 and metrics["queued"] == 0
+
+def test_queue_wait_times_out():
+    async def scenario():
+        controller = OllamaAdmissionController(max_concurrent_per_model=1, max_queue_depth=4, max_wait_seconds=0.05)
+        gate = asyncio.Event()
+        held = asyncio.create_task(_hold(controller, "a", [], gate))
+        await asyncio.sleep(0)
+        with pytest.raises(AdmissionRejected) as rejected:
+            async with controller.slot(MODEL, "b"):
+                pass
+        gate.set()
+        await held
+        return rejected.value, controller.get_metrics()["models"][MODEL]
+
+    error, metrics = asyncio.run(scenario())
+    assert error.reason == "queue_timeout"
+    assert metrics["queued"] == 0 and metrics["waiting_users"] == 0
+
+def test_cancelled_waiter_gives_up_its_place():
+    async def scenario():
+        controller = OllamaAdmissionController(max_concurrent_per_model=1, max_queue_depth=4)
+        gate = asyncio.Event()
+        order = []
+        held = asyncio.create_task(_hold(controller, "a", order, gate))
+        await asyncio.sleep(0)
+        cancelled = asyncio.create_task(_hold(controller, "b", order, gate))
+        after = asyncio.create_task(_hold(controller, "c", order, gate))
+        await asyncio.sleep(0)
+
+        cancelled.cancel()
+        await asyncio.sleep(0)
+        gate.set()
+        await asyncio.gather(held, after)
+        return order, controller.get_metrics()["models"][MODEL]
+
+    order, metrics = asyncio.run(scenario())
+    assert order == ["a", "c"]
+    assert metrics["active"] == 0 and metrics["queued"] == 0
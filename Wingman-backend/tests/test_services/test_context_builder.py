@@ -0,0 +1,78 @@
+import asyncio
+import sqlite3
+import time
+from datetime import date
+
+import pytest
+
+from app.services.llm.context_builder import WingmanContextBuilder
+from app.services.llm.sqlite_pool import get_connection_pool
+from benchmarks.chat_benchmark import seed_database
+
+USER = "bench-user-0"
+TODAY = date.today().isoformat()
+
+@pytest.fixture
+def builder(tmp_path):
+    path = str(tmp_path / "wingman.db")
+    seed_database(path, users=1, history=25)
+    builder = WingmanContextBuilder()
+    builder.db_path = path
+    builder.pool = get_connection_pool(path)
+    return builder
+
+def test_async_build_matches_sync_build(builder):
+    built = asyncio.run(builder.build_context_async(USER, "What is on today?", TODAY))
+
+    assert built["context"] == builder.build_context(USER, "What is on today?", TODAY)
+    assert built["chat_history"] == builder._get_recent_chat_history(USER, 10)
+    assert set(built["timings"]) == {"chat_history", "tasks", "events", "diary", "relevant", "total"}
+    assert "Task 4" in built["context"] and "Event 2" in built["context"]
+
+def test_sections_are_fetched_concurrently(builder, monkeypatch):
+    def slow(fetch):
+        def fetch_slowly(*args, **kwargs):
+            time.sleep(0.2)
+            return fetch(*args, **kwargs)
+        return fetch_slowly
+
+    for name in ("_get_recent_chat_history", "_get_tasks_for_date", "_get_events_for_date", "_get_recent_diary_entries"):
+        monkeypatch.setattr(builder, name, slow(getattr(builder, name)))
+
+    built = asyncio.run(builder.build_context_async(USER, "What is on today?", TODAY))
+
+    assert all(built["timings"][name] >= 0.2 for name in ("chat_history", "tasks", "events", "diary"))
+    assert built["timings"]["total"] < 0.6
+
+def _build_for_chat_api(builder, token_budget=None):
+    return asyncio.run(builder.build_context_async(USER, "What is on today?", TODAY, token_budget, history_as_messages=True))
+
+def test_history_messages_are_trimmed_after_the_final_message_sections(builder):
+    full = _build_for_chat_api(builder)
+    tokens = full["tokens"]
+    fitted = _build_for_chat_api(builder, tokens["total"] - tokens["diary"])
+
+    assert fitted["chat_history"] == full["chat_history"]
+    assert "Day 0" not in fitted["context"]
+    assert fitted["tokens"]["tasks"] + fitted["tokens"]["events"] < tokens["tasks"] + tokens["events"]
+
+def test_history_messages_are_trimmed_a_window_at_a_time(builder):
+    full = _build_for_chat_api(builder)
+    tokens = full["tokens"]
+    fitted = _build_for_chat_api(builder, tokens["total"] - tokens["diary"] - tokens["chat_history"] // 2)
+
+    # 25 messages: the window starts at message 10, trimming skips to message 20
+    assert len(full["chat_history"]) == 15
+    assert fitted["chat_history"] == full["chat_history"][10:]
+
+def test_history_prefix_is_stable_between_turns(builder):
+    first = _build_for_chat_api(builder, 2000)["chat_history"]
+    with sqlite3.connect(builder.db_path) as conn:
+        conn.execute(
+            "INSERT INTO chat_history (user_id, message, timestamp, is_ai) VALUES (?, ?, ?, ?)",
+            (USER, "One more question", f"{TODAY} 23:59:59", 0)
+        )
+    second = _build_for_chat_api(builder, 2000)["chat_history"]
+
+    assert second[:len(first)] == first
+    assert second[-1]["message"] == "One more question"
@@ -0,0 +1,76 @@
+import asyncio
+
+import pytest
+
+from app.services import health
+from app.services.health import HealthMonitor
+from app.services.llm.ollama_service import WingmanOllamaService
+from benchmarks.fake_ollama import FakeOllama
+
+async def _healthy():
+    return "ok"
+
+async def _failing():
+    raise RuntimeError("connection refused")
+
+async def _hanging():
+    await asyncio.sleep(10)
+
+def _monitor(probes, **kwargs):
+    monitor = HealthMonitor(probes, **kwargs)
+    asyncio.run(monitor.check_all())
+    return monitor
+
+def test_probe_results_are_recorded():
+    monitor = _monitor({"up": _healthy, "down": _failing, "stuck": _hanging}, timeout=0.05)
+    results = monitor.results()
+
+    assert results["up"]["healthy"] and results["up"]["detail"] == "ok"
+    assert results["down"] == {**results["down"], "healthy": False, "error": "connection refused", "last_success": None}
+    assert results["stuck"]["error"] == "timed out after 0s"
+
+def test_results_that_stop_refreshing_turn_unhealthy(monkeypatch):
+    monitor = _monitor({"up": _healthy}, interval=1.0)
+    monkeypatch.setattr(health.time, "monotonic", lambda: monitor._checked_at["up"] + 3.5)
+
+    result = monitor.results()["up"]
+
+    assert not result["healthy"]
+    assert result["error"] == "no probe result for 3s"
+
+def test_readiness_only_fails_on_required_probes():
+    monitor = _monitor({"up": _healthy, "down": _failing})
+
+    assert monitor.readiness(["up"])["ready"]
+    assert monitor.readiness(["up", "down"]) == {**monitor.readiness(["up", "down"]), "ready": False, "failing": ["down"]}
+
+def test_ollama_probe_reads_the_cached_status(monkeypatch):
+    async def scenario():
+        async with FakeOllama(load_latency=0) as fake:
+            service = WingmanOllamaService()
+            service.ollama_url = fake.url
+            monkeypatch.setattr(health.runtime, "get_ollama_service", lambda: service)
+            try:
+                await service.get_status()
+                details = [await health.probe_ollama() for _ in range(3)]
+            finally:
+                await service.close()
+            return details, fake.requests.get("/api/tags", 0)
+
+    details, tag_requests = asyncio.run(scenario())
+
+    assert details == [details[0]] * 3 and details[0].endswith("models")
+    assert tag_requests == 1
+
+def test_ollama_probe_raises_when_ollama_is_down(monkeypatch):
+    async def scenario():
+        service = WingmanOllamaService()
+        service.ollama_url = "http://127.0.0.1:9"
+        monkeypatch.setattr(health.runtime, "get_ollama_service", lambda: service)
+        try:
+            await health.probe_ollama()
+        finally:
+            await service.close()
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(scenario())
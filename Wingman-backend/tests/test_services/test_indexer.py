@@ -0,0 +1,83 @@
+import asyncio
+import sqlite3
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from app.services.llm.indexer import BackgroundIndexer
+from app.services.llm.semantic_index import SemanticIndex
+
+SCHEMA = """
+CREATE TABLE chat_history (id INTEGER PRIMARY KEY, user_id TEXT, message TEXT, timestamp TEXT, is_ai BOOLEAN);
+CREATE TABLE diary_entries (id INTEGER PRIMARY KEY, user_id TEXT, entry_date TEXT, title TEXT, content TEXT, mood TEXT, updated_at TEXT);
+"""
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = tmp_path / "wingman.db"
+    with sqlite3.connect(path) as conn:
+        conn.executescript(SCHEMA)
+        conn.executemany(
+            "INSERT INTO chat_history (user_id, message, timestamp, is_ai) VALUES ('user-1', ?, '2026-03-01 09:00', 0)",
+            [(f"Message {n}",) for n in range(5)]
+        )
+        conn.executemany(
+            "INSERT INTO diary_entries (user_id, entry_date, title, content, updated_at) VALUES ('user-1', ?, ?, 'Notes', ?)",
+            [("2026-03-01", "Monday", "2026-03-01 20:00:00"), ("2026-03-02", "Tuesday", "2026-03-02 20:00:00")]
+        )
+    return str(path)
+
+@pytest.fixture
+def indexer(db_path, tmp_path):
+    return BackgroundIndexer(SemanticIndex(db_path, index_dir=str(tmp_path / "index")), batch_size=2)
+
+def _index_rows(indexer, source, rows):
+    """Store rows read by the indexer the way _index_batch does, with placeholder vectors"""
+    items = [{"source": source, "row_id": row_id, "user_id": user_id} for row_id, user_id, _, _ in rows]
+    last_id, _, last_changed, _ = rows[-1]
+    vectors = np.eye(4, dtype=np.float32)[:len(rows)]
+    indexer.index.upsert(items, vectors, {source: [last_changed, last_id]})
+
+def test_append_only_tables_are_read_in_batches_past_the_watermark(indexer):
+    first = indexer._read_changes("chat_history")
+    _index_rows(indexer, "chat_history", first)
+    second = indexer._read_changes("chat_history")
+
+    assert [row[0] for row in first] == [1, 2]
+    assert [row[0] for row in second] == [3, 4]
+    assert first[0][3] == "[2026-03-01 09:00] USER: Message 0"
+    assert indexer._count_pending() == 3 + 2  # chat 3..5 and both diary entries
+
+def test_edited_rows_are_read_again(indexer, db_path):
+    _index_rows(indexer, "diary_entries", indexer._read_changes("diary_entries"))
+    assert indexer._read_changes("diary_entries") == []
+
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("UPDATE diary_entries SET content = 'Rewritten', updated_at = '2026-03-03T08:00:00' WHERE id = 1")
+    changed = indexer._read_changes("diary_entries")
+
+    assert [(row[0], row[2]) for row in changed] == [(1, "2026-03-03 08:00:00")]
+    assert changed[0][3].endswith("Monday - Rewritten")
+
+def test_deleted_rows_lose_their_vectors(indexer, db_path):
+    _index_rows(indexer, "chat_history", indexer._read_changes("chat_history"))
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("DELETE FROM chat_history WHERE id = 1")
+
+    assert indexer._remove_deleted() == 1
+    assert indexer.index.indexed_ids("chat_history") == {2}
+
+def test_run_once_indexes_everything(indexer):
+    pytest.importorskip("sentence_transformers")
+
+    async def scenario():
+        try:
+            return await indexer.run_once()
+        finally:
+            await indexer.stop()
+
+    assert asyncio.run(scenario()) == 7
+    metrics = indexer.get_metrics()
+    assert metrics["pending_rows"] == 0 and metrics["indexed_rows"] == 7
+    assert metrics["store"]["vectors"] == 7
@@ -0,0 +1,67 @@
+import pytest
+
+from app.services.llm.model_selector import AdaptiveModelSelector, parse_size_gb
+from app.services.llm.model_stats import ModelPerformanceTracker
+
+GB = 1024 ** 3
+
+# With the size prior on eight cores, 256 reply tokens take 8s per GB of model
+SIZES = {"small:1b": 1.0, "mid:1b": 1.4, "medium:3b": 2.0, "large:8b": 8.0}
+
+def _models(*names):
+    return [{"name": name, "size": int(SIZES[name] * GB)} for name in names]
+
+@pytest.fixture
+def selector():
+    models = {name: {"ram_required": size} for name, size in SIZES.items()}
+    selector = AdaptiveModelSelector(models, ModelPerformanceTracker(), latency_slo=30.0)
+    selector.cpu_cores = 8
+    return selector
+
+def _select(selector, resident=(), available_gb=32.0, downloaded=tuple(SIZES)):
+    return selector.select(100, _models(*downloaded), _models(*resident), available_gb)
+
+def test_parse_size_gb():
+    assert parse_size_gb("4.7GB") == 4.7
+    assert parse_size_gb("512MB") == 0.5
+    assert parse_size_gb(2 * GB) == 2.0
+    assert parse_size_gb("unknown") is None
+
+def test_picks_the_largest_model_within_the_slo(selector):
+    assert _select(selector) == "medium:3b"
+
+    selector.latency_slo = 10.0
+    assert _select(selector) == "small:1b"
+
+def test_falls_back_to_the_fastest_model_when_none_meets_the_slo(selector):
+    selector.latency_slo = 1.0
+
+    assert _select(selector) == "small:1b"
+
+def test_skips_models_that_do_not_fit_in_memory(selector):
+    assert _select(selector, available_gb=2.5) == "mid:1b"
+    # Evicting a resident model frees its memory for a bigger one
+    assert _select(selector, resident=["small:1b"], available_gb=2.0) == "medium:3b"
+
+def test_keeps_the_resident_model_unless_another_is_clearly_larger(selector):
+    downloaded = ("small:1b", "mid:1b")
+
+    assert _select(selector, downloaded=downloaded) == "mid:1b"
+    assert _select(selector, resident=["small:1b"], downloaded=downloaded) == "small:1b"
+    assert _select(selector, resident=["small:1b"]) == "medium:3b"
+
+def test_switches_freely_between_loaded_models(selector):
+    assert _select(selector, resident=["small:1b", "mid:1b"], downloaded=("small:1b", "mid:1b")) == "mid:1b"
+
+def test_leaves_a_resident_model_that_misses_the_slo(selector):
+    assert _select(selector, resident=["large:8b"]) == "medium:3b"
+
+def test_sticks_with_the_last_choice_among_resident_models(selector):
+    selector.last_selected = "small:1b"
+
+    assert _select(selector, resident=["mid:1b", "small:1b"], downloaded=("small:1b", "mid:1b", "medium:3b")) == "medium:3b"
+    assert selector.last_selected == "medium:3b"
+
+    selector.last_selected = "small:1b"
+    selector.switch_margin = 1.5
+    assert _select(selector, resident=["mid:1b", "small:1b"], downloaded=("small:1b", "mid:1b", "medium:3b")) == "small:1b"
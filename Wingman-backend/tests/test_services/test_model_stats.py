@@ -0,0 +1,35 @@
+import pytest
+
+from app.services.llm.model_stats import parse_generation_stats
+
+def test_parse_generation_stats_converts_nanoseconds():
+    stats = parse_generation_stats({
+        "total_duration": 3_000_000_000,
+        "load_duration": 500_000_000,
+        "prompt_eval_count": 200,
+        "prompt_eval_duration": 250_000_000,
+        "eval_count": 100,
+        "eval_duration": 2_000_000_000
+    })
+
+    assert stats["total_seconds"] == pytest.approx(3.0)
+    assert stats["load_seconds"] == pytest.approx(0.5)
+    assert stats["prompt_tokens"] == 200
+    assert stats["prompt_tokens_per_second"] == pytest.approx(800.0)
+    assert stats["eval_tokens"] == 100
+    assert stats["eval_seconds"] == pytest.approx(2.0)
+    assert stats["eval_tokens_per_second"] == pytest.approx(50.0)
+    # Without a streamed first token, load + prompt eval stands in for it
+    assert stats["time_to_first_token"] == pytest.approx(0.75)
+
+def test_parse_generation_stats_prefers_measured_first_token():
+    stats = parse_generation_stats({"prompt_eval_count": 10, "prompt_eval_duration": 1_000_000}, time_to_first_token=0.3)
+
+    assert stats["time_to_first_token"] == 0.3
+
+def test_parse_generation_stats_skips_missing_counters():
+    # Prompt fully served from Ollama's cache: no prompt_eval_count
+    stats = parse_generation_stats({"eval_count": 5, "eval_duration": 0})
+
+    assert stats == {"eval_tokens": 5}
+    assert parse_generation_stats({}) == {}
@@ -0,0 +1,171 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import psutil
+import pytest
+
+from app.core.config import settings
+from app.services.llm.ollama_service import WingmanOllamaService
+from benchmarks.fake_ollama import FakeOllama
+
+MODEL = "llama3.2:1b"
+GB = 1024 ** 3
+
+class RecordingOllama(FakeOllama):
+    """FakeOllama that remembers every request it served"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.received = []
+
+    async def handle(self, request, writer):
+        self.received.append((request.method, request.path, request.json() or {}))
+        await super().handle(request, writer)
+
+    def calls(self, path):
+        return [body for method, request_path, body in self.received if request_path == path]
+
+def _service(fake):
+    service = WingmanOllamaService()
+    service.ollama_url = fake.url
+    return service
+
+def test_identical_requests_share_one_generation():
+    async def scenario():
+        async with RecordingOllama(token_latency=0.01, reply_tokens=5, load_latency=0) as fake:
+            service = _service(fake)
+            try:
+                first = asyncio.create_task(service.generate_response("Plan my day", model=MODEL, user_id="user-1"))
+                second = asyncio.create_task(service.generate_response("Plan my day", model=MODEL, user_id="user-2"))
+                await asyncio.sleep(0.01)
+
+                # The first caller going away must not cancel the generation the second is waiting on
+                first.cancel()
+                result = await second
+                with pytest.raises(asyncio.CancelledError):
+                    await first
+            finally:
+                await service.close()
+            return result, fake.calls("/api/generate"), service._inflight
+
+    result, generations, inflight = asyncio.run(scenario())
+
+    assert result["success"] and result["model_used"] == MODEL
+    assert len(generations) == 1
+    assert inflight == {}
+
+def test_different_requests_are_not_coalesced():
+    async def scenario():
+        async with RecordingOllama(token_latency=0.001, reply_tokens=3, load_latency=0) as fake:
+            service = _service(fake)
+            try:
+                await asyncio.gather(
+                    service.generate_response("Plan my day", model=MODEL),
+                    service.generate_response("Plan my week", model=MODEL)
+                )
+            finally:
+                await service.close()
+            return fake.calls("/api/generate")
+
+    assert len(asyncio.run(scenario())) == 2
+
+def test_status_is_probed_once_per_ttl():
+    async def scenario():
+        async with RecordingOllama() as fake:
+            service = _service(fake)
+            try:
+                statuses = await asyncio.gather(*(service.get_status() for _ in range(5)))
+                await service.get_status()
+                probes_while_fresh = len(fake.calls("/api/tags"))
+                service.invalidate_status_cache()
+                await service.get_status()
+            finally:
+                await service.close()
+            return statuses, probes_while_fresh, len(fake.calls("/api/tags"))
+
+    statuses, probes_while_fresh, probes = asyncio.run(scenario())
+
+    assert statuses[0]["available"] and statuses[0]["recommended_model"]
+    assert sorted(statuses[0]["models"]) == ["llama3.2:1b", "llama3.2:3b"]
+    assert (probes_while_fresh, probes) == (1, 2)
+
+def test_unavailable_status_expires_sooner():
+    async def scenario():
+        service = WingmanOllamaService()
+        service.ollama_url = "http://127.0.0.1:9"
+        try:
+            status = await service.get_status()
+            fresh_at_first = service._status_is_fresh()
+            service._status_cached_at -= service.status_error_ttl
+            return status, fresh_at_first, service._status_is_fresh()
+        finally:
+            await service.close()
+
+    status, fresh_at_first, fresh_later = asyncio.run(scenario())
+
+    assert status["status"] == "not_running" and not status["available"]
+    assert fresh_at_first and not fresh_later
+
+def test_warm_up_loads_once_and_pins_with_keep_alive():
+    async def scenario():
+        async with RecordingOllama(load_latency=0.05) as fake:
+            service = _service(fake)
+            try:
+                results = await asyncio.gather(service.warm_up_model(MODEL), service.warm_up_model(MODEL))
+                loaded = await service.is_loaded(MODEL)
+            finally:
+                await service.close()
+            return results, loaded, service.current_model, service.keep_alive, fake.calls("/api/generate")
+
+    results, loaded, current_model, keep_alive, loads = asyncio.run(scenario())
+
+    assert all(result["success"] for result in results)
+    assert loaded and current_model == MODEL
+    assert loads == [{"model": MODEL, "prompt": "", "keep_alive": keep_alive}]
+
+def test_warm_up_evicts_idle_models_only(monkeypatch):
+    monkeypatch.setattr(psutil, "virtual_memory", lambda: SimpleNamespace(available=0, total=16 * GB))
+    models = {"llama3.2:1b": 1.3, "llama3.2:3b": 2.0, "llama3.2:8b": 4.9}
+
+    async def scenario():
+        async with RecordingOllama(load_latency=0, models=models) as fake:
+            fake.resident = {"llama3.2:3b": 0, "llama3.2:8b": 0}
+            service = _service(fake)
+            try:
+                # A generation on the largest resident model is still running
+                async with service.admission.slot("llama3.2:8b", "user-1"):
+                    result = await service.warm_up_model(MODEL)
+            finally:
+                await service.close()
+            return result, sorted(fake.resident)
+
+    result, resident = asyncio.run(scenario())
+
+    assert result["success"] and result["evicted"] == ["llama3.2:3b"]
+    assert resident == [MODEL, "llama3.2:8b"]
+
+def test_status_checks_do_not_queue_behind_generations(monkeypatch):
+    monkeypatch.setattr(settings, "OLLAMA_MAX_CONNECTIONS", 1)
+
+    async def scenario():
+        async with RecordingOllama(token_latency=0.05, reply_tokens=20, load_latency=0) as fake:
+            service = _service(fake)
+            try:
+                generation = asyncio.create_task(service.generate_response("Plan my day", model=MODEL))
+                await asyncio.sleep(0.1)
+                start = time.perf_counter()
+                status = await service.check_ollama_status()
+                elapsed = time.perf_counter() - start
+                generation_running = not generation.done()
+                result = await generation
+            finally:
+                await service.close()
+            return status, elapsed, generation_running, result, service._client, service._control_client
+
+    status, elapsed, generation_running, result, client, control_client = asyncio.run(scenario())
+
+    # The generation holds the only generation connection for about a second
+    assert status["available"] and generation_running and elapsed < 0.5
+    assert result["success"]
+    assert client is None and control_client is None
@@ -0,0 +1,48 @@
+import base64
+
+import pytest
+
+from app.services.pagination import after_filter, decode_cursor, encode_cursor, paginate
+
+def test_cursor_round_trip():
+    cursor = encode_cursor("2026-03-01", 42)
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == ("2026-03-01", 42)
+
+@pytest.mark.parametrize("cursor", [
+    "not base64!",
+    base64.urlsafe_b64encode(b"{not json").decode(),
+    "WzFd",  # [1]
+    encode_cursor("2026-03-01"),
+    encode_cursor("2026-03-01", 42, 7),
+    encode_cursor("2026-03-01", "42"),
+    encode_cursor("2026-03-01", True),
+    encode_cursor(20260301, 42),
+    base64.urlsafe_b64encode(b'{"date": "2026-03-01"}').decode()
+])
+def test_malformed_cursors_are_invalid(cursor):
+    with pytest.raises(ValueError, match="^Invalid cursor$"):
+        decode_cursor(cursor)
+
+def test_after_filter_ascending():
+    assert after_filter("task_date", "2026-03-01", 42) == (
+        'task_date.gt."2026-03-01",and(task_date.eq."2026-03-01",id.gt.42)'
+    )
+
+def test_after_filter_descending_quotes_timestamps():
+    assert after_filter("timestamp", "2026-03-01 08:00:00", 7, descending=True) == (
+        'timestamp.lt."2026-03-01 08:00:00",and(timestamp.eq."2026-03-01 08:00:00",id.lt.7)'
+    )
+
+def test_paginate_returns_next_cursor_only_when_more_rows():
+    rows = [{"task_date": "2026-03-01", "id": n} for n in range(1, 5)]
+    key = lambda row: (row["task_date"], row["id"])
+
+    page, cursor = paginate(rows, 3, key)
+    assert page == rows[:3]
+    assert decode_cursor(cursor) == ("2026-03-01", 3)
+
+    page, cursor = paginate(rows, 4, key)
+    assert page == rows
+    assert cursor is None
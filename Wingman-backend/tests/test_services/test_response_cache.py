@@ -0,0 +1,83 @@
+import time
+
+from app.services.llm.response_cache import ResponseCache
+
+def test_make_key_normalizes_prompt_but_not_context():
+    key = ResponseCache.make_key("llama3.2:1b", "Plan  my DAY", "ctx-1", {"temperature": 0.7})
+
+    assert key == ResponseCache.make_key("llama3.2:1b", "plan my day", "ctx-1", {"temperature": 0.7})
+    assert key != ResponseCache.make_key("llama3.2:1b", "plan my day", "ctx-2", {"temperature": 0.7})
+    assert key != ResponseCache.make_key("llama3.2:3b", "plan my day", "ctx-1", {"temperature": 0.7})
+    assert key != ResponseCache.make_key("llama3.2:1b", "plan my day", "ctx-1", {"temperature": 0.2})
+
+def test_lru_evicts_least_recently_used():
+    cache = ResponseCache(max_entries=2)
+    cache.put("a", {"response": "A"})
+    cache.put("b", {"response": "B"})
+    assert cache.get("a") == {"response": "A"}
+
+    cache.put("c", {"response": "C"})
+
+    assert cache.get("b") is None
+    assert cache.get("a") == {"response": "A"}
+    assert cache.get("c") == {"response": "C"}
+    assert cache.stats()["entries"] == 2
+
+def test_size_limit_evicts_and_skips_oversized_values():
+    cache = ResponseCache(max_bytes=100)
+    cache.put("big", {"response": "x" * 200})
+    assert cache.get("big") is None
+
+    cache.put("a", {"response": "x" * 40})
+    cache.put("b", {"response": "y" * 40})
+    assert cache.get("a") is None
+    assert cache.get("b") is not None
+    assert cache.stats()["bytes"] <= 100
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, "time", lambda: now[0])
+    cache = ResponseCache(ttl_seconds=60)
+    cache.put("a", {"response": "A"})
+
+    now[0] += 59
+    assert cache.get("a") == {"response": "A"}
+    now[0] += 2
+    assert cache.get("a") is None
+    assert cache.stats()["entries"] == 0
+
+def test_disk_tier_survives_a_new_instance(tmp_path):
+    path = str(tmp_path / "cache.db")
+    ResponseCache(db_path=path).put("a", {"response": "A", "model_used": "llama3.2:1b"})
+
+    reopened = ResponseCache(db_path=path)
+    assert reopened.get("a") == {"response": "A", "model_used": "llama3.2:1b"}
+    assert reopened.get("a") == {"response": "A", "model_used": "llama3.2:1b"}
+
+    stats = reopened.stats()
+    assert stats["disk_hits"] == 1 and stats["hits"] == 1 and stats["misses"] == 0
+
+def test_disk_tier_honours_ttl_and_clear(tmp_path, monkeypatch):
+    path = str(tmp_path / "cache.db")
+    now = [1000.0]
+    monkeypatch.setattr(time, "time", lambda: now[0])
+    ResponseCache(db_path=path, ttl_seconds=60).put("old", {"response": "old"})
+    now[0] += 61
+    assert ResponseCache(db_path=path, ttl_seconds=60).get("old") is None
+
+    cache = ResponseCache(db_path=path, ttl_seconds=60)
+    cache.put("new", {"response": "new"})
+    cache.clear()
+    assert ResponseCache(db_path=path, ttl_seconds=60).get("new") is None
+
+def test_disk_tier_keeps_only_newest_entries(tmp_path):
+    path = str(tmp_path / "cache.db")
+    cache = ResponseCache(db_path=path, max_entries=1, max_disk_entries=2)
+    for key in ("a", "b", "c"):
+        cache.put(key, {"response": key})
+        time.sleep(0.01)
+
+    reopened = ResponseCache(db_path=path)
+    assert reopened.get("a") is None
+    assert reopened.get("b") == {"response": "b"}
+    assert reopened.get("c") == {"response": "c"}
@@ -0,0 +1,22 @@
+import json
+import os
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+HEAVY_MODULES = [
+    "numpy",
+    "psutil",
+    "app.services.llm.context_builder",
+    "app.services.llm.indexer",
+    "app.services.llm.ollama_service",
+    "app.services.llm.semantic_index"
+]
+
+def test_importing_the_app_leaves_the_chat_services_unloaded():
+    code = f"import json, sys, main; print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+    result = subprocess.run([sys.executable, "-c", code], cwd=BACKEND_DIR, capture_output=True, text=True)
+
+    assert result.returncode == 0, result.stderr
+    assert json.loads(result.stdout.strip().splitlines()[-1]) == []
@@ -0,0 +1,82 @@
+import sqlite3
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from app.services.llm.semantic_index import SemanticIndex
+
+def _vectors(count, dim=4, seed=0):
+    vectors = np.random.default_rng(seed).normal(size=(count, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+def _items(row_ids, source="chat_history", user_id="user-1"):
+    return [{"source": source, "row_id": row_id, "user_id": user_id} for row_id in row_ids]
+
+@pytest.fixture
+def index(tmp_path):
+    db_path = tmp_path / "wingman.db"
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("CREATE TABLE chat_history (id INTEGER PRIMARY KEY, user_id TEXT, message TEXT, timestamp TEXT, is_ai BOOLEAN)")
+        conn.executemany(
+            "INSERT INTO chat_history (id, user_id, message, timestamp, is_ai) VALUES (?, 'user-1', ?, '2026-03-01 09:00', ?)",
+            [(1, "Remind me about the dentist", 0), (2, "Booked for Friday", 1)]
+        )
+    return SemanticIndex(str(db_path), index_dir=str(tmp_path / "index"))
+
+def test_int8_quantization_keeps_cosine_scores(index):
+    vectors = _vectors(8)
+
+    restored = index._dequantize(index._quantize(vectors))
+
+    assert np.allclose(restored @ vectors.T, vectors @ vectors.T, atol=0.02)
+
+def test_reindexed_row_tombstones_its_old_slot(index):
+    index.upsert(_items([1, 2]), _vectors(2), {"chat_history": ["", 2]})
+    index.upsert(_items([2]), _vectors(1, seed=1), {"chat_history": ["", 2]})
+
+    stats = index.stats()
+    assert (stats["vectors"], stats["tombstones"], stats["dimensions"]) == (2, 1, 4)
+    assert stats["bytes"] == 3 * 4  # int8, one byte per dimension
+    assert index.indexed_ids("chat_history") == {1, 2}
+    assert index.get_watermark("chat_history") == ["", 2]
+
+def test_compaction_drops_tombstones_and_keeps_live_vectors(index):
+    vectors = _vectors(400)
+    index.upsert(_items(range(400)), vectors, {})
+    index.delete([("chat_history", row_id) for row_id in range(300)])
+
+    stats = index.stats()
+    assert (stats["vectors"], stats["tombstones"]) == (100, 0)
+    kept = index._positions[("chat_history", 350)]
+    assert np.allclose(index._dequantize(index._vectors[kept]), vectors[350], atol=0.01)
+
+def test_hits_carry_current_text_and_skip_deleted_rows(index):
+    hits = [
+        {"source": "chat_history", "row_id": 2, "user_id": "user-1", "score": 0.9},
+        {"source": "chat_history", "row_id": 7, "user_id": "user-1", "score": 0.8}
+    ]
+
+    results = index._attach_text(hits)
+
+    assert results == [{**hits[0], "text": "[2026-03-01 09:00] AI: Booked for Friday"}]
+
+def test_search_finds_related_messages(tmp_path):
+    pytest.importorskip("sentence_transformers")
+    from app.services.llm.semantic_index import embed_texts
+
+    db_path = tmp_path / "wingman.db"
+    messages = ["My dentist appointment is on Friday", "I finished the quarterly report", "Buy oat milk"]
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("CREATE TABLE chat_history (id INTEGER PRIMARY KEY, user_id TEXT, message TEXT, timestamp TEXT, is_ai BOOLEAN)")
+        conn.executemany(
+            "INSERT INTO chat_history (id, user_id, message, timestamp, is_ai) VALUES (?, 'user-1', ?, '', 0)",
+            list(enumerate(messages, start=1))
+        )
+    index = SemanticIndex(str(db_path), index_dir=str(tmp_path / "index"))
+    index.upsert(_items([1, 2, 3]), embed_texts(index.model_name, messages), {})
+
+    hits = index.search("user-1", "When do I see the dentist?", k=1)
+
+    assert [hit["row_id"] for hit in hits] == [1]
+    assert index.search("user-2", "When do I see the dentist?") == []
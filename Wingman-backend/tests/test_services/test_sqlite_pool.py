@@ -0,0 +1,75 @@
+import sqlite3
+import threading
+
+import pytest
+
+from app.services.llm.sqlite_pool import SQLiteConnectionPool, get_connection_pool
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = tmp_path / "wingman.db"
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE notes (id INTEGER PRIMARY KEY, body TEXT)")
+    conn.execute("INSERT INTO notes (body) VALUES ('first')")
+    conn.commit()
+    conn.close()
+    return str(path)
+
+def test_connections_are_reused(db_path):
+    pool = SQLiteConnectionPool(db_path)
+    with pool.connection() as first:
+        pass
+    with pool.connection() as second:
+        assert second is first
+        assert second.execute("SELECT body FROM notes").fetchone()["body"] == "first"
+    pool.close()
+
+def test_connections_are_read_only_and_enable_wal(db_path):
+    pool = SQLiteConnectionPool(db_path)
+    with pool.connection() as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        with pytest.raises(sqlite3.OperationalError):
+            conn.execute("INSERT INTO notes (body) VALUES ('nope')")
+    pool.close()
+
+def test_pool_never_opens_more_than_max_connections(db_path):
+    pool = SQLiteConnectionPool(db_path, max_connections=2)
+    barrier = threading.Barrier(2)
+    in_use = []
+
+    def borrow():
+        with pool.connection() as conn:
+            in_use.append(conn)
+            try:
+                barrier.wait(timeout=0.2)
+            except threading.BrokenBarrierError:
+                pass
+            conn.execute("SELECT COUNT(*) FROM notes").fetchone()
+
+    threads = [threading.Thread(target=borrow) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(in_use) == 6
+    assert len(pool._connections) <= 2
+    pool.close()
+
+def test_read_transaction_sees_one_snapshot(db_path):
+    pool = SQLiteConnectionPool(db_path)
+    writer = sqlite3.connect(db_path)
+    with pool.read_transaction() as conn:
+        before = conn.execute("SELECT COUNT(*) FROM notes").fetchone()[0]
+        writer.execute("INSERT INTO notes (body) VALUES ('second')")
+        writer.commit()
+        during = conn.execute("SELECT COUNT(*) FROM notes").fetchone()[0]
+    with pool.connection() as conn:
+        after = conn.execute("SELECT COUNT(*) FROM notes").fetchone()[0]
+    writer.close()
+    pool.close()
+
+    assert (before, during, after) == (1, 1, 2)
+
+def test_pool_is_shared_per_database_file(db_path):
+    assert get_connection_pool(db_path) is get_connection_pool(db_path)
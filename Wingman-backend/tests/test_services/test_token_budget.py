@@ -0,0 +1,57 @@
+from app.services.llm.token_budget import estimate_tokens, fit_sections
+
+def test_estimate_tokens_empty_text_is_free():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens(None) == 0
+
+def test_estimate_tokens_takes_the_larger_of_chars_and_words():
+    # 40 characters / 4 = 10; 2 words * 1.3 = 2.6
+    assert estimate_tokens("a" * 20 + " " + "b" * 19) == 11
+    # 10 one-letter words: 19 characters / 4 = 4.75; 10 * 1.3 = 13
+    assert estimate_tokens(" ".join("a" * 10)) == 14
+
+def test_fit_sections_leaves_everything_when_it_fits():
+    sections = {"tasks": ["Task one"], "diary": ["Entry one"]}
+    fitted = fit_sections(sections, budget=1000)
+
+    assert fitted["lines"] == sections
+    assert fitted["omitted"] == {"tasks": 0, "diary": 0}
+    assert fitted["total_tokens"] == estimate_tokens("Task one") + estimate_tokens("Entry one")
+
+def test_fit_sections_trims_lowest_priority_section_first():
+    sections = {
+        "tasks": ["Task " + "x" * 40],
+        "diary": ["Newest entry " + "y" * 200, "Older entry " + "y" * 200]
+    }
+    budget = estimate_tokens(sections["tasks"][0]) + estimate_tokens(sections["diary"][0]) + 20
+    fitted = fit_sections(sections, budget)
+
+    assert fitted["lines"]["tasks"] == sections["tasks"]
+    # diary lists are newest-first, so the last (oldest) entry goes
+    assert fitted["lines"]["diary"][0] == sections["diary"][0]
+    assert fitted["lines"]["diary"][-1] == "(1 older entry omitted to fit the context window)"
+    assert fitted["omitted"] == {"tasks": 0, "diary": 1}
+    assert fitted["total_tokens"] <= budget
+
+def test_fit_sections_drops_oldest_first_from_chronological_sections():
+    history = [f"Message {n} " + "z" * 100 for n in range(5)]
+    fitted = fit_sections({"chat_history": history}, budget=80, oldest_first=["chat_history"])
+
+    kept = fitted["lines"]["chat_history"]
+    assert kept[0].startswith("(")
+    assert kept[-1] == history[-1]
+    assert fitted["omitted"]["chat_history"] == len(history) - (len(kept) - 1)
+    assert fitted["total_tokens"] <= 80
+
+def test_fit_sections_reports_tokens_per_section():
+    fitted = fit_sections({"events": ["Standup at 9"], "relevant": []}, budget=100)
+
+    assert fitted["tokens"] == {"events": estimate_tokens("Standup at 9"), "relevant": 0}
+
+def test_fit_sections_trims_in_steps():
+    history = [f"Message {n} " + "z" * 100 for n in range(15)]
+    budget = sum(estimate_tokens(line) for line in history[10:]) + 20
+    fitted = fit_sections({"chat_history": history}, budget, oldest_first=["chat_history"], steps={"chat_history": 10})
+
+    assert fitted["omitted"]["chat_history"] == 10
+    assert fitted["lines"]["chat_history"][1:] == history[10:]
@@ -0,0 +1,60 @@
+import time
+
+import pytest
+
+from app.services.user import UserCache
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    return now
+
+def test_profiles_are_cached_without_password(clock):
+    cache = UserCache(ttl_seconds=300)
+    cache.put("u1", {"id": "u1", "username": "sam", "password": "secret"})
+
+    assert cache.get("u1") == (True, {"id": "u1", "username": "sam"})
+    assert cache.get("u2") == (False, None)
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+def test_missing_user_expires_after_negative_ttl(clock):
+    cache = UserCache(ttl_seconds=300, negative_ttl_seconds=10)
+    cache.put("u1", None)
+
+    assert cache.get("u1") == (True, None)
+    clock[0] += 11
+    assert cache.get("u1") == (False, None)
+
+def test_known_user_outlives_negative_ttl(clock):
+    cache = UserCache(ttl_seconds=300, negative_ttl_seconds=10)
+    cache.put("u1", {"id": "u1"})
+
+    clock[0] += 11
+    assert cache.get("u1") == (True, {"id": "u1"})
+    clock[0] += 300
+    assert cache.get("u1") == (False, None)
+
+def test_created_user_replaces_negative_entry(clock):
+    cache = UserCache(negative_ttl_seconds=10)
+    cache.put("u1", None)
+    cache.put("u1", {"id": "u1"})
+
+    assert cache.get("u1") == (True, {"id": "u1"})
+
+def test_invalidate_forgets_negative_entry(clock):
+    cache = UserCache(negative_ttl_seconds=10)
+    cache.put("u1", None)
+    cache.invalidate("u1")
+
+    assert cache.get("u1") == (False, None)
+
+def test_least_recently_used_is_evicted(clock):
+    cache = UserCache(max_entries=2)
+    cache.put("a", {"id": "a"})
+    cache.put("b", {"id": "b"})
+    cache.get("a")
+    cache.put("c", {"id": "c"})
+
+    assert cache.get("b") == (False, None)
+    assert cache.get("a")[0] and cache.get("c")[0]
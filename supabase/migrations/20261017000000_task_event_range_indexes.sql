@@ -0,0 +1,6 @@
+-- Date-range reads from the backend (GET /tasks/range, GET /calendar/range)
+-- filter on user_id and a date range and page through (date, id) with
+-- order=<date>.asc,id.asc, so one composite index serves the filter, the
+-- sort and the keyset condition of every page.
+CREATE INDEX IF NOT EXISTS idx_tasks_user_date_id ON public.tasks (user_id, task_date, id);
+CREATE INDEX IF NOT EXISTS idx_calendar_user_date_id ON public.calendar_events (user_id, event_date, id);